@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+Offline end-to-end benchmark for YouTube Video Finder
+Serves recorded or synthetic results pages from a local stand-in for YouTube,
+answers analysis prompts with a fake Gemini model and reports per-stage and
+end-to-end latency distributions, optionally failing on regression against a
+saved baseline
+"""
+
+import io
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import tempfile
+import threading
+import contextlib
+from html import escape
+from datetime import datetime
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from colorama import init, Fore, Style
+
+from youtube_video_finder import (YouTubeVideoFinder, WebDriverPool, Profiler, SearchFilters, _percentile)
+
+# Initialize colorama for colored output
+init()
+
+DEFAULT_QUERIES = ["python tutorial", "cricket highlights", "how to bake bread", "lofi music"]
+
+# Continuation tokens handed out by the stand-in: "bench:<offset>"
+TOKEN_PREFIX = "bench:"
+
+
+def synthetic_renderer(i, query):
+    """A videoRenderer whose fields vary deterministically with its position"""
+    return {'videoRenderer': {
+        'videoId': f"bench{i:06d}",
+        'title': {'runs': [{'text': f"{query.title()} part {i + 1}: complete guide"}]},
+        'ownerText': {'runs': [{'text': f"Channel {i % 7}"}]},
+        'shortViewCountText': {'simpleText': f"{(i * 37) % 900 + 1}K views"},
+        'publishedTimeText': {'simpleText': f"{i % 6 + 1} days ago"},
+        'lengthText': {'simpleText': f"{i % 15 + 4}:{i % 60:02d}"}
+    }}
+
+
+def continuation_item(offset):
+    return {'continuationItemRenderer': {'continuationEndpoint': {
+        'continuationCommand': {'token': f"{TOKEN_PREFIX}{offset}"}}}}
+
+
+def renderer_markup(renderer):
+    """DOM markup for one result, matching the first entry of each selector list"""
+    video = renderer['videoRenderer']
+    title = escape(video['title']['runs'][0]['text'])
+    channel = escape(video['ownerText']['runs'][0]['text'])
+    return (
+        '<ytd-video-renderer class="style-scope ytd-item-section-renderer">'
+        '<div id="dismissible" class="style-scope ytd-video-renderer">'
+        '<ytd-thumbnail><ytd-thumbnail-overlay-time-status-renderer>'
+        f'<span class="style-scope ytd-thumbnail-overlay-time-status-renderer">{video["lengthText"]["simpleText"]}</span>'
+        '</ytd-thumbnail-overlay-time-status-renderer></ytd-thumbnail>'
+        f'<div id="meta"><h3><a id="video-title" title="{title}" href="/watch?v={video["videoId"]}">{title}</a></h3>'
+        f'<div id="channel-info"><ytd-channel-name><a href="/@{channel.replace(" ", "")}">{channel}</a></ytd-channel-name></div>'
+        '<ytd-video-meta-block><div id="metadata-line">'
+        f'<span>{video["shortViewCountText"]["simpleText"]}</span><span>{video["publishedTimeText"]["simpleText"]}</span>'
+        '</div></ytd-video-meta-block></div></div></ytd-video-renderer>'
+    )
+
+
+def synthetic_results_page(query, per_page=20, total=60):
+    """A results page with the same videos in the DOM and in ytInitialData, plus a continuation"""
+    renderers = [synthetic_renderer(i, query) for i in range(min(per_page, total))]
+    contents = [{'itemSectionRenderer': {'contents': renderers}}]
+    if total > per_page:
+        contents.append(continuation_item(per_page))
+    data = {'contents': {'twoColumnSearchResultsRenderer': {'primaryContents': {
+        'sectionListRenderer': {'contents': contents}}}}}
+    config = {'INNERTUBE_API_KEY': "benchmark", 'INNERTUBE_CONTEXT': {'client': {'clientName': "WEB"}}}
+    return (
+        f'<!DOCTYPE html><html><head><title>{escape(query)} - YouTube</title>'
+        f'<script>ytcfg.set({json.dumps(config)});</script></head><body><ytd-app>'
+        f'<div id="contents">{"".join(renderer_markup(r) for r in renderers)}</div></ytd-app>'
+        f'<script>var ytInitialData = {json.dumps(data)};</script></body></html>'
+    )
+
+
+HOME_PAGE = """<!DOCTYPE html><html><head><title>YouTube</title></head><body><ytd-app>
+<form action="/results"><ytd-searchbox><input name="search_query" placeholder="Search"></ytd-searchbox>
+<button id="search-icon-legacy" type="submit">Search</button></form>
+</ytd-app></body></html>"""
+
+
+class StandInServer:
+    """Local HTTP stand-in for the parts of YouTube the finder talks to.
+
+    / serves a minimal home page, /results serves the recorded page (or a
+    synthetic one built from the query) and /youtubei/v1/search answers
+    continuation requests with further synthetic results until `total`.
+    latency is added to every response to imitate the network.
+    """
+
+    def __init__(self, recorded_page=None, per_page=20, total=60, latency=0.0):
+        self.recorded_page = recorded_page
+        self.per_page = per_page
+        self.total = total
+        self.latency = latency
+        self.requests = 0
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler(self):
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, body, content_type='text/html; charset=utf-8', status=200):
+                if stand_in.latency:
+                    time.sleep(stand_in.latency)
+                encoded = body.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(encoded)))
+                self.end_headers()
+                self.wfile.write(encoded)
+
+            def do_GET(self):
+                stand_in.requests += 1
+                url = urlparse(self.path)
+                if url.path == '/results':
+                    query = parse_qs(url.query).get('search_query', ['benchmark'])[0]
+                    self._send(stand_in.recorded_page or
+                               synthetic_results_page(query, stand_in.per_page, stand_in.total))
+                elif url.path == '/':
+                    self._send(HOME_PAGE)
+                else:
+                    self._send('', status=404)
+
+            def do_POST(self):
+                stand_in.requests += 1
+                length = int(self.headers.get('Content-Length') or 0)
+                request = json.loads(self.rfile.read(length) or b'{}')
+                token = request.get('continuation') or ''
+                if urlparse(self.path).path != '/youtubei/v1/search' or not token.startswith(TOKEN_PREFIX):
+                    # Recorded pages carry real tokens, which the stand-in cannot answer
+                    self._send('{}', 'application/json')
+                    return
+                offset = int(token[len(TOKEN_PREFIX):])
+                end = min(offset + stand_in.per_page, stand_in.total)
+                items = [{'itemSectionRenderer': {'contents': [synthetic_renderer(i, 'benchmark')
+                                                               for i in range(offset, end)]}}]
+                if end < stand_in.total:
+                    items.append(continuation_item(end))
+                self._send(json.dumps({'onResponseReceivedCommands': [
+                    {'appendContinuationItemsAction': {'continuationItems': items}}]}), 'application/json')
+
+        return Handler
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeGeminiModel:
+    """Deterministic stand-in for genai.GenerativeModel.
+
+    Picks the first numbered video in the prompt (compact rows, chunk rows or
+    the legacy list), after sleeping `latency` seconds; streamed responses
+    spread the same delay over a few chunks.
+    """
+    ROW_PATTERN = re.compile(r'^\s*(\d+)(?: \| |\. Title: )(.*?)(?: \| |$)', re.M)
+    STREAM_CHUNKS = 4
+
+    def __init__(self, latency=0.5):
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _answer(self, prompt):
+        match = self.ROW_PATTERN.search(prompt)
+        number, title = (match.group(1), match.group(2).strip()) if match else ('1', 'Unknown Title')
+        return (f"BEST VIDEO: {number}. {title} - first listed candidate (benchmark model)\n\n"
+                "DETAILED ANALYSIS:\n- Deterministic benchmark response, no real ranking was performed\n")
+
+    def generate_content(self, prompt, stream=False):
+        with self._lock:
+            self.calls += 1
+        text = self._answer(prompt)
+        if not stream:
+            time.sleep(self.latency)
+            return FakeResponse(text)
+        return self._stream(text)
+
+    def _stream(self, text):
+        size = -(-len(text) // self.STREAM_CHUNKS)
+        for start in range(0, len(text), size):
+            time.sleep(self.latency / self.STREAM_CHUNKS)
+            yield FakeResponse(text[start:start + size])
+
+
+def distribution(values):
+    """n, mean, p50, p90, p99 and max of a list of seconds, in milliseconds"""
+    ordered = sorted(values)
+    if not ordered:
+        return {'n': 0, 'mean_ms': 0.0, 'p50_ms': 0.0, 'p90_ms': 0.0, 'p99_ms': 0.0, 'max_ms': 0.0}
+    to_ms = lambda seconds: round(seconds * 1000, 3)
+    return {'n': len(ordered), 'mean_ms': to_ms(sum(ordered) / len(ordered)),
+            'p50_ms': to_ms(_percentile(ordered, 50)), 'p90_ms': to_ms(_percentile(ordered, 90)),
+            'p99_ms': to_ms(_percentile(ordered, 99)), 'max_ms': to_ms(ordered[-1])}
+
+
+def run_benchmark(args, base_url):
+    """Run the query pipeline args.iterations times; returns per-stage and end-to-end samples"""
+    work_dir = tempfile.TemporaryDirectory(prefix='ytvf_bench_')
+    pool = WebDriverPool(size=1) if args.backend == 'selenium' else None
+    finder = YouTubeVideoFinder("benchmark", extraction_mode=args.extraction_mode, base_url=base_url,
+                                backend=args.backend, driver_pool=pool, browser_profile=args.browser_profile,
+                                max_results=args.max_results, wait_mode=args.wait_mode,
+                                filters=SearchFilters(), result_cache_ttl=None, analysis_cache_ttl=None,
+                                prompt_format=args.prompt_format, stream_analysis=args.stream,
+                                results_store_path=os.path.join(work_dir.name, 'results.db'),
+                                selector_stats_path=None)
+    model = FakeGeminiModel(args.model_latency)
+    finder.model = model
+    gauges = finder.profiler.gauges
+
+    stages, end_to_end, failures = {}, [], 0
+    queries = args.query or DEFAULT_QUERIES
+    total = args.warmup + args.iterations
+    try:
+        for iteration in range(total):
+            query = queries[iteration % len(queries)]
+            # A fresh profiler per run so its totals cover exactly one query
+            finder.profiler = Profiler(enabled=True, gauges=gauges)
+            output = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+            start = time.perf_counter()
+            with output:
+                record = finder.run_query(query)
+            elapsed = time.perf_counter() - start
+
+            warm = iteration >= args.warmup
+            label = "run" if warm else "warm-up"
+            if not record:
+                failures += 1
+                print(f"{Fore.RED}❌ [{iteration + 1}/{total}] {label} '{query}' returned no results{Style.RESET_ALL}")
+                continue
+            print(f"{Fore.GREEN}✓ [{iteration + 1}/{total}] {label} '{query}': "
+                  f"{record['total_videos']} videos in {elapsed * 1000:.0f}ms{Style.RESET_ALL}")
+            if not warm:
+                continue
+            end_to_end.append(elapsed)
+            for name, entry in finder.profiler.totals().items():
+                stats = stages.setdefault(name, {'seconds': [], 'webdriver_calls': 0, 'sleep_seconds': 0.0,
+                                                 'wait_seconds': 0.0, 'selector_misses': 0})
+                stats['seconds'].append(entry['seconds'])
+                for key in ('webdriver_calls', 'sleep_seconds', 'wait_seconds', 'selector_misses'):
+                    stats[key] += entry.get(key, 0)
+    finally:
+        if pool:
+            pool.close()
+        if finder.results_store:
+            finder.results_store.close()
+        work_dir.cleanup()
+
+    return {'stages': stages, 'end_to_end': end_to_end, 'failures': failures, 'model_calls': model.calls}
+
+
+def build_report(args, samples, requests):
+    runs = len(samples['end_to_end']) or 1
+    stages = {}
+    for name, stats in sorted(samples['stages'].items()):
+        stages[name] = distribution(stats['seconds'])
+        stages[name].update({key: round(stats[key] / runs, 4)
+                             for key in ('webdriver_calls', 'sleep_seconds', 'wait_seconds', 'selector_misses')})
+    return {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'config': {'backend': args.backend, 'extraction_mode': args.extraction_mode,
+                   'wait_mode': args.wait_mode, 'prompt_format': args.prompt_format, 'stream': args.stream,
+                   'max_results': args.max_results, 'model_latency': args.model_latency,
+                   'server_latency': args.server_latency, 'recorded_page': bool(args.page)},
+        'iterations': len(samples['end_to_end']),
+        'failures': samples['failures'],
+        'model_calls': samples['model_calls'],
+        'server_requests': requests,
+        'end_to_end': distribution(samples['end_to_end']),
+        'stages': stages
+    }
+
+
+def print_report(report):
+    print(f"\n{Fore.CYAN}{'='*80}")
+    print("⏱️ BENCHMARK RESULTS (ms)")
+    print(f"{'='*80}{Style.RESET_ALL}")
+    config = report['config']
+    print(f"   {report['iterations']} runs | backend {config['backend']} | extraction {config['extraction_mode']} | "
+          f"model latency {config['model_latency']}s | {report['failures']} failure(s)")
+    print(f"\n   {'stage':<26}{'mean':>9}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}{'calls':>8}{'sleep':>8}{'wait':>8}")
+    rows = list(report['stages'].items()) + [('END TO END', report['end_to_end'])]
+    for name, stats in rows:
+        print(f"   {name:<26}{stats['mean_ms']:>9.1f}{stats['p50_ms']:>9.1f}{stats['p90_ms']:>9.1f}"
+              f"{stats['p99_ms']:>9.1f}{stats['max_ms']:>9.1f}{stats.get('webdriver_calls', 0):>8.1f}"
+              f"{stats.get('sleep_seconds', 0):>8.2f}{stats.get('wait_seconds', 0):>8.2f}")
+
+
+def compare_to_baseline(report, baseline, tolerance, min_delta_ms):
+    """Regressions: stages whose p50 or p90 grew by more than tolerance and min_delta_ms"""
+    if baseline.get('config') != report['config']:
+        print(f"{Fore.YELLOW}⚠️ Baseline was recorded with a different configuration: "
+              f"{baseline.get('config')}{Style.RESET_ALL}")
+    current = dict(report['stages'], end_to_end=report['end_to_end'])
+    expected = dict(baseline.get('stages', {}), end_to_end=baseline.get('end_to_end', {}))
+    regressions = []
+    for name, before in expected.items():
+        after = current.get(name)
+        if after is None:
+            continue
+        for key in ('p50_ms', 'p90_ms'):
+            if key in before and after[key] > before[key] * (1 + tolerance) and after[key] - before[key] > min_delta_ms:
+                regressions.append(f"{name} {key[:3]}: {before[key]:.1f}ms -> {after[key]:.1f}ms "
+                                   f"(+{(after[key] / before[key] - 1) * 100 if before[key] else float('inf'):.0f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline end-to-end benchmark for YouTube Video Finder")
+    parser.add_argument('--iterations', type=int, default=20, help="measured runs (default: 20)")
+    parser.add_argument('--warmup', type=int, default=2, help="unmeasured runs first (default: 2)")
+    parser.add_argument('--query', action='append', help="query to run, may repeat (default: a fixed set)")
+    parser.add_argument('--page', metavar='FILE', help="recorded results page HTML to serve instead of a synthetic one")
+    parser.add_argument('--per-page', type=int, default=20, help="synthetic results per page (default: 20)")
+    parser.add_argument('--total', type=int, default=60, help="synthetic results across all pages (default: 60)")
+    parser.add_argument('--server-latency', type=float, default=0.0, metavar='SECONDS',
+                        help="delay added to every stand-in response")
+    parser.add_argument('--model-latency', type=float, default=0.5, metavar='SECONDS',
+                        help="delay of every fake Gemini call (default: 0.5)")
+    parser.add_argument('--backend', choices=YouTubeVideoFinder.BACKENDS, default='http',
+                        help="'selenium' drives a real Chrome against the stand-in (default: http)")
+    parser.add_argument('--extraction-mode', choices=YouTubeVideoFinder.EXTRACTION_MODES, default='bulk')
+    parser.add_argument('--browser-profile', choices=YouTubeVideoFinder.BROWSER_PROFILES, default='lean')
+    parser.add_argument('--wait-mode', choices=YouTubeVideoFinder.WAIT_MODES, default='event')
+    parser.add_argument('--prompt-format', choices=YouTubeVideoFinder.PROMPT_FORMATS, default='compact')
+    parser.add_argument('--stream', action='store_true', help="stream the fake analysis")
+    parser.add_argument('--max-results', type=int, default=20)
+    parser.add_argument('--verbose', action='store_true', help="show the pipeline's own output")
+    parser.add_argument('--output', metavar='FILE', help="write the full report as JSON")
+    parser.add_argument('--save-baseline', metavar='FILE', help="write this run's report as the new baseline")
+    parser.add_argument('--baseline', metavar='FILE', help="exit with status 1 if any stage regressed against FILE")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="allowed fractional slowdown of p50/p90 before failing (default: 0.25)")
+    parser.add_argument('--min-delta-ms', type=float, default=5.0,
+                        help="ignore slowdowns smaller than this many milliseconds (default: 5)")
+    args = parser.parse_args()
+
+    recorded_page = None
+    if args.page:
+        with open(args.page, encoding='utf-8') as f:
+            recorded_page = f.read()
+
+    with StandInServer(recorded_page, args.per_page, args.total, args.server_latency) as server:
+        print(f"{Fore.CYAN}🧪 Stand-in YouTube at {server.base_url}, "
+              f"{args.warmup} warm-up + {args.iterations} measured runs{Style.RESET_ALL}")
+        samples = run_benchmark(args, server.base_url)
+        report = build_report(args, samples, server.requests)
+
+    print_report(report)
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+            print(f"{Fore.CYAN}📁 Report written to {path}{Style.RESET_ALL}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(report, baseline, args.tolerance, args.min_delta_ms)
+        if regressions:
+            print(f"{Fore.RED}❌ {len(regressions)} regression(s) against {args.baseline}:{Style.RESET_ALL}")
+            for line in regressions:
+                print(f"   - {line}")
+            sys.exit(1)
+        print(f"{Fore.GREEN}✓ No regressions against {args.baseline}{Style.RESET_ALL}")
+    if report['failures'] or not report['iterations']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
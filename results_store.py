@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+Results Store
+Append-only SQLite store for search runs, their videos and AI analyses
+"""
+
+import os
+import sys
+import json
+import gzip
+import time
+import glob
+import sqlite3
+import argparse
+from datetime import datetime
+from colorama import init, Fore, Style
+from youtube_video_finder import VideoRecord, DEFAULT_RESULTS_STORE_PATH
+
+# Initialize colorama
+init()
+
+TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+
+# PRAGMA user_version of a store whose migrations have all run;
+# version 1 added the trends aggregates, version 2 rebuilt them once
+# duplicate, same-second and late-imported observations folded consistently
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    query TEXT NOT NULL,
+    search_query TEXT NOT NULL,
+    original_query TEXT,
+    timestamp TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    total_videos INTEGER NOT NULL,
+    best_video_id TEXT,
+    best_video TEXT,
+    source TEXT UNIQUE
+);
+CREATE TABLE IF NOT EXISTS videos (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    position INTEGER NOT NULL,
+    video_id TEXT,
+    title TEXT,
+    url TEXT,
+    channel TEXT,
+    views TEXT,
+    upload_time TEXT,
+    duration TEXT,
+    view_count INTEGER,
+    uploaded_at REAL,
+    duration_seconds INTEGER,
+    PRIMARY KEY (run_id, position)
+);
+CREATE TABLE IF NOT EXISTS analyses (
+    run_id INTEGER PRIMARY KEY REFERENCES runs(id),
+    text TEXT
+);
+CREATE TABLE IF NOT EXISTS trends (
+    query TEXT NOT NULL,
+    video_id TEXT NOT NULL,
+    title TEXT,
+    observations INTEGER NOT NULL,
+    first_seen REAL NOT NULL,
+    first_views INTEGER,
+    last_seen REAL NOT NULL,
+    last_views INTEGER,
+    last_rank INTEGER NOT NULL,
+    rank_change INTEGER,
+    velocity REAL,
+    PRIMARY KEY (query, video_id)
+);
+CREATE INDEX IF NOT EXISTS runs_by_query ON runs(query, created_at);
+CREATE INDEX IF NOT EXISTS runs_by_time ON runs(created_at);
+CREATE INDEX IF NOT EXISTS videos_by_id ON videos(video_id);
+CREATE INDEX IF NOT EXISTS videos_by_channel ON videos(channel);
+CREATE INDEX IF NOT EXISTS trends_by_velocity ON trends(query, velocity);
+"""
+
+
+def normalize_query(query):
+    return ' '.join((query or '').lower().split())
+
+
+class ResultsStore:
+    """Indexed store of result records, written append-only.
+
+    A run is one record as built by YouTubeVideoFinder.build_result_record;
+    its videos are stored one row each with the numeric fields parsed once,
+    so lookups by query, video ID, channel or time use indexes instead of
+    opening every saved JSON file. get_run rebuilds the original record.
+
+    Per (query, video) trend aggregates are updated as each run is inserted:
+    velocity is the view gain per hour since the previous run that saw the
+    video, and rank_change how many places it moved up since then.
+    """
+
+    def __init__(self, path=DEFAULT_RESULTS_STORE_PATH):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < 2 and self.conn.execute("SELECT 1 FROM runs LIMIT 1").fetchone():
+            # Older stores get their aggregates (re)built once
+            self.rebuild_trends()
+        if version < SCHEMA_VERSION:
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def save_run(self, record, source=None):
+        """Insert one result record in a single transaction, returning its run ID"""
+        return self.save_runs([record], [source])[0]
+
+    def save_runs(self, records, sources=None):
+        """Insert many records in one transaction; runs whose source was already stored get None"""
+        sources = sources or [None] * len(records)
+        with self.conn:
+            return [self._insert_run(record, source) for record, source in zip(records, sources)]
+
+    def _insert_run(self, record, source):
+        try:
+            created_at = datetime.strptime(record['timestamp'], TIMESTAMP_FORMAT).timestamp()
+        except (KeyError, TypeError, ValueError):
+            created_at = time.time()
+        best = record.get('best_video_recommendation')
+        best_id = VideoRecord.from_dict(best).video_id if best else None
+
+        cursor = self.conn.execute(
+            "INSERT OR IGNORE INTO runs (query, search_query, original_query, timestamp, created_at, "
+            "total_videos, best_video_id, best_video, source) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (normalize_query(record['search_query']), record['search_query'], record.get('original_query'),
+             record.get('timestamp') or datetime.fromtimestamp(created_at).strftime(TIMESTAMP_FORMAT),
+             created_at, record.get('total_videos', len(record['videos'])), best_id,
+             json.dumps(best, ensure_ascii=False, separators=(',', ':')) if best else None, source))
+        if not cursor.rowcount:
+            return None
+        run_id = cursor.lastrowid
+
+        rows = []
+        for position, data in enumerate(record['videos']):
+            video = VideoRecord.from_dict(data, extracted_at=created_at)
+            rows.append((run_id, position, video.video_id, video.title, video.url, video.channel, video.views,
+                         video.upload_time, video.duration, video.view_count, video.uploaded_at,
+                         video.duration_seconds))
+        self.conn.executemany("INSERT INTO videos VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        self.conn.execute("INSERT INTO analyses VALUES (?, ?)", (run_id, record.get('ai_analysis')))
+        self._update_trends(normalize_query(record['search_query']), created_at, rows)
+        return run_id
+
+    def _update_trends(self, query, created_at, rows):
+        """Fold one run's videos into the trend aggregates, touching only those videos' rows.
+
+        Observations are ordered by run time, then by insertion, so a run saved
+        in the same second as the previous one counts as the later observation.
+        A video listed twice in one run counts once, at its best rank. A run
+        older than a video's last observation (a late import) recomputes that
+        video's row from the stored runs, the same fold rebuild_trends uses.
+        """
+        seen = set()
+        for _, position, video_id, title, *_, view_count, _, _ in rows:
+            if not video_id or video_id in seen:
+                continue
+            seen.add(video_id)
+            trend = self._trend(query, video_id)
+            if trend is not None and created_at < trend['last_seen']:
+                self._recompute_trend(query, video_id)
+            else:
+                self._fold_trend(query, video_id, trend, created_at, position + 1, title, view_count)
+
+    def _trend(self, query, video_id):
+        return self.conn.execute("SELECT * FROM trends WHERE query = ? AND video_id = ?",
+                                 (query, video_id)).fetchone()
+
+    def _fold_trend(self, query, video_id, trend, created_at, rank, title, view_count):
+        """Add one observation that is no older than the trend row's last one"""
+        if trend is None:
+            self.conn.execute(
+                "INSERT INTO trends VALUES (?, ?, ?, 1, ?, ?, ?, ?, ?, NULL, NULL)",
+                (query, video_id, title, created_at, view_count, created_at, view_count, rank))
+            return
+        # Velocity needs elapsed time, so a same-second observation keeps the previous one
+        hours = (created_at - trend['last_seen']) / 3600
+        velocity = trend['velocity']
+        if hours > 0 and view_count is not None and trend['last_views'] is not None:
+            velocity = (view_count - trend['last_views']) / hours
+        self.conn.execute(
+            "UPDATE trends SET title = ?, observations = observations + 1, last_seen = ?, last_views = ?, "
+            "last_rank = ?, rank_change = ?, velocity = ? WHERE query = ? AND video_id = ?",
+            (title, created_at, view_count, rank, trend['last_rank'] - rank, velocity, query, video_id))
+
+    def _recompute_trend(self, query, video_id):
+        """Rebuild one video's trend row from every stored run of the query"""
+        self.conn.execute("DELETE FROM trends WHERE query = ? AND video_id = ?", (query, video_id))
+        # SQLite takes the bare columns from the row holding MIN(position)
+        observations = self.conn.execute(
+            "SELECT runs.created_at, MIN(videos.position) AS position, videos.title, videos.view_count "
+            "FROM videos JOIN runs ON runs.id = videos.run_id WHERE runs.query = ? AND videos.video_id = ? "
+            "GROUP BY runs.id ORDER BY runs.created_at, runs.id", (query, video_id)).fetchall()
+        for created_at, position, title, view_count in observations:
+            self._fold_trend(query, video_id, self._trend(query, video_id), created_at, position + 1, title,
+                             view_count)
+
+    def rebuild_trends(self):
+        """Recompute every trend aggregate from the stored runs in time order"""
+        with self.conn:
+            self.conn.execute("DELETE FROM trends")
+            for run in self.conn.execute(
+                    "SELECT id, query, created_at FROM runs ORDER BY created_at, id").fetchall():
+                rows = [tuple(row) for row in self.conn.execute(
+                    "SELECT * FROM videos WHERE run_id = ? ORDER BY position", (run['id'],))]
+                self._update_trends(run['query'], run['created_at'], rows)
+
+    def trends_for_query(self, query, limit=20):
+        """Videos seen in at least two runs of a query, fastest-growing first"""
+        rows = self.conn.execute(
+            "SELECT * FROM trends WHERE query = ? AND velocity IS NOT NULL ORDER BY velocity DESC LIMIT ?",
+            (normalize_query(query), limit))
+        trends = []
+        for row in rows:
+            trend = dict(row)
+            span = (row['last_seen'] - row['first_seen']) / 3600
+            trend['average_velocity'] = ((row['last_views'] - row['first_views']) / span
+                                         if span and row['first_views'] is not None and row['last_views'] is not None
+                                         else None)
+            trends.append(trend)
+        return trends
+
+    def view_series(self, video_id, query=None):
+        """(run timestamp, rank, view count) observations of a video, oldest first"""
+        sql = ("SELECT runs.timestamp, videos.position + 1 AS rank, videos.view_count FROM videos "
+               "JOIN runs ON runs.id = videos.run_id WHERE videos.video_id = ?")
+        params = [video_id]
+        if query:
+            sql += " AND runs.query = ?"
+            params.append(normalize_query(query))
+        return [tuple(row) for row in self.conn.execute(sql + " ORDER BY runs.created_at", params)]
+
+    def import_json_files(self, paths):
+        """Import saved youtube_results_*.json files in one transaction; returns (imported, skipped)"""
+        records, sources = [], []
+        for path in paths:
+            with open(path, encoding='utf-8') as f:
+                records.append(json.load(f))
+            sources.append(os.path.abspath(path))
+        run_ids = self.save_runs(records, sources)
+        imported = sum(run_id is not None for run_id in run_ids)
+        return imported, len(run_ids) - imported
+
+    def runs_for_query(self, query, days=None):
+        """Runs of a query, newest first, optionally only from the last `days` days"""
+        since = time.time() - days * 86400 if days else 0
+        return [dict(row) for row in self.conn.execute(
+            "SELECT id, search_query, timestamp, total_videos, best_video_id FROM runs "
+            "WHERE query = ? AND created_at >= ? ORDER BY created_at DESC",
+            (normalize_query(query), since))]
+
+    def runs_with_video(self, video_id):
+        """Every run that surfaced a video, with its position and view count in that run"""
+        return [dict(row) for row in self.conn.execute(
+            "SELECT runs.id, runs.search_query, runs.timestamp, videos.position + 1 AS position, "
+            "videos.views, videos.view_count FROM videos JOIN runs ON runs.id = videos.run_id "
+            "WHERE videos.video_id = ? ORDER BY runs.created_at", (video_id,))]
+
+    def runs_with_channel(self, channel):
+        return [dict(row) for row in self.conn.execute(
+            "SELECT DISTINCT runs.id, runs.search_query, runs.timestamp FROM videos "
+            "JOIN runs ON runs.id = videos.run_id WHERE videos.channel = ? ORDER BY runs.created_at",
+            (channel,))]
+
+    def get_run(self, run_id):
+        """Rebuild the original result record of a run, or None"""
+        run = self.conn.execute("SELECT * FROM runs WHERE id = ?", (run_id,)).fetchone()
+        if run is None:
+            return None
+        videos = [{field: row[field] for field in VideoRecord.FIELDS} for row in self.conn.execute(
+            "SELECT * FROM videos WHERE run_id = ? ORDER BY position", (run_id,))]
+        analysis = self.conn.execute("SELECT text FROM analyses WHERE run_id = ?", (run_id,)).fetchone()
+        return {
+            'search_query': run['search_query'],
+            'original_query': run['original_query'],
+            'timestamp': run['timestamp'],
+            'total_videos': run['total_videos'],
+            'best_video_recommendation': json.loads(run['best_video']) if run['best_video'] else None,
+            'videos': videos,
+            'ai_analysis': analysis['text'] if analysis else None
+        }
+
+    def run_ids(self):
+        return [row[0] for row in self.conn.execute("SELECT id FROM runs ORDER BY id")]
+
+    def export(self, path):
+        """Write every run as one compact JSON record per line, gzip-compressed; returns the count"""
+        count = 0
+        with gzip.open(path, 'wt', encoding='utf-8') as out:
+            for run_id in self.run_ids():
+                out.write(json.dumps(self.get_run(run_id), ensure_ascii=False, separators=(',', ':')) + "\n")
+                count += 1
+        return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query and maintain the local results store")
+    parser.add_argument('--db', default=DEFAULT_RESULTS_STORE_PATH, help="results store path")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    importer = commands.add_parser('import', help="import saved youtube_results_*.json files")
+    importer.add_argument('paths', nargs='*', help="JSON files (default: youtube_results_*.json here)")
+    query = commands.add_parser('query', help="list the runs of a query")
+    query.add_argument('query')
+    query.add_argument('--days', type=float, help="only runs from the last DAYS days")
+    video = commands.add_parser('video', help="list every run that surfaced a video ID")
+    video.add_argument('video_id')
+    channel = commands.add_parser('channel', help="list every run with a video from a channel")
+    channel.add_argument('channel')
+    show = commands.add_parser('show', help="print one run as JSON")
+    show.add_argument('run_id', type=int)
+    export = commands.add_parser('export', help="export every run as gzip-compressed JSON lines")
+    export.add_argument('path')
+    trends = commands.add_parser('trends', help="videos of a query gaining views fastest between runs")
+    trends.add_argument('query')
+    trends.add_argument('--limit', type=int, default=20)
+    trends.add_argument('--rebuild', action='store_true', help="recompute the aggregates from all stored runs first")
+    series = commands.add_parser('series', help="view count and rank of a video in every run")
+    series.add_argument('video_id')
+    series.add_argument('--query', help="only runs of this query")
+    args = parser.parse_args()
+
+    with ResultsStore(args.db) as store:
+        if args.command == 'import':
+            paths = args.paths or sorted(glob.glob("youtube_results_*.json"))
+            imported, skipped = store.import_json_files(paths)
+            print(f"{Fore.GREEN}✓ Imported {imported} run(s), skipped {skipped} already stored{Style.RESET_ALL}")
+        elif args.command == 'query':
+            for run in store.runs_for_query(args.query, args.days):
+                print(f"#{run['id']} {run['timestamp']} {run['search_query']}: {run['total_videos']} videos, "
+                      f"best {run['best_video_id']}")
+        elif args.command == 'video':
+            for run in store.runs_with_video(args.video_id):
+                print(f"#{run['id']} {run['timestamp']} {run['search_query']}: position {run['position']}, {run['views']}")
+        elif args.command == 'channel':
+            for run in store.runs_with_channel(args.channel):
+                print(f"#{run['id']} {run['timestamp']} {run['search_query']}")
+        elif args.command == 'show':
+            record = store.get_run(args.run_id)
+            if record is None:
+                print(f"{Fore.RED}❌ No run #{args.run_id}{Style.RESET_ALL}")
+                sys.exit(1)
+            print(json.dumps(record, indent=2, ensure_ascii=False))
+        elif args.command == 'export':
+            count = store.export(args.path)
+            print(f"{Fore.GREEN}✓ Exported {count} run(s) to {args.path}{Style.RESET_ALL}")
+        elif args.command == 'trends':
+            if args.rebuild:
+                store.rebuild_trends()
+            rows = store.trends_for_query(args.query, args.limit)
+            if not rows:
+                print(f"{Fore.YELLOW}⚠️ No video of '{args.query}' has been seen in two runs yet{Style.RESET_ALL}")
+            for place, trend in enumerate(rows, 1):
+                moved = trend['rank_change'] or 0
+                movement = f"up {moved}" if moved > 0 else f"down {-moved}" if moved < 0 else "steady"
+                average = (f", {trend['average_velocity']:,.0f}/h over {trend['observations']} runs"
+                           if trend['average_velocity'] is not None else "")
+                print(f"{place}. {trend['title'][:60]} [{trend['video_id']}]")
+                print(f"   📈 {trend['velocity']:+,.0f} views/h{average} | {trend['last_views'] or 0:,} views | "
+                      f"rank {trend['last_rank']} ({movement})")
+        elif args.command == 'series':
+            for timestamp, rank, view_count in store.view_series(args.video_id, args.query):
+                views = f"{view_count:,}" if view_count is not None else "unknown"
+                print(f"{timestamp}  rank {rank:>2}  {views} views")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Snapshot Corpus
+Content-addressed, compressed corpus of recorded results pages, replayed
+through the offline extraction engines to check their speed and correctness
+"""
+
+import io
+import os
+import sys
+import json
+import gzip
+import time
+import hashlib
+import argparse
+import contextlib
+from datetime import datetime
+from colorama import init, Fore, Style
+from youtube_video_finder import (YouTubeVideoFinder, VideoRecord, DEFAULT_SNAPSHOT_DIR, extract_video_id,
+                                  find_initial_data, parse_search_response, _atomic_write)
+
+# Initialize colorama
+init()
+
+# Extraction modes that can run without a browser
+REPLAY_MODES = ('page_source', 'initial_data')
+
+
+class SnapshotCorpus:
+    """Append-only corpus of results page snapshots.
+
+    Every piece of content (page source, ytInitialData, extracted videos) is
+    stored once under objects/ as gzip, named by the SHA-256 of its
+    uncompressed bytes, so re-recording an unchanged page costs nothing.
+    snapshots.jsonl holds one small manifest per snapshot: the search
+    context, the object hashes and how the live extraction went. A
+    snapshot's ID hashes its objects and context, so it is recorded once.
+
+    Only page one is stored: continuation pages fetched or scrolled in live
+    are not, so each manifest also lists the video IDs page one holds.
+    """
+
+    INDEX = 'snapshots.jsonl'
+
+    def __init__(self, root=DEFAULT_SNAPSHOT_DIR):
+        self.root = root
+        os.makedirs(os.path.join(root, 'objects'), exist_ok=True)
+        self._ids = None
+
+    def _object_path(self, digest):
+        return os.path.join(self.root, 'objects', digest[:2], digest[2:] + '.gz')
+
+    def put(self, content):
+        """Store content (str or bytes) once and return its hash"""
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        digest = hashlib.sha256(content).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            _atomic_write(path, gzip.compress(content, compresslevel=9, mtime=0))
+        return digest
+
+    def get(self, digest):
+        with open(self._object_path(digest), 'rb') as f:
+            return gzip.decompress(f.read())
+
+    def record(self, page_source, initial_data, context, videos, extraction=None):
+        """Add one snapshot; returns its manifest (the existing one if already recorded)"""
+        page_hash = self.put(page_source)
+        data_hash = self.put(initial_data) if initial_data else None
+        videos_hash = self.put(json.dumps(videos, ensure_ascii=False, sort_keys=True))
+        key = json.dumps([page_hash, data_hash, videos_hash, context], sort_keys=True)
+        snapshot_id = hashlib.sha256(key.encode('utf-8')).hexdigest()[:16]
+
+        existing = self.find(snapshot_id)
+        if existing:
+            return existing
+        snapshot = {'id': snapshot_id, 'recorded_at': datetime.now().isoformat(timespec='seconds'),
+                    'context': context, 'page': page_hash, 'initial_data': data_hash, 'videos': videos_hash,
+                    'video_count': len(videos), 'page_bytes': len(page_source.encode('utf-8')
+                                                                  if isinstance(page_source, str) else page_source),
+                    'page_one_ids': self._page_one_ids(page_source, initial_data),
+                    'extraction': extraction or {}}
+        # One write per line, so appends from concurrent batch workers do not interleave
+        with open(os.path.join(self.root, self.INDEX), 'a', encoding='utf-8') as f:
+            f.write(json.dumps(snapshot, ensure_ascii=False, default=str) + "\n")
+        if self._ids is not None:
+            self._ids[snapshot_id] = snapshot
+        return snapshot
+
+    @staticmethod
+    def _page_one_ids(page_source, initial_data):
+        """Video IDs in the first page of results, which is all offline replay can see"""
+        try:
+            data = json.loads(initial_data) if initial_data else find_initial_data(page_source)
+        except ValueError:
+            data = None
+        renderers, _ = parse_search_response(data) if data else ([], None)
+        return [renderer['videoId'] for renderer in renderers if renderer.get('videoId')]
+
+    def snapshots(self):
+        """Every snapshot manifest, oldest first"""
+        path = os.path.join(self.root, self.INDEX)
+        if not os.path.exists(path):
+            return []
+        with open(path, encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def find(self, snapshot_id):
+        """The snapshot whose ID starts with snapshot_id, or None"""
+        if self._ids is None:
+            self._ids = {snapshot['id']: snapshot for snapshot in self.snapshots()}
+        if snapshot_id in self._ids:
+            return self._ids[snapshot_id]
+        matches = [snapshot for key, snapshot in self._ids.items() if key.startswith(snapshot_id)]
+        return matches[0] if len(matches) == 1 else None
+
+    def page_source(self, snapshot):
+        return self.get(snapshot['page']).decode('utf-8', errors='replace')
+
+    def initial_data(self, snapshot):
+        return json.loads(self.get(snapshot['initial_data'])) if snapshot.get('initial_data') else None
+
+    def videos(self, snapshot):
+        return json.loads(self.get(snapshot['videos']))
+
+    def stats(self):
+        """Snapshot and object counts with raw against stored bytes"""
+        snapshots = self.snapshots()
+        objects, stored = 0, 0
+        for directory, _, files in os.walk(os.path.join(self.root, 'objects')):
+            for name in files:
+                if name.endswith('.gz'):
+                    objects += 1
+                    stored += os.path.getsize(os.path.join(directory, name))
+        raw = sum(snapshot['page_bytes'] for snapshot in snapshots)
+        return {'snapshots': len(snapshots), 'objects': objects, 'page_bytes': raw, 'stored_bytes': stored}
+
+    @staticmethod
+    def default_modes(snapshot):
+        """The recorded extraction mode when it can be replayed, otherwise every offline mode"""
+        mode = snapshot['context'].get('extraction_mode')
+        return (mode,) if mode in REPLAY_MODES else REPLAY_MODES
+
+    def replay(self, finder, snapshot, mode):
+        """Run offline extraction on a snapshot and compare it with what was extracted live.
+
+        Replaying in the recorded mode must reproduce the live videos field for
+        field. Another engine legitimately formats fields differently (URLs
+        keep or drop tracking parameters, text whitespace differs), so across
+        modes only the set of video IDs must match, and field differences,
+        compared with URLs reduced to their video ID, are informational.
+
+        Offline ytInitialData extraction stops at page one, so when either the
+        replay or the live run used it, videos the live run found beyond page
+        one are counted as beyond_page_one instead of missing.
+        """
+        context = snapshot['context']
+        finder.extraction_mode = mode
+        finder.max_results = context.get('max_results') or finder.max_results
+        finder.base_url = context.get('base_url') or finder.base_url
+        page_source = self.page_source(snapshot)
+        initial_data = self.initial_data(snapshot) if mode == 'initial_data' else None
+
+        start = time.perf_counter()
+        videos = finder.extract_video_data_from_source(page_source, initial_data=initial_data)
+        seconds = time.perf_counter() - start
+
+        strict = mode == context.get('extraction_mode')
+        expected = [VideoRecord.from_dict(video) for video in self.videos(snapshot)]
+        expected_by_key = {finder._dedup_key(video): video for video in expected}
+        required = set(expected_by_key)
+        page_one = snapshot.get('page_one_ids')
+        if page_one is not None and 'initial_data' in (mode, context.get('extraction_mode')):
+            required &= set(page_one)
+        replayed_keys = [finder._dedup_key(video) for video in videos]
+        matched = [key for key in replayed_keys if key in expected_by_key]
+        mismatched_fields = {}
+        for video in videos:
+            original = expected_by_key.get(finder._dedup_key(video))
+            if original is None:
+                continue
+            for field in VideoRecord.FIELDS:
+                value, live_value = video[field], original[field]
+                if field == 'url' and not strict:
+                    value, live_value = extract_video_id(value) or value, extract_video_id(live_value) or live_value
+                if value != live_value:
+                    mismatched_fields[field] = mismatched_fields.get(field, 0) + 1
+        missing = len(required - set(matched))
+        extra = len(replayed_keys) - len(matched)
+        beyond_page_one = len(set(expected_by_key) - required - set(matched))
+        return {'id': snapshot['id'], 'mode': mode, 'strict': strict, 'seconds': seconds, 'videos': len(videos),
+                'expected': len(expected), 'matched': len(matched), 'missing': missing, 'extra': extra,
+                'beyond_page_one': beyond_page_one, 'mismatched_fields': mismatched_fields,
+                'ok': missing == 0 and extra == 0 and (not strict or not mismatched_fields)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect and replay the results page snapshot corpus")
+    parser.add_argument('--corpus', default=DEFAULT_SNAPSHOT_DIR, help="corpus directory")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('list', help="list recorded snapshots")
+    commands.add_parser('stats', help="corpus size and compression")
+    show = commands.add_parser('show', help="print one snapshot's manifest as JSON")
+    show.add_argument('snapshot_id')
+    page = commands.add_parser('page', help="write a snapshot's page source to a file or stdout")
+    page.add_argument('snapshot_id')
+    page.add_argument('-o', '--output', help="output file (default: stdout)")
+    replay = commands.add_parser('replay', help="re-run offline extraction on snapshots and compare with the live result")
+    replay.add_argument('snapshot_ids', nargs='*', help="snapshots to replay (default: all)")
+    replay.add_argument('--mode', action='append', choices=REPLAY_MODES,
+                        help="extraction mode to replay with, may repeat (default: the recorded mode "
+                             "when it runs offline, otherwise both)")
+    replay.add_argument('--limit', type=int, help="replay only the newest LIMIT snapshots")
+    replay.add_argument('--verbose', action='store_true', help="show the extractor's own output")
+    args = parser.parse_args()
+
+    corpus = SnapshotCorpus(args.corpus)
+    if args.command == 'list':
+        for snapshot in corpus.snapshots():
+            context = snapshot['context']
+            print(f"{snapshot['id']} {snapshot['recorded_at']} '{context.get('query')}' "
+                  f"[{context.get('extraction_mode')}]: {snapshot['video_count']} videos, "
+                  f"{snapshot['page_bytes'] // 1024} KB, extracted in {snapshot['extraction'].get('seconds', 0):.2f}s")
+    elif args.command == 'stats':
+        stats = corpus.stats()
+        ratio = stats['page_bytes'] / stats['stored_bytes'] if stats['stored_bytes'] else 0.0
+        print(f"📸 {stats['snapshots']} snapshot(s) in {stats['objects']} object(s): "
+              f"{stats['page_bytes'] / 1024 / 1024:.1f} MB of pages stored in "
+              f"{stats['stored_bytes'] / 1024 / 1024:.1f} MB ({ratio:.1f}x)")
+    elif args.command in ('show', 'page'):
+        snapshot = corpus.find(args.snapshot_id)
+        if snapshot is None:
+            print(f"{Fore.RED}❌ No single snapshot matches '{args.snapshot_id}'{Style.RESET_ALL}")
+            sys.exit(1)
+        if args.command == 'show':
+            print(json.dumps(snapshot, indent=2, ensure_ascii=False))
+        elif args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                f.write(corpus.page_source(snapshot))
+            print(f"{Fore.GREEN}✓ Page source written to {args.output}{Style.RESET_ALL}")
+        else:
+            sys.stdout.write(corpus.page_source(snapshot))
+    elif args.command == 'replay':
+        snapshots = [corpus.find(snapshot_id) for snapshot_id in args.snapshot_ids] or corpus.snapshots()
+        if None in snapshots:
+            print(f"{Fore.RED}❌ Unknown snapshot ID{Style.RESET_ALL}")
+            sys.exit(1)
+        if args.limit:
+            snapshots = snapshots[-args.limit:]
+        # Replay needs no browser, API key, cache or results store
+        finder = YouTubeVideoFinder("replay", result_cache_ttl=None, analysis_cache_ttl=None,
+                                    results_store_path=None, selector_stats_path=None)
+        failures = 0
+        for snapshot in snapshots:
+            for mode in args.mode or corpus.default_modes(snapshot):
+                output = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+                with output:
+                    result = corpus.replay(finder, snapshot, mode)
+                live_seconds = snapshot['extraction'].get('seconds')
+                live = f", live {live_seconds * 1000:.0f}ms" if live_seconds else ""
+                line = (f"{result['id']} {mode:<12} {result['matched']}/{result['expected']} matched, "
+                        f"{result['extra']} extra in {result['seconds'] * 1000:.1f}ms{live}")
+                if result['beyond_page_one']:
+                    line += f" ({result['beyond_page_one']} beyond page one not replayable)"
+                fields = ", ".join(f"{field} x{count}" for field, count in result['mismatched_fields'].items())
+                if not result['ok']:
+                    failures += 1
+                    print(f"{Fore.RED}❌ {line}{' - differs in ' + fields if fields else ''}{Style.RESET_ALL}")
+                elif fields:
+                    recorded = snapshot['context'].get('extraction_mode')
+                    print(f"{Fore.GREEN}✓ {line}{Style.RESET_ALL}{Fore.YELLOW} - recorded in {recorded} mode, "
+                          f"engine differs in {fields}{Style.RESET_ALL}")
+                else:
+                    print(f"{Fore.GREEN}✓ {line}{Style.RESET_ALL}")
+        print(f"\n{len(snapshots)} snapshot(s) replayed, {failures} mismatch(es)")
+        if failures:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Tests for the incremental trend aggregates of the results store"""
+
+import pytest
+
+from results_store import ResultsStore
+
+
+def video(video_id, views):
+    return {'title': f"Video {video_id}", 'url': f"https://www.youtube.com/watch?v={video_id}",
+            'channel': "Channel", 'views': views, 'upload_time': "1 day ago", 'duration': "10:00"}
+
+
+def run(timestamp, videos, query="Lofi  Music"):
+    return {'search_query': query, 'timestamp': timestamp, 'total_videos': len(videos), 'videos': videos}
+
+
+@pytest.fixture
+def store(tmp_path):
+    with ResultsStore(str(tmp_path / 'results.db')) as store:
+        yield store
+
+
+def test_velocity_and_rank_change_between_runs(store):
+    store.save_run(run("20250101_000000", [video('aaaaaaaaaaa', "1K views"), video('bbbbbbbbbbb', "10K views")]))
+    store.save_run(run("20250101_020000", [video('bbbbbbbbbbb', "11K views"), video('aaaaaaaaaaa', "5K views")]))
+
+    trends = {trend['video_id']: trend for trend in store.trends_for_query("lofi music")}
+    assert trends['aaaaaaaaaaa']['velocity'] == pytest.approx(2000.0)  # 4K views over 2 hours
+    assert trends['aaaaaaaaaaa']['rank_change'] == -1
+    assert trends['bbbbbbbbbbb']['velocity'] == pytest.approx(500.0)
+    assert trends['bbbbbbbbbbb']['rank_change'] == 1
+    assert trends['bbbbbbbbbbb']['observations'] == 2
+    assert [trend['video_id'] for trend in store.trends_for_query("lofi music")] == ['aaaaaaaaaaa', 'bbbbbbbbbbb']
+
+
+def test_average_velocity_spans_first_and_last_run(store):
+    for hour, views in ((0, "1K views"), (1, "2K views"), (4, "9K views")):
+        store.save_run(run(f"20250101_0{hour}0000", [video('aaaaaaaaaaa', views)]))
+    trend, = store.trends_for_query("lofi music")
+    assert trend['velocity'] == pytest.approx(7000 / 3)
+    assert trend['average_velocity'] == pytest.approx(2000.0)
+
+
+def test_late_import_of_an_older_run_only_extends_history(store):
+    store.save_run(run("20250101_020000", [video('aaaaaaaaaaa', "3K views")]))
+    store.save_run(run("20250101_030000", [video('aaaaaaaaaaa', "4K views")]))
+    store.save_run(run("20250101_000000", [video('aaaaaaaaaaa', "1K views")]))
+    trend, = store.trends_for_query("lofi music")
+    assert trend['velocity'] == pytest.approx(1000.0)
+    assert trend['first_views'] == 1000
+    assert trend['observations'] == 3
+
+
+def test_incremental_trends_match_a_rebuild(store):
+    store.save_run(run("20250101_000000", [video('aaaaaaaaaaa', "1K views"), video('bbbbbbbbbbb', "2K views")]))
+    store.save_run(run("20250101_010000", [video('bbbbbbbbbbb', "4K views"), video('aaaaaaaaaaa', "1.5K views")]))
+    incremental = store.trends_for_query("lofi music")
+    store.rebuild_trends()
+    assert store.trends_for_query("lofi music") == incremental
+
+
+def test_late_import_between_runs_recomputes_velocity_and_rank(store):
+    store.save_run(run("20250101_000000", [video('aaaaaaaaaaa', "1K views")]))
+    store.save_run(run("20250101_030000", [video('bbbbbbbbbbb', "1K views"), video('aaaaaaaaaaa', "4K views")]))
+    store.save_run(run("20250101_020000", [video('aaaaaaaaaaa', "3K views")]))
+    incremental = store.trends_for_query("lofi music")
+    trend = next(trend for trend in incremental if trend['video_id'] == 'aaaaaaaaaaa')
+    assert trend['velocity'] == pytest.approx(1000.0)  # 3K -> 4K between 02:00 and 03:00
+    assert trend['rank_change'] == -1
+    store.rebuild_trends()
+    assert store.trends_for_query("lofi music") == incremental
+
+
+def test_a_video_listed_twice_in_one_run_counts_once_at_its_best_rank(store):
+    store.save_run(run("20250101_000000", [video('aaaaaaaaaaa', "1K views")]))
+    store.save_run(run("20250101_010000", [video('bbbbbbbbbbb', "1K views"), video('aaaaaaaaaaa', "2K views"),
+                                           video('aaaaaaaaaaa', "2K views")]))
+    trend = next(trend for trend in store.trends_for_query("lofi music") if trend['video_id'] == 'aaaaaaaaaaa')
+    assert trend['observations'] == 2
+    assert trend['last_rank'] == 2 and trend['rank_change'] == -1
+    incremental = store.trends_for_query("lofi music")
+    store.rebuild_trends()
+    assert store.trends_for_query("lofi music") == incremental
+
+
+def test_runs_saved_in_the_same_second_fold_in_insertion_order(store):
+    store.save_run(run("20250101_000000", [video('aaaaaaaaaaa', "1K views")]))
+    store.save_run(run("20250101_010000", [video('aaaaaaaaaaa', "2K views")]))
+    store.save_run(run("20250101_010000", [video('bbbbbbbbbbb', "1K views"), video('aaaaaaaaaaa', "2K views")]))
+    trend = next(trend for trend in store.trends_for_query("lofi music") if trend['video_id'] == 'aaaaaaaaaaa')
+    assert trend['observations'] == 3
+    assert trend['velocity'] == pytest.approx(1000.0)  # no elapsed time, so the last velocity stands
+    assert trend['rank_change'] == -1
+    incremental = store.trends_for_query("lofi music")
+    store.rebuild_trends()
+    assert store.trends_for_query("lofi music") == incremental
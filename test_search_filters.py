@@ -0,0 +1,40 @@
+"""Tests for the `sp` filter encoding used by direct results URLs"""
+
+import base64
+
+import pytest
+
+from youtube_video_finder import SearchFilters, YouTubeVideoFinder
+
+
+def test_default_filters_encode_to_known_sp():
+    # This week, video, 4-20 minutes, sorted by relevance
+    assert SearchFilters().to_sp() == "EgYIAxABGAM="
+
+
+def test_no_filters_and_relevance_sort_have_no_sp():
+    assert SearchFilters(upload_date=None, duration=None, type=None).to_sp() is None
+
+
+def test_sort_only_and_single_filter():
+    assert SearchFilters(upload_date=None, duration=None, type=None, sort='upload_date').to_sp() == "CAI="
+    assert SearchFilters(upload_date='today', duration=None, type=None).to_sp() == "EgIIAg=="
+
+
+def test_nested_fields_follow_field_numbers():
+    raw = base64.b64decode(SearchFilters(upload_date='this_month', duration='over_20', type='video',
+                                         sort='view_count').to_sp())
+    # sort=3 (field 1), then a 6-byte message: upload date=4, type=1, duration=2
+    assert raw == bytes([0x08, 3, 0x12, 6, 0x08, 4, 0x10, 1, 0x18, 2])
+
+
+def test_unknown_filter_value_is_rejected():
+    with pytest.raises(ValueError):
+        SearchFilters(duration='forever')
+
+
+def test_results_url_carries_sp():
+    finder = YouTubeVideoFinder("test", selector_stats_path=None, results_store_path=None,
+                                result_cache_ttl=None, analysis_cache_ttl=None)
+    assert finder.build_results_url("lofi music") == \
+        "https://www.youtube.com/results?search_query=lofi+music&sp=EgYIAxABGAM%3D"
@@ -27,11 +27,11 @@ def main():
     print("=" * 50)
     
     # Check Python version
-    if sys.version_info >= (3, 8):
+    if sys.version_info >= (3, 9):
         print(f"{Fore.GREEN}✓ Python {sys.version_info.major}.{sys.version_info.minor}{Style.RESET_ALL}")
         python_ok = True
     else:
-        print(f"{Fore.RED}❌ Python {sys.version_info.major}.{sys.version_info.minor} - Requires 3.8+{Style.RESET_ALL}")
+        print(f"{Fore.RED}❌ Python {sys.version_info.major}.{sys.version_info.minor} - Requires 3.9+{Style.RESET_ALL}")
         python_ok = False
     
     # Test essential dependencies
@@ -43,7 +43,9 @@ def main():
         ('pyaudio', 'PyAudio'),
         ('googletrans', 'Google Translate'),
         ('colorama', 'Colorama'),
-        ('tqdm', 'TQDM')
+        ('lxml', 'lxml'),
+        ('urllib3', 'urllib3'),
+        ('numpy', 'numpy')
     ]
     
     print(f"\n{Fore.CYAN}Testing dependencies...{Style.RESET_ALL}")
@@ -59,7 +61,7 @@ def main():
     else:
         print(f"{Fore.YELLOW}⚠️ Issues found:{Style.RESET_ALL}")
         if not python_ok:
-            print("   - Upgrade Python to 3.8+")
+            print("   - Upgrade Python to 3.9+")
         if failed:
             print("   - Install missing packages: pip install -r requirements.txt")
 
@@ -0,0 +1,87 @@
+"""Tests for the content-addressed snapshot corpus"""
+
+import gzip
+import hashlib
+import json
+import os
+
+from snapshot_corpus import SnapshotCorpus
+
+PAGE = "<html><body>" + "<ytd-video-renderer></ytd-video-renderer>" * 200 + "</body></html>"
+DATA = json.dumps({'contents': {}})
+CONTEXT = {'query': "lofi music", 'extraction_mode': 'bulk', 'max_results': 20}
+VIDEOS = [{'title': "A video", 'url': "https://www.youtube.com/watch?v=aaaaaaaaaaa"}]
+
+
+def object_files(root):
+    return sorted(name for _, _, files in os.walk(os.path.join(root, 'objects')) for name in files)
+
+
+def test_objects_are_named_by_content_hash_and_compressed(tmp_path):
+    corpus = SnapshotCorpus(str(tmp_path))
+    digest = corpus.put(PAGE)
+    assert digest == hashlib.sha256(PAGE.encode('utf-8')).hexdigest()
+    path = tmp_path / 'objects' / digest[:2] / (digest[2:] + '.gz')
+    assert gzip.decompress(path.read_bytes()) == PAGE.encode('utf-8')
+    assert path.stat().st_size < len(PAGE)
+    assert corpus.get(digest) == PAGE.encode('utf-8')
+
+
+def test_identical_content_is_stored_once(tmp_path):
+    corpus = SnapshotCorpus(str(tmp_path))
+    assert corpus.put(PAGE) == corpus.put(PAGE.encode('utf-8'))
+    assert len(object_files(tmp_path)) == 1
+
+
+def test_recording_the_same_snapshot_twice_keeps_one_manifest(tmp_path):
+    first = SnapshotCorpus(str(tmp_path)).record(PAGE, DATA, CONTEXT, VIDEOS, {'seconds': 1.0})
+    again = SnapshotCorpus(str(tmp_path)).record(PAGE, DATA, CONTEXT, VIDEOS, {'seconds': 2.0})
+    assert again['id'] == first['id']
+    assert len(SnapshotCorpus(str(tmp_path)).snapshots()) == 1
+    assert len(object_files(tmp_path)) == 3  # page, ytInitialData, videos
+
+
+def test_new_context_is_a_new_snapshot_sharing_the_page(tmp_path):
+    corpus = SnapshotCorpus(str(tmp_path))
+    first = corpus.record(PAGE, DATA, CONTEXT, VIDEOS)
+    second = corpus.record(PAGE, DATA, dict(CONTEXT, extraction_mode='page_source'), VIDEOS)
+    assert second['id'] != first['id'] and second['page'] == first['page']
+    assert len(corpus.snapshots()) == 2
+    assert len(object_files(tmp_path)) == 3
+
+
+def test_snapshot_round_trip_and_prefix_lookup(tmp_path):
+    snapshot = SnapshotCorpus(str(tmp_path)).record(PAGE, DATA, CONTEXT, VIDEOS)
+    corpus = SnapshotCorpus(str(tmp_path))
+    found = corpus.find(snapshot['id'][:6])
+    assert found == snapshot
+    assert corpus.page_source(found) == PAGE
+    assert corpus.initial_data(found) == {'contents': {}}
+    assert corpus.videos(found) == VIDEOS
+    assert found['page_bytes'] == len(PAGE)
+
+
+def test_replay_defaults_to_the_recorded_mode_when_it_runs_offline():
+    assert SnapshotCorpus.default_modes({'context': {'extraction_mode': 'page_source'}}) == ('page_source',)
+    assert SnapshotCorpus.default_modes({'context': {'extraction_mode': 'bulk'}}) == ('page_source', 'initial_data')
+
+
+def test_replay_only_requires_page_one_when_initial_data_is_involved(tmp_path):
+    from youtube_video_finder import YouTubeVideoFinder
+
+    def renderer(video_id):
+        return {'videoRenderer': {'videoId': video_id, 'title': {'simpleText': f"Video {video_id}"}}}
+    data = {'contents': [renderer('aaaaaaaaaaa'), renderer('bbbbbbbbbbb'),
+                         {'continuationItemRenderer': {'continuationEndpoint': {
+                             'continuationCommand': {'token': "next"}}}}]}
+    live = [{'title': f"Video {video_id}", 'url': f"https://www.youtube.com/watch?v={video_id}"}
+            for video_id in ('aaaaaaaaaaa', 'bbbbbbbbbbb', 'ccccccccccc')]
+    corpus = SnapshotCorpus(str(tmp_path))
+    snapshot = corpus.record(PAGE, json.dumps(data), dict(CONTEXT, extraction_mode='initial_data'), live)
+    assert snapshot['page_one_ids'] == ['aaaaaaaaaaa', 'bbbbbbbbbbb']
+
+    finder = YouTubeVideoFinder("replay", result_cache_ttl=None, analysis_cache_ttl=None,
+                                results_store_path=None, selector_stats_path=None)
+    result = corpus.replay(finder, snapshot, 'initial_data')
+    assert result['ok'] and result['matched'] == 2
+    assert result['missing'] == 0 and result['beyond_page_one'] == 1
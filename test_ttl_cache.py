@@ -0,0 +1,71 @@
+"""Tests for TTLCache expiry, LRU eviction and the on-disk tier"""
+
+import os
+
+import youtube_video_finder
+from youtube_video_finder import TTLCache
+
+
+class Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def freeze_time(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(youtube_video_finder.time, 'time', clock)
+    return clock
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    clock = freeze_time(monkeypatch)
+    cache = TTLCache(ttl=60)
+    cache.put('q', [1, 2])
+    clock.now += 59
+    assert cache.get('q') == [1, 2]
+    clock.now += 1
+    assert cache.get('q') is None
+    assert cache.stats == {'hits': 1, 'disk_hits': 0, 'misses': 1, 'expired': 1, 'evicted': 0}
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(ttl=60, max_entries=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1  # 'b' is now the least recently used
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+    assert cache.stats['evicted'] == 1
+
+
+def test_disk_tier_survives_a_new_instance(tmp_path):
+    TTLCache(ttl=60, disk_dir=str(tmp_path)).put('q', {'videos': ['x']})
+    cache = TTLCache(ttl=60, disk_dir=str(tmp_path))
+    assert cache.get('q') == {'videos': ['x']}
+    assert cache.stats['disk_hits'] == 1
+    assert cache.get('q') == {'videos': ['x']}
+    assert cache.stats['hits'] == 1
+
+
+def test_expired_disk_entry_is_removed(tmp_path, monkeypatch):
+    clock = freeze_time(monkeypatch)
+    TTLCache(ttl=60, disk_dir=str(tmp_path)).put('q', 1)
+    clock.now += 61
+    assert TTLCache(ttl=60, disk_dir=str(tmp_path)).get('q') is None
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.json')]
+
+
+def test_disk_tier_is_pruned_oldest_first(tmp_path):
+    cache = TTLCache(ttl=60, disk_dir=str(tmp_path), disk_max_entries=2)
+    for age, key in enumerate(('old', 'mid', 'new')):
+        cache.put(key, key)
+        # Distinct mtimes regardless of filesystem timestamp resolution
+        os.utime(cache._disk_path(key), (1000 + age, 1000 + age))
+    cache._prune_disk()
+    fresh = TTLCache(ttl=60, disk_dir=str(tmp_path))
+    assert fresh.get('old') is None
+    assert fresh.get('mid') == 'mid' and fresh.get('new') == 'new'
@@ -1,42 +1,1352 @@
 import os
+import sys
+import math
 import time
 import json
 import re
-import speech_recognition as sr
+import base64
+import hashlib
+import functools
+import queue
+import argparse
+import threading
+import multiprocessing
+import multiprocessing.util
+import importlib
+import tempfile
+import subprocess
+import tracemalloc
+from collections import OrderedDict
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
-from googletrans import Translator
-import google.generativeai as genai
+from urllib.parse import urlencode, urljoin, urlparse, parse_qs
 from colorama import init, Fore, Style
-from tqdm import tqdm
 
 # Initialize colorama for colored output
 init()
 
+class LazyImport:
+    """Module (or module attribute) imported on first use instead of at startup.
+    
+    Attribute access and calls are forwarded to the target, so call sites
+    read like ordinary imports. Exception classes cannot be proxied in an
+    except clause; reach them through a lazily imported module instead.
+    """
+    
+    def __init__(self, module_name, attribute=None):
+        self._module_name = module_name
+        self._attribute = attribute
+        self._target = None
+    
+    def _resolve(self):
+        if self._target is None:
+            target = importlib.import_module(self._module_name)
+            self._target = getattr(target, self._attribute) if self._attribute else target
+        return self._target
+    
+    def __getattr__(self, name):
+        return getattr(self._resolve(), name)
+    
+    def __call__(self, *args, **kwargs):
+        return self._resolve()(*args, **kwargs)
+    
+    def __repr__(self):
+        target = f"{self._module_name}.{self._attribute}" if self._attribute else self._module_name
+        state = "loaded" if self._target is not None else "not loaded"
+        return f"<LazyImport {target} ({state})>"
+
+# Heavy dependencies load when their code path first runs, so text, batch,
+# HTTP and replay modes never import the browser, audio or translation stacks
+# they do not use
+np = LazyImport('numpy')
+urllib3 = LazyImport('urllib3')
+sr = LazyImport('speech_recognition')
+webdriver = LazyImport('selenium.webdriver')
+By = LazyImport('selenium.webdriver.common.by', 'By')
+Keys = LazyImport('selenium.webdriver.common.keys', 'Keys')
+WebDriverWait = LazyImport('selenium.webdriver.support.ui', 'WebDriverWait')
+EC = LazyImport('selenium.webdriver.support.expected_conditions')
+Service = LazyImport('selenium.webdriver.chrome.service', 'Service')
+Options = LazyImport('selenium.webdriver.chrome.options', 'Options')
+selenium_exceptions = LazyImport('selenium.common.exceptions')
+ChromeDriverManager = LazyImport('webdriver_manager.chrome', 'ChromeDriverManager')
+Translator = LazyImport('googletrans', 'Translator')
+etree = LazyImport('lxml.etree')
+lxml_html = LazyImport('lxml.html')
+genai = LazyImport('google.generativeai')
+
+# Collects raw field values for every result container in a single WebDriver
+# round-trip. For each field it returns one entry per selector, in the same
+# order as the Python selector lists, so the fallback rules in
+# YouTubeVideoFinder._build_video_data can be applied unchanged.
+BULK_EXTRACT_SCRIPT = """
+const containerSelectors = arguments[0], fields = arguments[1], limit = arguments[2], offset = arguments[3] || 0;
+const snapshot = (xpath, ctx) => {
+    const result = document.evaluate(xpath, ctx, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    const nodes = [];
+    for (let i = 0; i < result.snapshotLength; i++) nodes.push(result.snapshotItem(i));
+    return nodes;
+};
+const first = (xpath, ctx) => document.evaluate(
+    xpath, ctx, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+const text = el => el.innerText || '';
+const attr = (el, name) => el.getAttribute(name);
+const eachFirst = (selectors, ctx, read) => selectors.map(sel => {
+    try { const el = first(sel, ctx); return el ? read(el) : null; } catch (e) { return null; }
+});
+
+let containers = [], selector = null, tried = 0;
+for (const sel of containerSelectors) {
+    tried++;
+    try { containers = snapshot(sel, document); } catch (e) { containers = []; }
+    if (containers.length) { selector = sel; break; }
+}
+
+const items = containers.slice(offset, offset + limit).map(c => ({
+    title: eachFirst(fields.title, c, el => [attr(el, 'title'), attr(el, 'aria-label'), text(el)]),
+    url: eachFirst(fields.url, c, el => el.href || attr(el, 'href')),
+    channel: eachFirst(fields.channel, c, el => [text(el), attr(el, 'aria-label')]),
+    metadata: fields.metadata.map(sel => {
+        try { return snapshot(sel, c).map(text); } catch (e) { return []; }
+    }),
+    duration: eachFirst(fields.duration, c, text)
+}));
+return {selector: selector, total: containers.length, selectors_tried: tried, items: items};
+"""
+
+
+# Reports page readiness in one round-trip. On first use in a document it
+# attaches a MutationObserver to the results list that timestamps every
+# childList change; passing true as the first argument restarts that quiet
+# period so a wait cannot finish before a just-triggered update has begun.
+READINESS_PROBE_SCRIPT = """
+const restart = arguments[0];
+const target = document.querySelector('ytd-section-list-renderer') ||
+               document.querySelector('#contents') || document.body;
+if (target && (!window.__ytvfObserved || !document.contains(window.__ytvfObserved))) {
+    if (window.__ytvfObserver) window.__ytvfObserver.disconnect();
+    window.__ytvfObserver = new MutationObserver(() => { window.__ytvfLastMutation = performance.now(); });
+    window.__ytvfObserver.observe(target, {childList: true, subtree: true});
+    window.__ytvfObserved = target;
+    window.__ytvfLastMutation = performance.now();
+}
+if (restart) window.__ytvfLastMutation = performance.now();
+return {
+    ready: document.readyState,
+    resources: performance.getEntriesByType('resource').length,
+    idle_ms: performance.now() - (window.__ytvfLastMutation || 0),
+    containers: document.querySelectorAll('ytd-video-renderer').length
+};
+"""
+
+
+# URL patterns blocked through CDP Network.setBlockedURLs in the lean browser
+# profile. The extractor only reads text and hrefs, so thumbnails, preview
+# video, fonts and ad/tracking requests are never needed.
+LEAN_BLOCKED_URLS = [
+    "*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*.mp4", "*.webm", "*videoplayback*",
+    "*i.ytimg.com/*", "*yt3.ggpht.com/*", "*yt3.googleusercontent.com/*",
+    "*doubleclick.net/*", "*googlesyndication.com/*", "*googleadservices.com/*",
+    "*google-analytics.com/*", "*/pagead/*", "*/ptracking*", "*/api/stats/*"
+]
+
+# Page load time and bytes transferred for the current document, from the
+# Navigation and Resource Timing APIs
+PAGE_METRICS_SCRIPT = """
+const nav = performance.getEntriesByType('navigation')[0];
+const resources = performance.getEntriesByType('resource');
+let bytes = nav ? nav.transferSize : 0;
+for (const entry of resources) bytes += entry.transferSize || 0;
+return {
+    load_ms: nav ? (nav.loadEventEnd || performance.now()) - nav.startTime : performance.now(),
+    dom_content_loaded_ms: nav ? nav.domContentLoadedEventEnd - nav.startTime : null,
+    transfer_bytes: bytes,
+    requests: resources.length + (nav ? 1 : 0)
+};
+"""
+
+# Remembers which Chrome binary and ChromeDriver worked, so later starts can
+# skip probing paths and ChromeDriverManager
+DEFAULT_DRIVER_CACHE_PATH = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'),
+    'youtube_video_finder', 'driver_cache.json')
+
+# Learned selector success rates, see SelectorStats
+DEFAULT_SELECTOR_STATS_PATH = os.path.join(os.path.dirname(DEFAULT_DRIVER_CACHE_PATH), 'selector_stats.json')
+
+DEFAULT_RESULTS_STORE_PATH = "youtube_results.db"
+
+# Record-and-replay corpus of results pages, see snapshot_corpus.py
+DEFAULT_SNAPSHOT_DIR = "youtube_snapshots"
+
+VIDEO_ID_PATTERN = re.compile(r'(?:[?&]v=|/shorts/)([\w-]{11})')
+
+# Markers that precede the embedded ytInitialData JSON in a results page
+INITIAL_DATA_MARKERS = ("var ytInitialData = ", 'window["ytInitialData"] = ', "ytInitialData = ")
+
+# Returns the search response backing the current results page as a JSON
+# string. After in-app navigation window.ytInitialData still holds the first
+# page's data, so the ytd-search element's data is preferred when present.
+INITIAL_DATA_SCRIPT = """
+const search = document.querySelector('ytd-search');
+const data = (search && search.data) || window.ytInitialData;
+return data ? JSON.stringify(data) : null;
+"""
+
+# Fetches one continuation page of search results through the InnerTube API
+# the results page itself uses; resolves with the response text.
+CONTINUATION_SCRIPT = """
+const token = arguments[0], done = arguments[arguments.length - 1];
+const key = window.ytcfg && ytcfg.get('INNERTUBE_API_KEY');
+const context = window.ytcfg && ytcfg.get('INNERTUBE_CONTEXT');
+if (!context) { done(null); return; }
+fetch('/youtubei/v1/search?prettyPrint=false' + (key ? '&key=' + key : ''), {
+    method: 'POST',
+    headers: {'Content-Type': 'application/json'},
+    body: JSON.stringify({context: context, continuation: token})
+}).then(r => r.text()).then(done).catch(() => done(null));
+"""
+
+# Checks every candidate selector, CSS or XPath, in one round-trip and returns
+# [index, element] for the first (in list order) that matches, or null. With
+# arguments[1] true the element must also be visible and enabled.
+RACE_SELECTORS_SCRIPT = r"""
+const selectors = arguments[0], clickable = arguments[1];
+const usable = el => !clickable || (el.getClientRects().length > 0 && !el.disabled);
+for (let i = 0; i < selectors.length; i++) {
+    let el = null;
+    try {
+        el = /^\(*\.?\//.test(selectors[i])
+            ? document.evaluate(selectors[i], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+            : document.querySelector(selectors[i]);
+    } catch (e) { continue; }
+    if (el && usable(el)) return [i, el];
+}
+return null;
+"""
+
+def find_initial_data(page_source):
+    """Return the ytInitialData object embedded in a results page, or None"""
+    if isinstance(page_source, bytes):
+        page_source = page_source.decode('utf-8', errors='replace')
+    for marker in INITIAL_DATA_MARKERS:
+        start = page_source.find(marker)
+        if start != -1:
+            try:
+                data, _ = json.JSONDecoder().raw_decode(page_source, start + len(marker))
+                return data
+            except ValueError:
+                continue
+    return None
+
+def _text_of(field):
+    """Read a simpleText or runs-style text field"""
+    if not field:
+        return None
+    if 'simpleText' in field:
+        return field['simpleText']
+    return ''.join(run.get('text', '') for run in field.get('runs', [])) or None
+
+def parse_search_response(data):
+    """Collect videoRenderer objects and the next continuation token from a search response.
+    
+    Works on both ytInitialData and continuation responses, since both nest
+    results somewhere below itemSectionRenderer contents.
+    """
+    renderers = []
+    token = None
+    pending = [data]
+    while pending:
+        node = pending.pop()
+        if isinstance(node, dict):
+            if 'videoRenderer' in node:
+                renderers.append(node['videoRenderer'])
+                continue
+            if 'continuationItemRenderer' in node:
+                command = node['continuationItemRenderer'].get('continuationEndpoint', {}).get('continuationCommand', {})
+                token = command.get('token') or token
+                continue
+            # Reversed so that pop() visits children in document order
+            pending.extend(reversed(list(node.values())))
+        elif isinstance(node, list):
+            pending.extend(reversed(node))
+    return renderers, token
+
+def video_from_renderer(renderer, base_url="https://www.youtube.com"):
+    """Map a videoRenderer to the video dict produced by DOM extraction"""
+    video_data = {'title': 'Unknown Title', 'url': 'Unknown URL', 'channel': 'Unknown Channel', 
+                  'views': 'Unknown views', 'upload_time': 'Unknown time', 'duration': 'Unknown duration'}
+    title = _text_of(renderer.get('title'))
+    if title:
+        video_data['title'] = title.strip()
+    if renderer.get('videoId'):
+        video_data['url'] = f"{base_url}/watch?v={renderer['videoId']}"
+    channel = _text_of(renderer.get('ownerText')) or _text_of(renderer.get('longBylineText'))
+    if channel:
+        video_data['channel'] = channel
+    # The short form ("71K views") matches what the results page displays
+    views = _text_of(renderer.get('shortViewCountText')) or _text_of(renderer.get('viewCountText'))
+    if views:
+        video_data['views'] = views
+    upload_time = _text_of(renderer.get('publishedTimeText'))
+    if upload_time:
+        video_data['upload_time'] = upload_time
+    duration = _text_of(renderer.get('lengthText'))
+    if duration:
+        video_data['duration'] = duration
+    return video_data
+
+def find_ytcfg(page_source):
+    """Merge every ytcfg.set({...}) object in a page (InnerTube API key and client context)"""
+    if isinstance(page_source, bytes):
+        page_source = page_source.decode('utf-8', errors='replace')
+    config = {}
+    decoder = json.JSONDecoder()
+    for match in re.finditer(r'ytcfg\.set\(\s*\{', page_source):
+        try:
+            value, _ = decoder.raw_decode(page_source, match.end() - 1)
+            config.update(value)
+        except ValueError:
+            continue
+    return config
+
+class Urllib3Transport:
+    """Keep-alive HTTP transport: one urllib3 connection pool reused for every request"""
+    
+    def __init__(self, maxsize=4, timeout=15):
+        self.pool = urllib3.PoolManager(maxsize=maxsize, timeout=urllib3.Timeout(total=timeout),
+                                        retries=urllib3.Retry(2, backoff_factor=0.3))
+    
+    def request(self, method, url, body=None, headers=None):
+        """Send a request and return (status, body text)"""
+        response = self.pool.request(method, url, body=body, headers=headers)
+        return response.status, response.data.decode('utf-8', errors='replace')
+
+class YouTubeHTTPSearch:
+    """Browserless search: fetch the results page and continuations over plain HTTP.
+    
+    Any object with a request(method, url, body=None, headers=None) method that
+    returns (status, text) can be injected as the transport, and base_url can
+    point at a local stand-in server that serves recorded pages.
+    """
+    HEADERS = {
+        'User-Agent': "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+        'Accept-Language': "en-US,en;q=0.9",
+        # Skip the cookie consent interstitial served to new visitors
+        'Cookie': "CONSENT=YES+1; SOCS=CAI"
+    }
+    
+    def __init__(self, base_url="https://www.youtube.com", transport=None, max_pages=10):
+        self.base_url = base_url.rstrip('/')
+        self.transport = transport or Urllib3Transport()
+        self.max_pages = max_pages
+        self.last_stats = None
+    
+    def _get(self, url, stats, method='GET', body=None, headers=None):
+        start = time.perf_counter()
+        status, text = self.transport.request(method, url, body=body, headers=dict(self.HEADERS, **(headers or {})))
+        stats['fetch_seconds'] += time.perf_counter() - start
+        stats['requests'] += 1
+        stats['bytes'] += len(text.encode('utf-8'))
+        if status != 200:
+            raise Exception(f"HTTP {status} from {url}")
+        return text
+    
+    def iter_results(self, results_url):
+        """Return an iterator of (index, video_data) from a results page, then continuation pages on demand.
+        
+        last_stats is set before anything is fetched and fills in as the
+        iterator is consumed.
+        """
+        stats = {'engine': 'HTTP', 'webdriver_calls': 0, 'requests': 0, 'bytes': 0,
+                 'pages': 1, 'renderers': 0, 'fetch_seconds': 0.0, 'parse_seconds': 0.0}
+        self.last_stats = stats
+        return self._iter_pages(results_url, stats)
+    
+    def _iter_pages(self, results_url, stats):
+        page = self._get(results_url, stats)
+        start = time.perf_counter()
+        data = find_initial_data(page)
+        if not data:
+            raise Exception("results page has no ytInitialData")
+        renderers, token = parse_search_response(data)
+        config = find_ytcfg(page) if token else {}
+        stats['parse_seconds'] += time.perf_counter() - start
+        
+        index = 0
+        while True:
+            stats['renderers'] += len(renderers)
+            for renderer in renderers:
+                index += 1
+                yield index, video_from_renderer(renderer, self.base_url)
+            if not token or not config.get('INNERTUBE_CONTEXT') or stats['pages'] >= self.max_pages:
+                return
+            
+            url = f"{self.base_url}/youtubei/v1/search?prettyPrint=false"
+            if config.get('INNERTUBE_API_KEY'):
+                url += f"&key={config['INNERTUBE_API_KEY']}"
+            body = json.dumps({'context': config['INNERTUBE_CONTEXT'], 'continuation': token})
+            response = self._get(url, stats, 'POST', body, {'Content-Type': 'application/json'})
+            start = time.perf_counter()
+            renderers, token = parse_search_response(json.loads(response))
+            stats['parse_seconds'] += time.perf_counter() - start
+            stats['pages'] += 1
+            if not renderers:
+                return
+
+VIEW_COUNT_PATTERN = re.compile(r'([\d][\d,.]*)\s*([KMB])?\b', re.I)
+RELATIVE_TIME_PATTERN = re.compile(r'(\d+)\s*(second|minute|hour|day|week|month|year)', re.I)
+HOURS_PER_UNIT = {'second': 1 / 3600, 'minute': 1 / 60, 'hour': 1, 'day': 24, 'week': 168, 'month': 730, 'year': 8760}
+
+def parse_view_count(text):
+    """"1.2M views" -> 1200000.0; "No views" -> 0.0; unparseable -> nan"""
+    text = text or ''
+    if text.strip().lower().startswith('no view'):
+        return 0.0
+    match = VIEW_COUNT_PATTERN.search(text)
+    if not match:
+        return math.nan
+    number = match.group(1).replace(',', '')
+    try:
+        value = float(number)
+    except ValueError:
+        return math.nan
+    return value * {'k': 1e3, 'm': 1e6, 'b': 1e9}.get((match.group(2) or '').lower(), 1)
+
+def parse_relative_time(text):
+    """Age in hours of "3 days ago" / "Streamed 2 weeks ago", or nan"""
+    match = RELATIVE_TIME_PATTERN.search(text or '')
+    if not match:
+        return math.nan
+    return int(match.group(1)) * HOURS_PER_UNIT[match.group(2).lower()]
+
+def parse_duration(text):
+    """Seconds in "12:34" or "1:02:03", or nan"""
+    parts = (text or '').strip().split(':')
+    if len(parts) < 2 or not all(part.isdigit() for part in parts):
+        return math.nan
+    seconds = 0
+    for part in parts:
+        seconds = seconds * 60 + int(part)
+    return float(seconds)
+
+def estimate_tokens(text):
+    """Rough prompt token count (about 4 characters per token for English text)"""
+    return (len(text) + 3) // 4
+
+def _atomic_write(path, data):
+    """Write str or bytes to path via a temp file and rename, so concurrent
+    batch workers never read a partially written file"""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def extract_video_id(url):
+    """Return the 11-character video ID from a watch?v= or /shorts/ URL, or None"""
+    match = VIDEO_ID_PATTERN.search(url or '')
+    return match.group(1) if match else None
+
+class TTLCache:
+    """Size-bounded LRU cache whose entries expire after `ttl` seconds.
+    
+    With disk_dir set, entries are also written there as JSON files named by the
+    SHA-256 of their key, so they survive restarts and are shared between
+    processes. The disk tier is pruned to disk_max_entries, least recently used first.
+    """
+    
+    def __init__(self, ttl=3600, max_entries=128, disk_dir=None, disk_max_entries=1000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self.disk_max_entries = disk_max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'disk_hits': 0, 'misses': 0, 'expired': 0, 'evicted': 0}
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+    
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, hashlib.sha256(key.encode('utf-8')).hexdigest() + '.json')
+    
+    def _fresh(self, stored_at):
+        return time.time() - stored_at < self.ttl
+    
+    def get(self, key):
+        """Return the cached value, or None when missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if self._fresh(entry[0]):
+                    self._entries.move_to_end(key)
+                    self.stats['hits'] += 1
+                    return entry[1]
+                del self._entries[key]
+                self.stats['expired'] += 1
+        
+        if self.disk_dir:
+            path = self._disk_path(key)
+            try:
+                with open(path, encoding='utf-8') as f:
+                    stored = json.load(f)
+                if self._fresh(stored['stored_at']):
+                    os.utime(path)  # Disk tier LRU order follows mtime
+                    self._remember(key, stored['stored_at'], stored['value'])
+                    self.stats['disk_hits'] += 1
+                    return stored['value']
+                os.remove(path)
+                self.stats['expired'] += 1
+            except (OSError, ValueError, KeyError):
+                pass
+        
+        self.stats['misses'] += 1
+        return None
+    
+    def _remember(self, key, stored_at, value):
+        with self._lock:
+            self._entries[key] = (stored_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats['evicted'] += 1
+    
+    def put(self, key, value):
+        """Store a JSON-serialisable value"""
+        stored_at = time.time()
+        self._remember(key, stored_at, value)
+        if not self.disk_dir:
+            return
+        try:
+            _atomic_write(self._disk_path(key),
+                          json.dumps({'key': key, 'stored_at': stored_at, 'value': value}, ensure_ascii=False))
+            self._prune_disk()
+        except OSError as e:
+            print(f"{Fore.YELLOW}⚠️ Could not write cache entry: {e}{Style.RESET_ALL}")
+    
+    def _prune_disk(self):
+        files = [os.path.join(self.disk_dir, name) for name in os.listdir(self.disk_dir) if name.endswith('.json')]
+        if len(files) <= self.disk_max_entries:
+            return
+        files.sort(key=lambda path: os.path.getmtime(path))
+        for path in files[:len(files) - self.disk_max_entries]:
+            try:
+                os.remove(path)
+                self.stats['evicted'] += 1
+            except OSError:
+                pass
+    
+    @property
+    def lookups(self):
+        return self.stats['hits'] + self.stats['disk_hits'] + self.stats['misses']
+    
+    @property
+    def hit_rate(self):
+        return (self.stats['hits'] + self.stats['disk_hits']) / self.lookups if self.lookups else 0.0
+
+class VideoRecord(Mapping):
+    """One search result: its six display strings plus the fields parsed from them.
+    
+    Parsing happens once, at construction: view_count (int), uploaded_at (epoch
+    seconds, from the relative upload time as of extracted_at), duration_seconds
+    and video_id, each None when the string could not be parsed. Read-only
+    mapping access over the display strings keeps video['title'] working, and
+    dict(video) / to_dict() gives back exactly the JSON schema save_results writes.
+    """
+    FIELDS = ('title', 'url', 'channel', 'views', 'upload_time', 'duration')
+    DEFAULTS = {'title': 'Unknown Title', 'url': 'Unknown URL', 'channel': 'Unknown Channel',
+                'views': 'Unknown views', 'upload_time': 'Unknown time', 'duration': 'Unknown duration'}
+    __slots__ = FIELDS + ('video_id', 'view_count', 'uploaded_at', 'duration_seconds')
+    
+    def __init__(self, title='Unknown Title', url='Unknown URL', channel='Unknown Channel',
+                 views='Unknown views', upload_time='Unknown time', duration='Unknown duration', extracted_at=None):
+        self.title = title
+        self.url = url
+        self.channel = channel
+        self.views = views
+        self.upload_time = upload_time
+        self.duration = duration
+        
+        self.video_id = extract_video_id(url)
+        view_count = parse_view_count(views)
+        self.view_count = None if math.isnan(view_count) else int(view_count)
+        age_hours = parse_relative_time(upload_time)
+        self.uploaded_at = None if math.isnan(age_hours) else (extracted_at or time.time()) - age_hours * 3600
+        seconds = parse_duration(duration)
+        self.duration_seconds = None if math.isnan(seconds) else int(seconds)
+    
+    @classmethod
+    def from_dict(cls, data, extracted_at=None):
+        return cls(**{field: data.get(field, cls.DEFAULTS[field]) for field in cls.FIELDS}, extracted_at=extracted_at)
+    
+    @classmethod
+    def coerce(cls, video):
+        """Return video as a VideoRecord, parsing it if it is a plain dict"""
+        return video if isinstance(video, cls) else cls.from_dict(video)
+    
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self.FIELDS}
+    
+    def __getitem__(self, key):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def __iter__(self):
+        return iter(self.FIELDS)
+    
+    def __len__(self):
+        return len(self.FIELDS)
+    
+    def __repr__(self):
+        return f"VideoRecord(video_id={self.video_id!r}, title={self.title!r})"
+
+
+class VideoTable:
+    """Columnar view of many VideoRecords for vectorized filtering and scoring.
+    
+    view_counts, uploaded_at and duration_seconds are float arrays aligned with
+    records, with NaN where the record's value is unknown.
+    """
+    
+    def __init__(self, videos):
+        self.records = [VideoRecord.coerce(video) for video in videos]
+        self.view_counts = self._column('view_count')
+        self.uploaded_at = self._column('uploaded_at')
+        self.duration_seconds = self._column('duration_seconds')
+    
+    def _column(self, name):
+        values = (getattr(record, name) for record in self.records)
+        return np.fromiter((math.nan if value is None else value for value in values),
+                           dtype=float, count=len(self.records))
+    
+    def __len__(self):
+        return len(self.records)
+    
+    def __iter__(self):
+        return iter(self.records)
+    
+    def __getitem__(self, index):
+        return self.records[index]
+    
+    def age_hours(self, now=None):
+        return ((now or time.time()) - self.uploaded_at) / 3600
+    
+    def where(self, min_views=None, max_age_hours=None, min_duration=None, max_duration=None):
+        """Boolean mask of records meeting every given bound; unknown values never match a bound"""
+        mask = np.ones(len(self.records), dtype=bool)
+        with np.errstate(invalid='ignore'):
+            if min_views is not None:
+                mask &= self.view_counts >= min_views
+            if max_age_hours is not None:
+                mask &= self.age_hours() <= max_age_hours
+            if min_duration is not None:
+                mask &= self.duration_seconds >= min_duration
+            if max_duration is not None:
+                mask &= self.duration_seconds <= max_duration
+        return mask
+    
+    def select(self, selector):
+        """New table with the records picked by a boolean mask or an index array"""
+        selector = np.asarray(selector)
+        indices = np.flatnonzero(selector) if selector.dtype == bool else selector
+        return VideoTable([self.records[i] for i in indices])
+    
+    def to_dicts(self):
+        return [record.to_dict() for record in self.records]
+
+
+class LocalRanker:
+    """Deterministic scorer that ranks a whole result set in one vectorized pass.
+    
+    Each video gets four features in [0, 1]: the share of query terms found in
+    the title, log-scaled views relative to the most viewed result, recency
+    (halving every recency_half_life_hours) and fit to the preferred duration
+    range. The score is their weighted sum; unknown views or ages score 0 and
+    unknown durations 0.5.
+    """
+    DEFAULT_WEIGHTS = {'relevance': 0.45, 'views': 0.25, 'recency': 0.2, 'duration': 0.1}
+    DURATION_RANGES = {None: None, 'under_4': (0, 240), '4_20': (240, 1200), 'over_20': (1200, math.inf)}
+    TERM_PATTERN = re.compile(r'\w+', re.UNICODE)
+    
+    def __init__(self, weights=None, duration_range=(240, 1200), recency_half_life_hours=72):
+        unknown = set(weights or {}) - set(self.DEFAULT_WEIGHTS)
+        if unknown:
+            raise ValueError(f"Unknown ranking weight(s): {', '.join(sorted(unknown))}")
+        self.weights = dict(self.DEFAULT_WEIGHTS, **(weights or {}))
+        self.duration_range = duration_range
+        self.recency_half_life_hours = recency_half_life_hours
+    
+    def features(self, videos, query):
+        """(len(videos), 4) feature matrix, columns in DEFAULT_WEIGHTS order"""
+        table = videos if isinstance(videos, VideoTable) else VideoTable(videos)
+        terms = sorted(set(self.TERM_PATTERN.findall(query.lower())))
+        titles = [set(self.TERM_PATTERN.findall(record.title.lower())) for record in table]
+        overlap = np.array([[term in title for term in terms] for title in titles], dtype=bool).reshape(len(table), len(terms))
+        relevance = overlap.mean(axis=1) if terms else np.zeros(len(table))
+        
+        views = np.log1p(table.view_counts)
+        top = np.nanmax(views) if len(table) and not np.all(np.isnan(views)) else 0
+        views = np.nan_to_num(views / top if top > 0 else np.zeros_like(views), nan=0.0)
+        
+        ages = np.maximum(table.age_hours(), 0)
+        recency = np.nan_to_num(np.exp2(-ages / self.recency_half_life_hours), nan=0.0)
+        
+        durations = table.duration_seconds
+        if self.duration_range:
+            low, high = self.duration_range
+            distance = np.maximum(low - durations, 0) + np.maximum(durations - high, 0)
+            duration_fit = np.exp(-distance / max(low, 60))
+        else:
+            duration_fit = np.ones_like(durations)
+        duration_fit = np.nan_to_num(duration_fit, nan=0.5)
+        
+        return np.column_stack([relevance, views, recency, duration_fit])
+    
+    def score(self, videos, query):
+        if not videos:
+            return np.zeros(0)
+        weights = np.array([self.weights[name] for name in self.DEFAULT_WEIGHTS], dtype=float)
+        return self.features(videos, query) @ (weights / (weights.sum() or 1))
+    
+    def rank(self, videos, query):
+        """Indices of videos from best to worst score; ties keep result order"""
+        return np.argsort(-self.score(videos, query), kind='stable').tolist()
+
+
+class SearchFilters:
+    """Typed search filter spec, encoded into the `sp` parameter of the results URL.
+    
+    The `sp` value is a base64-encoded protobuf: field 1 holds the sort order and
+    field 2 a nested message with upload date (1), type (2) and duration (3).
+    The defaults reproduce the "This week" + "4 - 20 minutes" filters that
+    apply_filters clicks through (sp=EgYIAxABGAM).
+    """
+    UPLOAD_DATES = {None: 0, 'last_hour': 1, 'today': 2, 'this_week': 3, 'this_month': 4, 'this_year': 5}
+    TYPES = {None: 0, 'video': 1, 'channel': 2, 'playlist': 3, 'movie': 4}
+    DURATIONS = {None: 0, 'under_4': 1, 'over_20': 2, '4_20': 3}
+    SORTS = {'relevance': 0, 'rating': 1, 'upload_date': 2, 'view_count': 3}
+    
+    def __init__(self, upload_date='this_week', duration='4_20', type='video', sort='relevance'):
+        for value, allowed, name in ((upload_date, self.UPLOAD_DATES, 'upload date'),
+                                     (duration, self.DURATIONS, 'duration'),
+                                     (type, self.TYPES, 'type'),
+                                     (sort, self.SORTS, 'sort')):
+            if value not in allowed:
+                raise ValueError(f"Unknown {name} filter: {value}")
+        self.upload_date = upload_date
+        self.duration = duration
+        self.type = type
+        self.sort = sort
+    
+    def __repr__(self):
+        return (f"SearchFilters(upload_date={self.upload_date!r}, duration={self.duration!r}, "
+                f"type={self.type!r}, sort={self.sort!r})")
+    
+    @staticmethod
+    def _field(number, value):
+        """Encode a small varint protobuf field (all filter values fit in one byte)"""
+        return bytes([number << 3, value])
+    
+    def to_sp(self):
+        """Return the `sp` query parameter value, or None when no filter is set"""
+        nested = b''
+        for number, value in ((1, self.UPLOAD_DATES[self.upload_date]),
+                              (2, self.TYPES[self.type]),
+                              (3, self.DURATIONS[self.duration])):
+            if value:
+                nested += self._field(number, value)
+        
+        encoded = b''
+        if self.SORTS[self.sort]:
+            encoded += self._field(1, self.SORTS[self.sort])
+        if nested:
+            encoded += bytes([(2 << 3) | 2, len(nested)]) + nested
+        return base64.b64encode(encoded).decode('ascii') if encoded else None
+
+
+class SelectorStats:
+    """Remembers which selector matched at each stage and field, across runs.
+    
+    Each selector keeps an exponentially weighted success rate (weight `alpha`
+    for the newest outcome), so a selector that starts matching moves up within
+    a few runs and one that stops matching is demoted below untried ones, which
+    start at `prior`. Seconds spent on misses are totalled per stage both for
+    the current run and over the file's lifetime, to surface layout drift.
+    """
+    
+    def __init__(self, path=None, alpha=0.3, prior=0.5):
+        self.path = path
+        self.alpha = alpha
+        self.prior = prior
+        self.selectors = {}  # stage -> selector -> {'rate', 'hits', 'misses', 'miss_seconds', 'last_hit'}
+        self.lost_seconds = {}  # stage -> seconds lost to misses over all saved runs
+        self.run_lost = {}  # stage -> (misses, seconds) this run
+        self.misses = 0  # misses recorded by this process
+        self._lock = threading.Lock()
+        self.load()
+    
+    def load(self):
+        if not self.path or not os.path.isfile(self.path):
+            return
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                saved = json.load(f)
+            self.selectors = saved.get('selectors', {})
+            self.lost_seconds = saved.get('lost_seconds', {})
+        except Exception as e:
+            print(f"{Fore.YELLOW}Ignoring unreadable selector stats: {e}{Style.RESET_ALL}")
+    
+    def save(self):
+        if not self.path:
+            return
+        try:
+            with self._lock:
+                saved = json.dumps({'selectors': self.selectors, 'lost_seconds': self.lost_seconds}, indent=1)
+            _atomic_write(self.path, saved)
+        except Exception as e:
+            print(f"{Fore.YELLOW}⚠️ Could not write selector stats: {e}{Style.RESET_ALL}")
+    
+    def order(self, stage, selectors):
+        """selectors sorted by success rate, best first; ties keep the given order"""
+        known = self.selectors.get(stage, {})
+        rates = [known[selector]['rate'] if selector in known else self.prior for selector in selectors]
+        return [selectors[i] for i in sorted(range(len(selectors)), key=lambda i: -rates[i])]
+    
+    def record(self, stage, selector, matched, seconds=0.0):
+        with self._lock:
+            entry = self.selectors.setdefault(stage, {}).setdefault(
+                selector, {'rate': self.prior, 'hits': 0, 'misses': 0, 'miss_seconds': 0.0, 'last_hit': None})
+            entry['rate'] = (1 - self.alpha) * entry['rate'] + self.alpha * (1.0 if matched else 0.0)
+            if matched:
+                entry['hits'] += 1
+                entry['last_hit'] = datetime.now().isoformat(timespec='seconds')
+                return
+            entry['misses'] += 1
+            entry['miss_seconds'] += seconds
+            self.misses += 1
+            self.lost_seconds[stage] = self.lost_seconds.get(stage, 0.0) + seconds
+            misses, lost = self.run_lost.get(stage, (0, 0.0))
+            self.run_lost[stage] = (misses + 1, lost + seconds)
+    
+    def record_winner(self, stage, selectors, index, seconds=0.0):
+        """Record that selectors[index] matched after the ones before it missed.
+        
+        index None means none matched; seconds is then the time the whole stage lost.
+        """
+        for selector in selectors if index is None else selectors[:index]:
+            self.record(stage, selector, False)
+        if index is None:
+            with self._lock:
+                self.lost_seconds[stage] = self.lost_seconds.get(stage, 0.0) + seconds
+                misses, lost = self.run_lost.get(stage, (0, 0.0))
+                self.run_lost[stage] = (misses, lost + seconds)
+        else:
+            self.record(stage, selectors[index], True)
+    
+    def reset_run(self):
+        self.run_lost = {}
+
+
+class Profiler:
+    """Nested timing spans with per-span WebDriver call, sleep, wait and selector miss counts.
+    
+    Counters are bumped by the instrumented code (count, timer, and the wrapped
+    driver.execute that every WebDriver command goes through); each span
+    records how much they grew while it was open. Gauges are callables sampled
+    the same way. When disabled, span and timer cost one attribute check.
+    """
+    COUNTERS = ('webdriver_calls', 'sleep_seconds', 'wait_seconds')
+    
+    def __init__(self, enabled=False, gauges=None):
+        self.enabled = enabled
+        self.gauges = gauges or {}
+        self.counters = dict.fromkeys(self.COUNTERS, 0)
+        self.spans = []
+        self._stack = []
+        self.started_at = time.time()
+        self._origin = time.perf_counter()
+    
+    def _sample(self):
+        sample = dict(self.counters)
+        for name, gauge in self.gauges.items():
+            sample[name] = gauge()
+        return sample
+    
+    @contextmanager
+    def span(self, name, **attributes):
+        if not self.enabled:
+            yield
+            return
+        before = self._sample()
+        start = time.perf_counter()
+        self._stack.append(name)
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            after = self._sample()
+            record = {'name': name, 'parent': self._stack[-1] if self._stack else None,
+                      'start': round(start - self._origin, 6),
+                      'seconds': round(time.perf_counter() - start, 6)}
+            record.update({key: round(after[key] - before[key], 6) for key in after})
+            record.update(attributes)
+            self.spans.append(record)
+    
+    @contextmanager
+    def timer(self, counter):
+        """Add the block's wall time to a seconds counter"""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.counters[counter] += time.perf_counter() - start
+    
+    def count(self, counter, amount=1):
+        if self.enabled:
+            self.counters[counter] += amount
+    
+    def instrument(self, driver):
+        """Count every WebDriver command the driver (and its elements) sends"""
+        if getattr(driver, '_profiler_execute', None) is not None:
+            driver._profiler = self
+            return
+        execute = driver.execute
+        
+        def counted_execute(*args, **kwargs):
+            driver._profiler.counters['webdriver_calls'] += 1
+            return execute(*args, **kwargs)
+        
+        driver._profiler = self
+        driver._profiler_execute = execute
+        driver.execute = counted_execute
+    
+    def totals(self):
+        """Aggregate spans by name: count, seconds and counter deltas"""
+        totals = {}
+        for span in self.spans:
+            entry = totals.setdefault(span['name'], {'count': 0, 'seconds': 0.0})
+            entry['count'] += 1
+            for key, value in span.items():
+                if key not in ('name', 'parent', 'start', 'count') and isinstance(value, (int, float)):
+                    entry[key] = entry.get(key, 0) + value
+        return totals
+    
+    def write(self, path_prefix):
+        """Write <prefix>.json (full trace) and <prefix>.prom (Prometheus text format)"""
+        if path_prefix.endswith('.json'):
+            path_prefix = path_prefix[:-5]
+        totals = self.totals()
+        trace = {'started_at': datetime.fromtimestamp(self.started_at).isoformat(timespec='seconds'),
+                 'pid': os.getpid(), 'counters': self._sample(), 'totals': totals, 'spans': self.spans}
+        with open(f"{path_prefix}.json", 'w', encoding='utf-8') as f:
+            json.dump(trace, f, indent=1)
+        
+        metrics = [('seconds', 'seconds_total', 'Wall time spent in each stage'),
+                   ('count', 'runs_total', 'Times each stage ran'),
+                   ('webdriver_calls', 'webdriver_calls_total', 'WebDriver commands sent during each stage'),
+                   ('sleep_seconds', 'sleep_seconds_total', 'Fixed sleeps during each stage'),
+                   ('wait_seconds', 'wait_seconds_total', 'Condition waits during each stage'),
+                   ('selector_misses', 'selector_misses_total', 'Selector misses during each stage')]
+        lines = []
+        for key, metric, help_text in metrics:
+            lines.append(f"# HELP ytvf_stage_{metric} {help_text}")
+            lines.append(f"# TYPE ytvf_stage_{metric} counter")
+            for stage, entry in sorted(totals.items()):
+                lines.append(f'ytvf_stage_{metric}{{stage="{stage}"}} {entry.get(key, 0):.6g}')
+        lines.append("# HELP ytvf_profile_timestamp_seconds When this snapshot was written")
+        lines.append("# TYPE ytvf_profile_timestamp_seconds gauge")
+        lines.append(f"ytvf_profile_timestamp_seconds {time.time():.3f}")
+        with open(f"{path_prefix}.prom", 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+        return f"{path_prefix}.json", f"{path_prefix}.prom"
+
+
+def profiled(name):
+    """Run the decorated finder method inside a profiler span"""
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.profiler.span(name):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorate
+
+
+class WebDriverPool:
+    """Pool of warm Chrome sessions that queries borrow and return.
+    
+    Sessions are created lazily up to `size`, health-checked with a
+    current_url probe when borrowed, and quit after `max_uses` queries so
+    long-running workers do not accumulate browser state. The factory defaults
+    to YouTubeVideoFinder.create_driver of the first finder given the pool.
+    """
+    
+    def __init__(self, factory=None, size=2, max_uses=25):
+        self.factory = factory
+        self.size = size
+        self.max_uses = max_uses
+        self._idle = queue.LifoQueue()  # Most recently used session first, it is the warmest
+        self._uses = {}
+        self._open = 0
+        self._lock = threading.Lock()
+        self.stats = {'created': 0, 'reused': 0, 'recycled': 0, 'unhealthy': 0}
+    
+    @staticmethod
+    def _is_healthy(driver):
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
+    
+    def acquire(self, timeout=None):
+        """Borrow a healthy session, creating one if the pool is not full yet"""
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    can_create = self._open < self.size
+                    if can_create:
+                        self._open += 1
+                if can_create:
+                    return self._create()
+                # Pool exhausted: block until another query returns a session
+                driver = self._idle.get(timeout=timeout)
+            
+            if self._is_healthy(driver):
+                self.stats['reused'] += 1
+                self._uses[id(driver)] += 1
+                return driver
+            self._discard(driver, 'unhealthy')
+    
+    def _create(self):
+        try:
+            driver = self.factory()
+        except Exception:
+            with self._lock:
+                self._open -= 1
+            raise
+        self.stats['created'] += 1
+        self._uses[id(driver)] = 1
+        return driver
+    
+    def release(self, driver):
+        """Return a borrowed session, recycling it once it reaches max_uses"""
+        if self._uses.get(id(driver), 0) >= self.max_uses:
+            self._discard(driver, 'recycled')
+            return
+        try:
+            # Stop the results page from running scripts while the session is idle
+            driver.get("about:blank")
+        except Exception:
+            self._discard(driver, 'unhealthy')
+            return
+        self._idle.put(driver)
+    
+    def _discard(self, driver, reason):
+        self.stats[reason] += 1
+        self._uses.pop(id(driver), None)
+        with self._lock:
+            self._open -= 1
+        try:
+            driver.quit()
+        except Exception:
+            pass
+    
+    def close(self):
+        """Quit every idle session"""
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._uses.pop(id(driver), None)
+            with self._lock:
+                self._open -= 1
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        print(f"{Fore.GREEN}✓ Driver pool closed (created {self.stats['created']}, reused {self.stats['reused']}, "
+              f"recycled {self.stats['recycled']}, unhealthy {self.stats['unhealthy']}){Style.RESET_ALL}")
+
+
 class YouTubeVideoFinder:
-    def __init__(self, gemini_api_key):
-        """Initialize the YouTube Video Finder with Gemini AI integration"""
+    # Selector fallbacks for result extraction, tried in order
+    VIDEO_CONTAINER_SELECTORS = [
+        "//div[@class='style-scope ytd-video-renderer'][@id='dismissible']",  # Primary selector from user
+        "//div[contains(@class, 'ytd-video-renderer')][@id='dismissible']",   # Fallback with contains
+        "//div[contains(@class, 'ytd-video-renderer')]",  # Original fallback
+        "//ytd-video-renderer",
+        "//div[@class='ytd-video-renderer']",
+        "//div[contains(@class, 'video-renderer')]",
+        "//div[contains(@class, 'ytd-compact-video-renderer')]"
+    ]
+    
+    TITLE_SELECTORS = [
+        ".//a[@id='video-title']",                    # Primary video title link
+        ".//h3//a[@title]",                          # H3 with title attribute
+        ".//a[@id='video-title-link']",              # Alternative video title link
+        ".//yt-formatted-string[@id='video-title']", # Formatted string title
+        ".//div[@id='meta']//a[@href]",              # Meta section link
+        ".//div[@id='details']//a[@href]",           # Details section link
+        ".//a[contains(@href, '/watch?v=')][@title]" # Any watch link with title
+    ]
+    
+    URL_SELECTORS = [
+        ".//a[@id='video-title']",
+        ".//a[@id='video-title-link']", 
+        ".//h3//a[@href]",
+        ".//a[contains(@href, '/watch?v=')]",
+        ".//a[contains(@href, '/shorts/')]"
+    ]
+    
+    CHANNEL_SELECTORS = [
+        ".//div[@id='channel-info']//a[@href]",              # Channel info section
+        ".//ytd-channel-name//a",                           # Channel name component
+        ".//yt-formatted-string[contains(@class, 'byline')]", # Byline formatted string
+        ".//a[contains(@href, '/@')]",                      # New @ channel format
+        ".//a[contains(@href, '/channel/')]",               # Traditional channel format
+        ".//a[contains(@href, '/c/')]",                     # Custom channel format
+        ".//a[contains(@href, '/user/')]"                   # User channel format
+    ]
+    
+    METADATA_SELECTORS = [
+        ".//div[@id='metadata-line']//span",
+        ".//ytd-video-meta-block//span",
+        ".//div[@id='meta']//span",
+        ".//span[contains(@class, 'meta')]",
+        ".//span[contains(text(), 'views')]",
+        ".//span[contains(text(), 'ago')]"
+    ]
+    
+    DURATION_SELECTORS = [
+        ".//ytd-thumbnail-overlay-time-status-renderer//span",
+        ".//span[@class='style-scope ytd-thumbnail-overlay-time-status-renderer']",
+        ".//div[contains(@class, 'duration')]//span",
+        ".//span[contains(text(), ':')]"
+    ]
+    
+    EXTRACTION_MODES = ('bulk', 'element', 'page_source', 'initial_data')
+    
+    # Upper limit on InnerTube continuation requests per search in initial_data mode
+    MAX_CONTINUATION_PAGES = 10
+    # About how many results YouTube appends per scroll; sizes the scroll budget
+    RESULTS_PER_SCROLL = 20
+    SEARCH_MODES = ('direct', 'ui')
+    WAIT_MODES = ('event', 'fixed')
+    BROWSER_PROFILES = ('default', 'lean')
+    BACKENDS = ('selenium', 'http')
+    CACHE_MODES = ('use', 'refresh', 'bypass')
+    RESULT_CACHE_SIZE = 128
+    ANALYSIS_CACHE_SIZE = 256
+    MODEL_NAME = 'gemini-1.5-flash'
+    PROMPT_FORMATS = ('compact', 'legacy')
+    
+    # Upper bounds in seconds for each readiness condition, plus the quiet window
+    # that counts as "settled" and the polling interval
+    WAIT_TIMEOUTS = {'dom': 5, 'network': 8, 'settled': 8, 'growth': 8, 'quiet': 0.5, 'poll': 0.1,
+                     'selectors': 20}
+    
+    # Compiled lxml XPath objects for the page source engine, built on first use
+    _xpath_cache = None
+    
+    def __init__(self, gemini_api_key, extraction_mode='bulk', search_mode='direct', filters=None,
+                 base_url="https://www.youtube.com", wait_mode='event', wait_timeouts=None,
+                 driver_pool=None, browser_profile='default', driver_cache_path=DEFAULT_DRIVER_CACHE_PATH,
+                 max_results=20, backend='selenium', http_transport=None,
+                 result_cache_ttl=3600, result_cache_dir=None, cache_mode='use',
+                 analysis_cache_ttl=6 * 3600, analysis_cache_dir=None, stream_analysis=False,
+                 prompt_format='compact', prompt_token_budget=4000, analysis_workers=4,
+                 shortlist_size=10, ranking_weights=None, results_store_path=DEFAULT_RESULTS_STORE_PATH,
+                 save_json=False, selector_stats_path=DEFAULT_SELECTOR_STATS_PATH, profile_path=None,
+                 snapshot_dir=None):
+        """Initialize the YouTube Video Finder with Gemini AI integration
+        
+        extraction_mode: 'bulk' reads every result container with one execute_script
+        call, 'element' queries each field through individual WebDriver calls and
+        'page_source' parses a single page_source snapshot locally with lxml and
+        'initial_data' reads the embedded ytInitialData JSON, following
+        continuation tokens until max_results videos are found.
+        
+        backend: 'selenium' drives Chrome; 'http' fetches the filtered results page
+        and its continuations over a pooled keep-alive connection and never starts
+        a browser. http_transport replaces the urllib3 transport for the HTTP backend.
+        
+        result_cache_ttl: seconds that extracted results for a query and filter set
+        are reused (None disables the cache); result_cache_dir adds an on-disk tier
+        that survives restarts. cache_mode 'refresh' ignores cached entries but
+        stores fresh ones, 'bypass' neither reads nor writes the cache.
+        
+        analysis_cache_ttl / analysis_cache_dir: the same for Gemini analyses,
+        keyed by a hash of the query, the extracted videos and the model name.
+        
+        stream_analysis: print Gemini's response as it arrives and highlight the
+        best video as soon as the "BEST VIDEO:" line is complete enough to parse.
+        
+        prompt_format: 'compact' encodes videos as table rows and, above
+        prompt_token_budget estimated tokens, ranks chunks with up to
+        analysis_workers concurrent calls before a final merge call; 'legacy'
+        sends the original verbose single-shot prompt.
+        
+        Before any model call, results are scored locally by LocalRanker
+        (ranking_weights overrides its DEFAULT_WEIGHTS) and only the top
+        shortlist_size go to Gemini; 0 or None sends them all. The local
+        ranking also picks the best video when the model is unavailable.
+        
+        save_results appends each run to the SQLite store at results_store_path
+        (see results_store.py); save_json also writes the per-run JSON file,
+        which is always written when results_store_path is None.
+        
+        Page-level selector fallback lists are tried in the order learned by
+        SelectorStats, persisted at selector_stats_path (None keeps the
+        statistics in memory); per-field lists keep their precise-first order.
+        
+        With profile_path, every stage runs inside a Profiler span and each
+        query rewrites <profile_path>.json (trace) and .prom (Prometheus text);
+        page_source parses then also trace their peak allocations.
+        
+        snapshot_dir: after every live extraction, record the page source,
+        ytInitialData and search context into the snapshot corpus there, so
+        extraction can be replayed offline (see snapshot_corpus.py).
+        
+        search_mode: 'direct' loads the results URL with `filters` encoded into it
+        and falls back to the UI-click path on failure; 'ui' always types the query
+        and clicks through apply_filters.
+        
+        wait_mode: 'event' replaces the fixed sleeps with readiness waits bounded by
+        wait_timeouts (merged over WAIT_TIMEOUTS); 'fixed' keeps the original sleeps.
+        
+        driver_pool: optional WebDriverPool; setup_driver then borrows a warm
+        session and release_driver returns it instead of quitting Chrome.
+        
+        browser_profile: 'default' is the full visible Chrome; 'lean' runs new
+        headless mode with a small window, no GPU, capped memory and images,
+        media, fonts and ads blocked.
+        
+        driver_cache_path: where the resolved Chrome binary and ChromeDriver are
+        remembered between runs; None disables the cache.
+        """
+        if extraction_mode not in self.EXTRACTION_MODES:
+            raise ValueError(f"Unknown extraction mode: {extraction_mode}")
+        if search_mode not in self.SEARCH_MODES:
+            raise ValueError(f"Unknown search mode: {search_mode}")
+        if wait_mode not in self.WAIT_MODES:
+            raise ValueError(f"Unknown wait mode: {wait_mode}")
+        if browser_profile not in self.BROWSER_PROFILES:
+            raise ValueError(f"Unknown browser profile: {browser_profile}")
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown backend: {backend}")
+        if cache_mode not in self.CACHE_MODES:
+            raise ValueError(f"Unknown cache mode: {cache_mode}")
+        if prompt_format not in self.PROMPT_FORMATS:
+            raise ValueError(f"Unknown prompt format: {prompt_format}")
         self.gemini_api_key = gemini_api_key
-        self.translator = Translator()
-        self.recognizer = sr.Recognizer()
-        self.microphone = sr.Microphone()
+        self.extraction_mode = extraction_mode
+        self.search_mode = search_mode
+        self.filters = filters or SearchFilters()
+        self.base_url = base_url.rstrip('/')
+        self.search_latencies = []
+        self.wait_mode = wait_mode
+        self.wait_timeouts = dict(self.WAIT_TIMEOUTS, **(wait_timeouts or {}))
+        self.browser_profile = browser_profile
+        self.page_metrics = None
+        self.driver_cache_path = driver_cache_path
+        self.driver_startup = None
+        self.driver_pool = driver_pool
+        if driver_pool is not None and driver_pool.factory is None:
+            driver_pool.factory = self.create_driver
+        self.selector_stats = SelectorStats(selector_stats_path)
+        self.profile_path = profile_path
+        self.profiler = Profiler(enabled=bool(profile_path),
+                                 gauges={'selector_misses': lambda: self.selector_stats.misses})
+        self._reset_run_stats()
+        self.last_extraction_stats = None
+        self.max_results = max_results
+        self.backend = backend
+        self.http_search = (YouTubeHTTPSearch(base_url, http_transport, self.MAX_CONTINUATION_PAGES)
+                            if backend == 'http' else None)
+        self.result_cache = (TTLCache(result_cache_ttl, self.RESULT_CACHE_SIZE, result_cache_dir)
+                             if result_cache_ttl else None)
+        self.cache_mode = cache_mode
+        self.cache_saved_seconds = 0.0
+        self.analysis_cache = (TTLCache(analysis_cache_ttl, self.ANALYSIS_CACHE_SIZE, analysis_cache_dir)
+                               if analysis_cache_ttl else None)
+        self.analysis_stats = {'cache_hits': 0, 'model_calls': 0}
+        self.last_analysis_failed = False
+        self.last_analysis_streamed = False
+        self.last_analyzed_count = None
+        self.analysis_timings = None
+        self.stream_analysis = stream_analysis
+        self.prompt_format = prompt_format
+        self.prompt_token_budget = prompt_token_budget
+        self.analysis_workers = analysis_workers
+        self.prompt_stats = None
+        self.shortlist_size = shortlist_size
+        self.ranker = LocalRanker(ranking_weights, LocalRanker.DURATION_RANGES[self.filters.duration])
+        self.results_store_path = results_store_path
+        self.save_json = save_json
+        self.results_store = None
+        self.snapshot_dir = snapshot_dir
+        self.snapshot_corpus = None
+        # Audio devices, the translator and the Gemini client are created on first use
+        self._translator = None
+        self._recognizer = None
+        self._microphone = None
+        self._model = None
         self.driver = None
         self.wait = None
-        
-        # Initialize Gemini AI
-        genai.configure(api_key=gemini_api_key)
-        self.model = genai.GenerativeModel('gemini-1.5-flash')
-        
-    def setup_driver(self):
-        """Setup Chrome WebDriver with optimal settings"""
+    
+    @property
+    def translator(self):
+        if self._translator is None:
+            self._translator = Translator()
+        return self._translator
+    
+    @property
+    def recognizer(self):
+        if self._recognizer is None:
+            self._recognizer = sr.Recognizer()
+        return self._recognizer
+    
+    @property
+    def microphone(self):
+        """Opened only for voice input, so text and batch runs never need PyAudio"""
+        if self._microphone is None:
+            self._microphone = sr.Microphone()
+        return self._microphone
+    
+    @property
+    def model(self):
+        """Gemini model, configured on the first analysis that is not served from cache"""
+        if self._model is None:
+            genai.configure(api_key=self.gemini_api_key)
+            self._model = genai.GenerativeModel(self.MODEL_NAME)
+        return self._model
+    
+    @model.setter
+    def model(self, model):
+        self._model = model
+    
+    def create_driver(self):
+        """Launch a new Chrome WebDriver with optimal settings"""
         chrome_options = Options()
         chrome_options.add_argument("--no-sandbox")
         chrome_options.add_argument("--disable-dev-shm-usage")
@@ -46,10 +1356,27 @@ class YouTubeVideoFinder:
         chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
         chrome_options.add_argument("--disable-extensions")
         chrome_options.add_argument("--disable-plugins")
+        self._add_profile_options(chrome_options)
+        
+        start = time.perf_counter()
+        
+        # Fast path: go straight to the Chrome/ChromeDriver pair that worked last time
+        cached = self._load_driver_cache()
+        if cached:
+            try:
+                if cached['chrome_binary']:
+                    chrome_options.binary_location = cached['chrome_binary']
+                driver = webdriver.Chrome(service=Service(cached['driver_path']), options=chrome_options)
+                print(f"{Fore.GREEN}✓ Cached ChromeDriver working: {cached['driver_path']} "
+                      f"(Chrome {cached['chrome_version'] or 'unknown'}){Style.RESET_ALL}")
+                self._record_driver_startup('warm', start)
+                return self._prepare_driver(driver)
+            except Exception as e:
+                print(f"{Fore.YELLOW}Cached ChromeDriver failed, probing again: {e}{Style.RESET_ALL}")
+                self._clear_driver_cache()
         
         # Find Chrome binary
         import shutil
-        import os
         chrome_paths = [
             "/usr/bin/google-chrome",
             "/usr/bin/google-chrome-stable", 
@@ -75,19 +1402,16 @@ class YouTubeVideoFinder:
             try:
                 print(f"{Fore.CYAN}Trying local ChromeDriver: {local_chromedriver}{Style.RESET_ALL}")
                 service = Service(local_chromedriver)
-                self.driver = webdriver.Chrome(service=service, options=chrome_options)
+                driver = webdriver.Chrome(service=service, options=chrome_options)
                 print(f"{Fore.GREEN}✓ Local ChromeDriver working{Style.RESET_ALL}")
-                self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-                self.wait = WebDriverWait(self.driver, 20)
-                print(f"{Fore.GREEN}✓ Chrome WebDriver initialized successfully{Style.RESET_ALL}")
-                return
+                return self._finish_cold_start(driver, chrome_binary, start)
             except Exception as e:
                 print(f"{Fore.YELLOW}Local ChromeDriver failed: {e}{Style.RESET_ALL}")
         
         # Try system chromedriver as fallback
         try:
             print(f"{Fore.CYAN}Trying system ChromeDriver...{Style.RESET_ALL}")
-            self.driver = webdriver.Chrome(options=chrome_options)
+            driver = webdriver.Chrome(options=chrome_options)
             print(f"{Fore.GREEN}✓ System ChromeDriver working{Style.RESET_ALL}")
             
         except Exception as e:
@@ -104,18 +1428,371 @@ class YouTubeVideoFinder:
                     raise Exception(f"ChromeDriver at {driver_path} is not executable")
                     
                 service = Service(driver_path)
-                self.driver = webdriver.Chrome(service=service, options=chrome_options)
+                driver = webdriver.Chrome(service=service, options=chrome_options)
                 
             except Exception as e2:
                 print(f"{Fore.RED}ChromeDriverManager also failed: {e2}{Style.RESET_ALL}")
                 print(f"{Fore.YELLOW}Please install ChromeDriver manually or update Chrome/ChromeDriver{Style.RESET_ALL}")
                 raise Exception("Could not initialize ChromeDriver. Please ensure Chrome and ChromeDriver are properly installed.")
         
-        self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        return self._finish_cold_start(driver, chrome_binary, start)
+    
+    def _finish_cold_start(self, driver, chrome_binary, start):
+        """Remember the working Chrome/ChromeDriver pair and report cold startup time"""
+        self._save_driver_cache(chrome_binary, driver.service.path)
+        self._record_driver_startup('cold', start)
+        return self._prepare_driver(driver)
+    
+    def _record_driver_startup(self, mode, start):
+        elapsed = time.perf_counter() - start
+        self.driver_startup = {'mode': mode, 'seconds': elapsed}
+        print(f"{Fore.CYAN}🚀 Driver startup ({mode}): {elapsed:.2f}s{Style.RESET_ALL}")
+    
+    @staticmethod
+    def _executable_version(path):
+        """Return the version reported by `<path> --version`, or None"""
+        try:
+            output = subprocess.run([path, '--version'], capture_output=True, text=True, timeout=10).stdout
+        except Exception:
+            return None
+        match = re.search(r'\d+(?:\.\d+)+', output)
+        return match.group(0) if match else None
+    
+    @staticmethod
+    def _file_signature(path):
+        """Size and mtime identify a binary cheaply; an upgrade changes both"""
+        stat = os.stat(path)
+        return [stat.st_size, stat.st_mtime]
+    
+    def _load_driver_cache(self):
+        """Load the cached driver resolution if both binaries are unchanged since it was written"""
+        if not self.driver_cache_path or not os.path.isfile(self.driver_cache_path):
+            return None
+        try:
+            with open(self.driver_cache_path, encoding='utf-8') as f:
+                cached = json.load(f)
+            for path_key, signature_key in (('driver_path', 'driver_signature'),
+                                            ('chrome_binary', 'chrome_signature')):
+                path = cached[path_key]
+                if path is None and path_key == 'chrome_binary':
+                    continue
+                if not os.access(path, os.X_OK) or self._file_signature(path) != cached[signature_key]:
+                    print(f"{Fore.YELLOW}Driver cache is stale ({path} changed), probing again{Style.RESET_ALL}")
+                    return None
+            return cached
+        except Exception as e:
+            print(f"{Fore.YELLOW}Ignoring unreadable driver cache: {e}{Style.RESET_ALL}")
+            return None
+    
+    def _save_driver_cache(self, chrome_binary, driver_path):
+        if not self.driver_cache_path:
+            return
+        try:
+            cached = {
+                'chrome_binary': chrome_binary,
+                'chrome_version': self._executable_version(chrome_binary) if chrome_binary else None,
+                'chrome_signature': self._file_signature(chrome_binary) if chrome_binary else None,
+                'driver_path': os.path.abspath(driver_path),
+                'driver_version': self._executable_version(driver_path),
+                'driver_signature': self._file_signature(driver_path),
+                'resolved_at': datetime.now().isoformat(timespec='seconds')
+            }
+            _atomic_write(self.driver_cache_path, json.dumps(cached, indent=2))
+        except Exception as e:
+            print(f"{Fore.YELLOW}⚠️ Could not write driver cache: {e}{Style.RESET_ALL}")
+    
+    def _clear_driver_cache(self):
+        try:
+            os.remove(self.driver_cache_path)
+        except OSError:
+            pass
+    
+    def _add_profile_options(self, chrome_options):
+        """Add the Chrome switches for the selected browser profile"""
+        if self.browser_profile != 'lean':
+            return
+        # New headless mode with a small viewport, no GPU and a capped renderer heap.
+        # Images are also disabled at the content-settings level so <img> tags never fetch.
+        for argument in ("--headless=new", "--window-size=1280,800", "--disable-gpu",
+                         "--mute-audio", "--autoplay-policy=user-gesture-required",
+                         "--blink-settings=imagesEnabled=false", "--renderer-process-limit=2",
+                         "--js-flags=--max-old-space-size=256", "--disable-background-networking"):
+            chrome_options.add_argument(argument)
+        chrome_options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2
+        })
+    
+    def _prepare_driver(self, driver):
+        """Apply per-session setup to a freshly launched driver"""
+        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        try:
+            # Keep every resource timing entry so page metrics cover the whole load
+            driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument",
+                                   {"source": "performance.setResourceTimingBufferSize(10000);"})
+            if self.browser_profile == 'lean':
+                driver.execute_cdp_cmd("Network.enable", {})
+                driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": LEAN_BLOCKED_URLS})
+                print(f"{Fore.CYAN}Lean profile: blocking {len(LEAN_BLOCKED_URLS)} heavy resource patterns{Style.RESET_ALL}")
+        except Exception as e:
+            print(f"{Fore.YELLOW}⚠️ Could not apply browser profile settings: {e}{Style.RESET_ALL}")
+        return driver
+    
+    def _chrome_rss_bytes(self):
+        """Sum the resident memory of chromedriver and every Chrome process it spawned (Linux only)"""
+        try:
+            root_pid = self.driver.service.process.pid
+            children = {}
+            for entry in os.listdir('/proc'):
+                if entry.isdigit():
+                    try:
+                        with open(f'/proc/{entry}/stat') as f:
+                            # The parent pid is the second field after the parenthesised command name
+                            ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+                    except (OSError, IndexError, ValueError):
+                        continue
+                    children.setdefault(ppid, []).append(int(entry))
+            
+            total, pending = 0, [root_pid]
+            while pending:
+                pid = pending.pop()
+                pending.extend(children.get(pid, []))
+                try:
+                    with open(f'/proc/{pid}/status') as f:
+                        for line in f:
+                            if line.startswith('VmRSS:'):
+                                total += int(line.split()[1]) * 1024
+                                break
+                except OSError:
+                    continue
+            return total
+        except Exception:
+            return None
+    
+    def measure_page_metrics(self):
+        """Measure load time and bytes transferred for the current page plus Chrome's RSS"""
+        try:
+            metrics = self.driver.execute_script(PAGE_METRICS_SCRIPT)
+        except Exception as e:
+            print(f"{Fore.YELLOW}⚠️ Could not read page metrics: {e}{Style.RESET_ALL}")
+            return None
+        metrics['profile'] = self.browser_profile
+        metrics['chrome_rss_bytes'] = self._chrome_rss_bytes()
+        self.page_metrics = metrics
+        
+        rss = metrics['chrome_rss_bytes']
+        rss_text = f"{rss / 1024 / 1024:.0f} MB" if rss else "unavailable"
+        print(f"{Fore.CYAN}🧪 Browser profile '{self.browser_profile}': page load {metrics['load_ms'] / 1000:.2f}s, "
+              f"{metrics['transfer_bytes'] / 1024:.0f} KB over {metrics['requests']} requests, "
+              f"Chrome RSS {rss_text}{Style.RESET_ALL}")
+        return metrics
+    
+    @profiled('setup_driver')
+    def setup_driver(self):
+        """Setup Chrome WebDriver, borrowing a warm session when a driver pool is configured"""
+        if self.backend == 'http':
+            print(f"{Fore.CYAN}HTTP backend selected, no browser needed{Style.RESET_ALL}")
+            return
+        if self.driver_pool:
+            self.driver = self.driver_pool.acquire()
+            print(f"{Fore.GREEN}✓ Borrowed Chrome session from pool{Style.RESET_ALL}")
+        else:
+            self.driver = self.create_driver()
+        if self.profiler.enabled:
+            self.profiler.instrument(self.driver)
         self.wait = WebDriverWait(self.driver, 20)
         
         print(f"{Fore.GREEN}✓ Chrome WebDriver initialized successfully{Style.RESET_ALL}")
     
+    def release_driver(self):
+        """Return the browser to the pool, or quit it when running without a pool"""
+        if not self.driver:
+            return
+        try:
+            if self.driver_pool:
+                self.driver_pool.release(self.driver)
+                print(f"{Fore.GREEN}✓ Browser returned to pool{Style.RESET_ALL}")
+            else:
+                self.driver.quit()
+                print(f"{Fore.GREEN}✓ Browser closed{Style.RESET_ALL}")
+        finally:
+            self.driver = None
+            self.wait = None
+    
+    def _pause(self, legacy_seconds, condition, baseline=None):
+        """Wait until the page is ready instead of sleeping a fixed legacy_seconds.
+        
+        In 'fixed' wait mode this is the original time.sleep. Otherwise it waits
+        for the readiness condition (see wait_until_ready) and records how much
+        of the fixed sleep was saved.
+        """
+        if self.wait_mode == 'fixed':
+            with self.profiler.timer('sleep_seconds'):
+                time.sleep(legacy_seconds)
+            return
+        
+        start = time.perf_counter()
+        with self.profiler.timer('wait_seconds'):
+            self.wait_until_ready(condition, baseline=baseline)
+        waited = time.perf_counter() - start
+        self.wait_stats['waits'] += 1
+        self.wait_stats['fixed_seconds'] += legacy_seconds
+        self.wait_stats['waited_seconds'] += waited
+    
+    def wait_until_ready(self, condition, timeout=None, baseline=None):
+        """Poll the page until a readiness condition holds or its upper bound expires.
+        
+        Conditions:
+            'dom'     - document.readyState is complete
+            'network' - the DOM is complete and no new resources loaded for the quiet window
+            'settled' - the results list had no mutations for the quiet window
+            'growth'  - more than `baseline` result containers exist and the list has
+                        settled, or nothing is loading any more
+        
+        Upper bounds come from wait_timeouts[condition]; returns the last probe.
+        """
+        bound = timeout if timeout is not None else self.wait_timeouts[condition]
+        quiet = self.wait_timeouts['quiet']
+        deadline = time.perf_counter() + bound
+        last_resources = None
+        resources_changed_at = time.perf_counter()
+        restart = condition in ('settled', 'growth')
+        probe = None
+        
+        while True:
+            try:
+                probe = self.driver.execute_script(READINESS_PROBE_SCRIPT, restart)
+            except Exception:
+                return probe
+            restart = False
+            now = time.perf_counter()
+            
+            if probe['resources'] != last_resources:
+                last_resources = probe['resources']
+                resources_changed_at = now
+            network_idle = probe['ready'] == 'complete' and now - resources_changed_at >= quiet
+            dom_settled = probe['idle_ms'] >= quiet * 1000
+            
+            if condition == 'dom':
+                done = probe['ready'] == 'complete'
+            elif condition == 'network':
+                done = network_idle
+            elif condition == 'settled':
+                done = dom_settled
+            else:
+                grew = baseline is not None and probe['containers'] > baseline
+                stalled = probe['idle_ms'] >= 2 * quiet * 1000 and now - resources_changed_at >= 2 * quiet
+                done = (grew and dom_settled) or stalled
+            
+            if done or now >= deadline:
+                return probe
+            time.sleep(self.wait_timeouts['poll'])
+    
+    def _reset_run_stats(self):
+        self.wait_stats = {'waits': 0, 'fixed_seconds': 0.0, 'waited_seconds': 0.0}
+        self.selector_stats.reset_run()
+    
+    def report_wait_savings(self):
+        """Print how much fixed sleep time the event-driven waits saved this run"""
+        stats = self.wait_stats
+        if self.wait_mode == 'fixed' or not stats['waits']:
+            return
+        saved = stats['fixed_seconds'] - stats['waited_seconds']
+        print(f"{Fore.CYAN}⏱️ Event-driven waits: {stats['waited_seconds']:.1f}s across {stats['waits']} waits "
+              f"instead of {stats['fixed_seconds']:.0f}s of fixed sleeps (saved {saved:.1f}s){Style.RESET_ALL}")
+    
+    def report_selector_stats(self):
+        """Print misses and time lost per selector stage this run, then persist the statistics"""
+        lost = self.selector_stats.run_lost
+        if lost:
+            stages = ", ".join(f"{stage} {misses} miss(es) {seconds:.1f}s"
+                               for stage, (misses, seconds) in sorted(lost.items(), key=lambda item: -item[1][1]))
+            print(f"{Fore.YELLOW}🧭 Selector misses this run: {stages}{Style.RESET_ALL}")
+        self.selector_stats.save()
+    
+    def write_profile(self):
+        """Rewrite the JSON trace and Prometheus snapshot of every span so far"""
+        if not self.profile_path:
+            return
+        try:
+            trace_path, metrics_path = self.profiler.write(self.profile_path)
+            print(f"{Fore.CYAN}📈 Profile written to {trace_path} and {metrics_path}{Style.RESET_ALL}")
+        except OSError as e:
+            print(f"{Fore.YELLOW}⚠️ Could not write profile: {e}{Style.RESET_ALL}")
+    
+    def _try_selectors(self, stage, selectors, attempt, report_misses=False):
+        """Run attempt(selector) over selectors in learned order until one succeeds.
+        
+        attempt returns the matched element or raises; every failure is recorded
+        with the seconds it cost. Returns (element, selector) or (None, None).
+        """
+        for selector in self.selector_stats.order(stage, selectors):
+            start = time.perf_counter()
+            try:
+                element = attempt(selector)
+            except Exception as e:
+                self.selector_stats.record(stage, selector, False, time.perf_counter() - start)
+                if report_misses:
+                    print(f"{Fore.YELLOW}⚠️ Selector '{selector}' failed: {str(e)[:50]}...{Style.RESET_ALL}")
+                continue
+            self.selector_stats.record(stage, selector, True)
+            return element, selector
+        return None, None
+    
+    def _wait_for_any(self, selectors, clickable=False, timeout=None):
+        """Poll every selector in each cycle until one matches; returns (element, index) or (None, None)"""
+        def first_match(driver):
+            return driver.execute_script(RACE_SELECTORS_SCRIPT, selectors, clickable) or False
+        
+        timeout = self.wait_timeouts['selectors'] if timeout is None else timeout
+        try:
+            with self.profiler.timer('wait_seconds'):
+                index, element = WebDriverWait(self.driver, timeout, self.wait_timeouts['poll']).until(first_match)
+            return element, index
+        except selenium_exceptions.TimeoutException:
+            return None, None
+    
+    def _race_selectors(self, stage, selectors, action=None, clickable=False, report_misses=False):
+        """Wait for whichever selector matches first, then run action(element, selector) on it.
+        
+        Selectors (CSS and XPath mixed) are raced in learned order under one
+        shared deadline, so a stage costs at most one timeout however many
+        candidates miss. If the action fails, the remaining selectors race on
+        until the deadline. Returns (element, selector) or (None, None).
+        """
+        remaining = self.selector_stats.order(stage, selectors)
+        start = time.perf_counter()
+        deadline = start + self.wait_timeouts['selectors']
+        while remaining:
+            element, index = self._wait_for_any(remaining, clickable, max(deadline - time.perf_counter(), 0))
+            if element is None:
+                break
+            selector = remaining[index]
+            try:
+                if action:
+                    action(element, selector)
+            except Exception as e:
+                if report_misses:
+                    print(f"{Fore.YELLOW}⚠️ Selector '{selector}' failed: {str(e)[:50]}...{Style.RESET_ALL}")
+                self.selector_stats.record(stage, selector, False)
+                remaining = remaining[:index] + remaining[index + 1:]
+                continue
+            self.selector_stats.record_winner(stage, remaining, index)
+            return element, selector
+        
+        self.selector_stats.record_winner(stage, remaining, None, time.perf_counter() - start)
+        return None, None
+    
+    def _field_selectors(self):
+        """Per-field selector lists in their fixed, most-precise-first order.
+        
+        Field hit rates are recorded for reporting but never reorder these lists:
+        a field can be legitimately empty (a live stream has no duration), and
+        ranking by hits would promote loose fallbacks such as
+        .//span[contains(text(), ':')] above precise selectors.
+        """
+        return {'title': self.TITLE_SELECTORS, 'url': self.URL_SELECTORS, 'channel': self.CHANNEL_SELECTORS,
+                'metadata': self.METADATA_SELECTORS, 'duration': self.DURATION_SELECTORS}
+    
     def get_voice_input(self, language='en'):
         """Capture voice input in Hindi or English"""
         print(f"{Fore.CYAN}🎤 Listening for voice input...{Style.RESET_ALL}")
@@ -157,28 +1834,156 @@ class YouTubeVideoFinder:
         text = input(f"{Fore.CYAN}Enter your search query: {Style.RESET_ALL}")
         return text.strip()
     
+    @profiled('navigate_to_youtube')
     def navigate_to_youtube(self):
         """Navigate to YouTube homepage"""
         print(f"{Fore.CYAN}🌐 Opening YouTube...{Style.RESET_ALL}")
-        self.driver.get("https://www.youtube.com")
+        self.driver.get(self.base_url)
         
         # Wait for page to load
         try:
-            self.wait.until(EC.presence_of_element_located((By.TAG_NAME, "ytd-app")))
+            with self.profiler.timer('wait_seconds'):
+                self.wait.until(EC.presence_of_element_located((By.TAG_NAME, "ytd-app")))
             print(f"{Fore.GREEN}✓ YouTube loaded successfully{Style.RESET_ALL}")
-            time.sleep(2)
-        except TimeoutException:
+            self._pause(2, 'network')
+        except selenium_exceptions.TimeoutException:
             print(f"{Fore.RED}❌ Failed to load YouTube{Style.RESET_ALL}")
             return False
         return True
     
+    def build_results_url(self, query, filters=None):
+        """Build the /results URL for a query with the filter spec encoded as `sp`"""
+        params = {'search_query': query}
+        sp = (filters or self.filters).to_sp()
+        if sp:
+            params['sp'] = sp
+        return f"{self.base_url}/results?{urlencode(params)}"
+    
+    @profiled('search_youtube_direct')
+    def search_youtube_direct(self, query, filters=None):
+        """Load the filtered results page directly instead of typing and clicking"""
+        url = self.build_results_url(query, filters)
+        print(f"{Fore.CYAN}🔍 Loading filtered results for: '{query}'...{Style.RESET_ALL}")
+        print(f"{Fore.CYAN}   {url}{Style.RESET_ALL}")
+        
+        try:
+            self.driver.get(url)
+            with self.profiler.timer('wait_seconds'):
+                self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "ytd-video-renderer")))
+            print(f"{Fore.GREEN}✓ Filtered search results loaded{Style.RESET_ALL}")
+            return True
+        except selenium_exceptions.TimeoutException:
+            print(f"{Fore.YELLOW}⚠️ Filtered results page did not show any videos{Style.RESET_ALL}")
+            return False
+        except Exception as e:
+            print(f"{Fore.YELLOW}⚠️ Direct search failed with error: {e}{Style.RESET_ALL}")
+            return False
+    
+    def search(self, query):
+        """Load filtered search results, preferring the direct URL over the UI-click path.
+        
+        The UI fallback applies the fixed filters clicked by apply_filters,
+        whatever the configured filter spec.
+        """
+        if self.search_mode == 'direct':
+            start = time.perf_counter()
+            loaded = self.search_youtube_direct(query)
+            self._record_search_latency('direct', start, loaded)
+            if loaded:
+                return True
+            print(f"{Fore.CYAN}Falling back to searching through the YouTube UI...{Style.RESET_ALL}")
+        
+        start = time.perf_counter()
+        loaded = self.navigate_to_youtube() and self.search_youtube(query)
+        if loaded:
+            self.apply_filters()
+        self._record_search_latency('ui', start, loaded)
+        return loaded
+    
+    def _record_search_latency(self, path, start, succeeded):
+        elapsed = time.perf_counter() - start
+        self.search_latencies.append({'path': path, 'seconds': elapsed, 'succeeded': bool(succeeded)})
+        status = "" if succeeded else " (failed)"
+        print(f"{Fore.CYAN}⏱️ Search latency ({path} path): {elapsed:.2f}s{status}{Style.RESET_ALL}")
+    
+    def results_cache_key(self, query):
+        """Cache key: normalized query plus everything that changes the result set"""
+        normalized = ' '.join(query.lower().split())
+        return f"{normalized}|{self.filters.to_sp() or ''}|{self.max_results}"
+    
+    @profiled('find_videos')
+    def find_videos(self, query):
+        """Search and extract videos for a query, reusing cached results while they are fresh"""
+        key = self.results_cache_key(query)
+        if self.result_cache and self.cache_mode == 'use':
+            cached = self.result_cache.get(key)
+            if cached:
+                self.cache_saved_seconds += cached['seconds']
+                print(f"{Fore.GREEN}⚡ Result cache hit for '{query}': {len(cached['videos'])} videos, "
+                      f"skipped ~{cached['seconds']:.1f}s of search and extraction{Style.RESET_ALL}")
+                self.report_cache_stats()
+                return [VideoRecord.from_dict(video, cached['extracted_at']) for video in cached['videos']]
+        
+        start, start_time = time.perf_counter(), time.time()
+        if self.backend == 'http':
+            # Fetch and parse the results without a browser
+            videos = self.search_http(query)
+        else:
+            if self.driver is None:
+                self.setup_driver()
+            
+            # Navigate, search and apply filters
+            if not self.search(query):
+                return []
+            
+            # Extract video data
+            videos = self.extract_video_data()
+            self.measure_page_metrics()
+        
+        if videos and self.result_cache and self.cache_mode != 'bypass':
+            self.result_cache.put(key, {'videos': [video.to_dict() for video in videos], 'extracted_at': start_time,
+                                        'seconds': time.perf_counter() - start})
+        self.report_cache_stats()
+        return videos
+    
+    def report_cache_stats(self):
+        """Print result cache hit rate and the search time it saved"""
+        cache = self.result_cache
+        if not cache or self.cache_mode == 'bypass' or not cache.lookups:
+            return
+        hits = cache.stats['hits'] + cache.stats['disk_hits']
+        print(f"{Fore.CYAN}🗃️ Result cache: {hits}/{cache.lookups} hits ({cache.hit_rate:.0%}), "
+              f"saved ~{self.cache_saved_seconds:.1f}s{Style.RESET_ALL}")
+    
+    @profiled('search_http')
+    def search_http(self, query):
+        """Search and extract over HTTP, returning the same VideoRecords as extract_video_data"""
+        print(f"{Fore.CYAN}🔍 Fetching results over HTTP for: '{query}'...{Style.RESET_ALL}")
+        self.last_extraction_stats = None
+        start = time.perf_counter()
+        try:
+            container_data = self.http_search.iter_results(self.build_results_url(query))
+            self.last_extraction_stats = self.http_search.last_stats
+            videos = self._select_videos(container_data)
+        except Exception as e:
+            print(f"{Fore.RED}❌ HTTP search failed: {e}{Style.RESET_ALL}")
+            self._record_search_latency('http', start, False)
+            return []
+        
+        self._record_search_latency('http', start, True)
+        stats = self.http_search.last_stats
+        print(f"{Fore.GREEN}✓ Extracted {len(videos)} videos with {stats['requests']} HTTP request(s), "
+              f"{stats['bytes'] / 1024:.0f} KB{Style.RESET_ALL}")
+        return videos
+    
+    @profiled('search_youtube')
     def search_youtube(self, query):
         """Search for videos on YouTube"""
         print(f"{Fore.CYAN}🔍 Searching for: '{query}'...{Style.RESET_ALL}")
         
         try:
             # Wait a bit for any lazy loading
-            time.sleep(2)
+            self._pause(2, 'dom')
             
             # Try multiple search box selectors (YouTube changes these frequently)
             search_selectors = [
@@ -186,31 +1991,22 @@ class YouTubeVideoFinder:
                 "input#search",
                 "#search-input input",
                 "ytd-searchbox input",
-                "input[placeholder*='Search']"
+                "input[placeholder*='Search']",
+                "//input[@placeholder='Search']"
             ]
             
-            search_box = None
-            for selector in search_selectors:
-                try:
-                    search_box = self.wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, selector)))
-                    print(f"{Fore.GREEN}Found search box with selector: {selector}{Style.RESET_ALL}")
-                    break
-                except TimeoutException:
-                    continue
-            
-            if not search_box:
-                # Try XPath approach
-                try:
-                    search_box = self.wait.until(EC.element_to_be_clickable((By.XPATH, "//input[@placeholder='Search']")))
-                    print(f"{Fore.GREEN}Found search box with XPath{Style.RESET_ALL}")
-                except TimeoutException:
-                    print(f"{Fore.RED}❌ Could not find search box{Style.RESET_ALL}")
-                    return False
+            # All candidates are checked in every polling cycle under one deadline
+            search_box, selector = self._race_selectors('search_box', search_selectors, clickable=True)
+            if search_box:
+                print(f"{Fore.GREEN}Found search box with selector: {selector}{Style.RESET_ALL}")
+            else:
+                print(f"{Fore.RED}❌ Could not find search box{Style.RESET_ALL}")
+                return False
             
             # Clear and enter search query
             search_box.clear()
             search_box.send_keys(query)
-            time.sleep(1)
+            self._pause(1, 'dom')
             
             # Try multiple search button selectors
             search_button_selectors = [
@@ -221,14 +2017,9 @@ class YouTubeVideoFinder:
                 "#searchbox button"
             ]
             
-            search_button = None
-            for selector in search_button_selectors:
-                try:
-                    search_button = self.wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, selector)))
-                    print(f"{Fore.GREEN}Found search button with selector: {selector}{Style.RESET_ALL}")
-                    break
-                except TimeoutException:
-                    continue
+            search_button, selector = self._race_selectors('search_button', search_button_selectors, clickable=True)
+            if search_button:
+                print(f"{Fore.GREEN}Found search button with selector: {selector}{Style.RESET_ALL}")
             
             if not search_button:
                 # Try pressing Enter instead
@@ -246,32 +2037,26 @@ class YouTubeVideoFinder:
                 "ytd-video-renderer",
                 "#primary #contents",
                 "[data-target-id='watch-card-compact-video']",
-                ".ytd-item-section-renderer",
-                "//button[@class='ytSearchboxComponentSearchButton']"
+                ".ytd-item-section-renderer"
             ]
             
-            results_loaded = False
-            for selector in results_selectors:
-                try:
-                    self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
-                    print(f"{Fore.GREEN}Search results loaded (found: {selector}){Style.RESET_ALL}")
-                    results_loaded = True
-                    break
-                except TimeoutException:
-                    continue
+            results_element, selector = self._race_selectors('results', results_selectors)
+            if results_element:
+                print(f"{Fore.GREEN}Search results loaded (found: {selector}){Style.RESET_ALL}")
             
-            if not results_loaded:
+            if not results_element:
                 print(f"{Fore.RED}❌ Search results did not load properly{Style.RESET_ALL}")
                 return False
                 
             print(f"{Fore.GREEN}✓ Search completed{Style.RESET_ALL}")
-            time.sleep(3)
+            self._pause(3, 'settled')
             return True
             
         except Exception as e:
             print(f"{Fore.RED}❌ Search failed with error: {e}{Style.RESET_ALL}")
             return False
     
+    @profiled('apply_filters')
     def apply_filters(self):
         """Apply filters: This week + 4-20 minutes duration"""
         print(f"{Fore.CYAN}⚙️ Applying filters...{Style.RESET_ALL}")
@@ -279,7 +2064,7 @@ class YouTubeVideoFinder:
         try:
             # Scroll to top to avoid any overlay issues
             self.driver.execute_script("window.scrollTo(0, 0);")
-            time.sleep(1)
+            self._pause(1, 'dom')
             
             # Try multiple approaches to find and click the Filters button
             filters_selectors = [
@@ -290,31 +2075,23 @@ class YouTubeVideoFinder:
                 "[aria-label*='filter']"
             ]
             
-            filters_button = None
-            for selector in filters_selectors:
-                try:
-                    if selector.startswith("//"):
-                        filters_button = self.wait.until(EC.presence_of_element_located((By.XPATH, selector)))
-                    else:
-                        filters_button = self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
-                    
-                    # Scroll element into view
-                    self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", filters_button)
-                    time.sleep(1)
-                    
-                    # Try JavaScript click first (most reliable)
-                    self.driver.execute_script("arguments[0].click();", filters_button)
-                    print(f"{Fore.GREEN} ✓ Filters button clicked using JS{Style.RESET_ALL}")
-                    break
-                    
-                except Exception as e:
-                    continue
+            def click_filters_button(filters_button, selector):
+                # Scroll element into view
+                self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", filters_button)
+                self._pause(1, 'dom')
+                
+                # Try JavaScript click first (most reliable)
+                self.driver.execute_script("arguments[0].click();", filters_button)
+            
+            filters_button, _ = self._race_selectors('filters_button', filters_selectors, click_filters_button)
+            if filters_button:
+                print(f"{Fore.GREEN} ✓ Filters button clicked using JS{Style.RESET_ALL}")
                     
             if not filters_button:
                 print(f"{Fore.YELLOW}⚠️ Could not find filters button, continuing without filters{Style.RESET_ALL}")
                 return False
                 
-            time.sleep(2)
+            self._pause(2, 'settled')
             
             # Click "This week" filter
             time_filter_selectors = [
@@ -324,33 +2101,25 @@ class YouTubeVideoFinder:
                 "[aria-label*='This week']"
             ]
             
-            time_filter = None
-            for selector in time_filter_selectors:
-                try:
-                    if selector.startswith("//"):
-                        time_filter = self.wait.until(EC.presence_of_element_located((By.XPATH, selector)))
-                    else:
-                        time_filter = self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
-                    
-                    # Scroll and click with JavaScript
-                    self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", time_filter)
-                    time.sleep(1)
-                    self.driver.execute_script("arguments[0].click();", time_filter)
-                    print(f"{Fore.GREEN} ✓ This week filter applied{Style.RESET_ALL}")
-                    break
-                    
-                except Exception as e:
-                    continue
+            def click_time_filter(time_filter, selector):
+                # Scroll and click with JavaScript
+                self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", time_filter)
+                self._pause(1, 'dom')
+                self.driver.execute_script("arguments[0].click();", time_filter)
+            
+            time_filter, _ = self._race_selectors('upload_date_filter', time_filter_selectors, click_time_filter)
+            if time_filter:
+                print(f"{Fore.GREEN} ✓ This week filter applied{Style.RESET_ALL}")
                     
             if not time_filter:
                 print(f"{Fore.YELLOW}⚠️ Could not apply 'This week' filter{Style.RESET_ALL}")
             
-            time.sleep(2)
+            self._pause(2, 'settled')
             
             # Click Filters again to access duration
             try:
                 # Find filters button again (it might have changed)
-                for selector in filters_selectors:
+                for selector in self.selector_stats.order('filters_button', filters_selectors):
                     try:
                         if selector.startswith("//"):
                             filters_button = self.driver.find_element(By.XPATH, selector)
@@ -358,7 +2127,7 @@ class YouTubeVideoFinder:
                             filters_button = self.driver.find_element(By.CSS_SELECTOR, selector)
                         
                         self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", filters_button)
-                        time.sleep(1)
+                        self._pause(1, 'dom')
                         self.driver.execute_script("arguments[0].click();", filters_button)
                         print(f"{Fore.GREEN} ✓ Filters reopened{Style.RESET_ALL}")
                         break
@@ -367,7 +2136,7 @@ class YouTubeVideoFinder:
             except Exception as e:
                 print(f"{Fore.YELLOW}⚠️ Could not reopen filters for duration{Style.RESET_ALL}")
             
-            time.sleep(2)
+            self._pause(2, 'settled')
             
             # Click "4-20 minutes" duration filter
             duration_filter_selectors = [
@@ -381,299 +2150,812 @@ class YouTubeVideoFinder:
                 "[aria-label*='4 - 20 minutes']"
             ]
             
-            duration_filter = None
-            for selector in duration_filter_selectors:
-                try:
-                    if selector.startswith("//"):
-                        duration_filter = self.wait.until(EC.presence_of_element_located((By.XPATH, selector)))
-                    else:
-                        duration_filter = self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
-                    
-                    # Scroll and click with JavaScript
-                    self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", duration_filter)
-                    time.sleep(1)
-                    
-                    # Try clicking the parent anchor if we found the yt-formatted-string
-                    if "yt-formatted-string" in selector:
-                        # Find the parent anchor element
-                        parent_anchor = duration_filter.find_element(By.XPATH, "./ancestor::a[@id='endpoint']")
-                        self.driver.execute_script("arguments[0].click();", parent_anchor)
-                    else:
-                        self.driver.execute_script("arguments[0].click();", duration_filter)
-                    
-                    print(f"{Fore.GREEN} ✓ Duration filter (4-20 minutes) applied{Style.RESET_ALL}")
-                    break
-                    
-                except Exception as e:
-                    print(f"{Fore.YELLOW}⚠️ Selector '{selector}' failed: {str(e)[:50]}...{Style.RESET_ALL}")
-                    continue
+            def click_duration_filter(duration_filter, selector):
+                # Scroll and click with JavaScript
+                self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", duration_filter)
+                self._pause(1, 'dom')
+                
+                # Try clicking the parent anchor if we found the yt-formatted-string
+                if "yt-formatted-string" in selector:
+                    # Find the parent anchor element
+                    parent_anchor = duration_filter.find_element(By.XPATH, "./ancestor::a[@id='endpoint']")
+                    self.driver.execute_script("arguments[0].click();", parent_anchor)
+                else:
+                    self.driver.execute_script("arguments[0].click();", duration_filter)
+            
+            duration_filter, _ = self._race_selectors('duration_filter', duration_filter_selectors,
+                                                      click_duration_filter, report_misses=True)
+            if duration_filter:
+                print(f"{Fore.GREEN} ✓ Duration filter (4-20 minutes) applied{Style.RESET_ALL}")
                     
             if not duration_filter:
                 print(f"{Fore.YELLOW}⚠️ Could not apply duration filter{Style.RESET_ALL}")
             
-            time.sleep(3)
+            self._pause(3, 'settled')
             print(f"{Fore.GREEN}✓ Filters applied successfully{Style.RESET_ALL}")
             return True
             
-        except Exception as e:
-            print(f"{Fore.YELLOW}⚠️ Filter application had issues: {e}{Style.RESET_ALL}")
-            print(f"{Fore.CYAN}Continuing without all filters...{Style.RESET_ALL}")
-            return False
+        except Exception as e:
+            print(f"{Fore.YELLOW}⚠️ Filter application had issues: {e}{Style.RESET_ALL}")
+            print(f"{Fore.CYAN}Continuing without all filters...{Style.RESET_ALL}")
+            return False
+    
+    @profiled('extract')
+    def extract_video_data(self):
+        """Extract video data from search results"""
+        print(f"{Fore.CYAN}📊 Extracting video data...{Style.RESET_ALL}")
+        
+        videos = []
+        self.last_extraction_stats = None
+        start = time.perf_counter()
+        try:
+            # Check if browser is still available
+            try:
+                self.driver.current_url
+            except Exception as e:
+                print(f"{Fore.RED}❌ Browser window was closed: {e}{Style.RESET_ALL}")
+                return []
+            
+            for video in self.iter_video_data():
+                videos.append(video)
+            
+            self._report_extraction_stats()
+            print(f"{Fore.GREEN}✓ Successfully extracted {len(videos)} videos{Style.RESET_ALL}")
+            return videos
+            
+        except Exception as e:
+            if "no such window" in str(e).lower():
+                print(f"{Fore.RED}❌ Browser window closed during extraction{Style.RESET_ALL}")
+            else:
+                print(f"{Fore.RED}❌ Error extracting video data: {e}{Style.RESET_ALL}")
+            if videos:
+                print(f"{Fore.YELLOW}⚠️ Keeping the {len(videos)} videos extracted before the error{Style.RESET_ALL}")
+            return videos
+        finally:
+            # Failed and empty extractions are the ones most worth replaying
+            if self.snapshot_dir:
+                self.record_snapshot(videos, time.perf_counter() - start)
+    
+    def iter_video_data(self, target=None):
+        """Yield validated, de-duplicated VideoRecords from the live results page as they are parsed.
+        
+        Containers are parsed after every scroll, skipping those already seen, so
+        the first videos arrive before scrolling finishes. Scrolling stops once
+        target videos (default max_results) have been yielded, when a scroll
+        loads nothing new, or once the scroll budget for target runs out.
+        """
+        target = target or self.max_results
+        max_scrolls = self._scroll_budget(target)
+        seen = set()
+        
+        # Structured results need no scrolling or DOM lookups
+        if self.extraction_mode == 'initial_data':
+            container_data = self._iter_container_data_initial_data()
+            if container_data is not None:
+                yield from self._iter_accepted_videos(container_data, seen, target)
+                return
+            print(f"{Fore.YELLOW}⚠️ No ytInitialData found, falling back to DOM extraction{Style.RESET_ALL}")
+        
+        # Wait a bit for any redirects or pop-ups to settle
+        self._pause(3, 'settled')
+        self._dismiss_popups()
+        
+        print(f"{Fore.CYAN}📜 Extracting while scrolling until {target} videos are found...{Style.RESET_ALL}")
+        run_stats = {}
+        parsed = count = 0
+        for scroll in range(max_scrolls + 1):
+            container_data = self._iter_dom_container_data(offset=parsed)
+            if container_data is not None:
+                for i, video_data in container_data:
+                    parsed = i
+                    video = self._accept_video(i, video_data, seen)
+                    if video is None:
+                        continue
+                    count += 1
+                    yield video
+                    if count >= target:
+                        print(f"{Fore.GREEN}✓ Reached target of {target} videos, stopping scroll{Style.RESET_ALL}")
+                        self.last_extraction_stats = self._merge_extraction_stats(run_stats)
+                        return
+                self._merge_extraction_stats(run_stats)
+            elif not parsed:
+                print(f"{Fore.YELLOW}⚠️ No video containers yet{Style.RESET_ALL}")
+            
+            if scroll == max_scrolls:
+                print(f"{Fore.YELLOW}⚠️ Scroll budget of {max_scrolls} used up at {count}/{target} videos{Style.RESET_ALL}")
+                break
+            try:
+                with self.profiler.span('scroll', scroll=scroll + 1):
+                    baseline = self.driver.execute_script(
+                        "window.scrollTo(0, document.body.scrollHeight);"
+                        "return document.querySelectorAll('ytd-video-renderer').length;")
+                    self._pause(3, 'growth', baseline=baseline)  # Until new results stop arriving
+                    loaded = self.driver.execute_script("return document.querySelectorAll('ytd-video-renderer').length;")
+            except Exception as e:
+                print(f"{Fore.YELLOW}⚠️ Scrolling failed: {e}{Style.RESET_ALL}")
+                break
+            print(f"{Fore.YELLOW}   Scroll {scroll + 1}: {loaded} results loaded, {count}/{target} videos so far{Style.RESET_ALL}")
+            if loaded <= baseline and parsed:
+                print(f"{Fore.YELLOW}⚠️ No more results loaded, stopping scroll{Style.RESET_ALL}")
+                break
+        
+        if not parsed:
+            print(f"{Fore.RED}❌ Could not find video containers{Style.RESET_ALL}")
+        self.last_extraction_stats = run_stats or None
+    
+    def _scroll_budget(self, target):
+        """Scrolls allowed for target videos: twice the expected number, and at least 6"""
+        return max(6, 2 * math.ceil(target / self.RESULTS_PER_SCROLL))
+    
+    def _dismiss_popups(self):
+        """Check for and close any pop-ups or overlays"""
+        try:
+            # Look for common YouTube pop-up close buttons
+            popup_selectors = [
+                "button[aria-label='Dismiss']",
+                "button[aria-label='Close']", 
+                "yt-icon-button[aria-label='Dismiss']",
+                ".dismiss-button"
+            ]
+            
+            for selector in popup_selectors:
+                try:
+                    popup = self.driver.find_element(By.CSS_SELECTOR, selector)
+                    if popup.is_displayed():
+                        self.driver.execute_script("arguments[0].click();", popup)
+                        print(f"{Fore.GREEN}✓ Dismissed popup{Style.RESET_ALL}")
+                        self._pause(1, 'settled')
+                except:
+                    continue
+        except:
+            pass
     
-    def extract_video_data(self):
-        """Extract video data from search results"""
-        print(f"{Fore.CYAN}📊 Extracting video data...{Style.RESET_ALL}")
+    def _iter_dom_container_data(self, offset=0):
+        """Container data for the containers after the first offset, in the configured DOM mode"""
+        if self.extraction_mode in ('bulk', 'initial_data'):
+            return self._iter_container_data_bulk(offset)
+        if self.extraction_mode == 'page_source':
+            return self._iter_container_data_page_source(offset=offset)
+        return self._iter_container_data_element(offset)
+    
+    def _merge_extraction_stats(self, run_stats):
+        """Fold the latest batch's stats into run_stats: counters add up, peaks take the max"""
+        batch = self.last_extraction_stats or {}
+        for key, value in batch.items():
+            if key == 'peak_alloc_bytes':
+                run_stats[key] = max(run_stats.get(key, 0), value)
+            elif isinstance(value, (int, float)):
+                run_stats[key] = run_stats.get(key, 0) + value
+            else:
+                run_stats.setdefault(key, value)
+        self.last_extraction_stats = None
+        return run_stats
+    
+    @staticmethod
+    def _dedup_key(video):
+        """Canonical video ID, so distinct videos that share a title are both kept"""
+        if video.video_id:
+            return video.video_id
+        return video.url if video.url != 'Unknown URL' else video.title.lower()
+    
+    def _accept_video(self, i, video_data, seen):
+        """Validate one container's data; return a VideoRecord if it is new, else None"""
+        # More lenient validation - only require title
+        if video_data['title'] == 'Unknown Title' or len(video_data['title'].strip()) <= 3:
+            print(f"{Fore.RED}⚠️ Rejected video {i}: '{video_data['title'][:40]}'{Style.RESET_ALL}")
+            return None
         
-        videos = []
-        try:
-            # Check if browser is still available
+        video = VideoRecord.from_dict(video_data)
+        key = self._dedup_key(video)
+        if key in seen:
+            print(f"{Fore.YELLOW}⚠️ Skipped duplicate: {video.title[:40]}...{Style.RESET_ALL}")
+            return None
+        seen.add(key)
+        print(f"{Fore.GREEN}✓ Video {len(seen)}: {video.title[:60]}...{Style.RESET_ALL}")
+        return video
+    
+    def _iter_accepted_videos(self, container_data, seen, target):
+        count = 0
+        for i, video_data in container_data:
+            video = self._accept_video(i, video_data, seen)
+            if video is None:
+                continue
+            count += 1
+            yield video
+            # Stop once we have enough good videos
+            if count >= target:
+                print(f"{Fore.GREEN}✓ Reached target of {target} videos{Style.RESET_ALL}")
+                return
+    
+    def _select_videos(self, container_data):
+        """Validate and de-duplicate extracted container data, keeping the top max_results videos"""
+        print(f"{Fore.CYAN}🎯 Processing videos to extract top {self.max_results}...{Style.RESET_ALL}")
+        videos = list(self._iter_accepted_videos(container_data, set(), self.max_results))
+        self._report_extraction_stats()
+        return videos
+    
+    def _report_extraction_stats(self):
+        stats = self.last_extraction_stats
+        if stats and 'pages' in stats:
+            if 'fetch_seconds' in stats:
+                timing = (f"{stats['fetch_seconds'] * 1000:.0f} ms fetching, "
+                          f"{stats['parse_seconds'] * 1000:.0f} ms parsing")
+            else:
+                # Browser continuations are fetched and parsed in one timed step
+                timing = f"{stats['parse_seconds'] * 1000:.0f} ms fetching and parsing"
+            print(f"{Fore.CYAN}⚡ {stats['engine']} extraction: {stats['renderers']} results from {stats['pages']} page(s), "
+                  f"{stats['webdriver_calls']} WebDriver call(s), no scrolling, {timing}{Style.RESET_ALL}")
+        elif stats:
+            saved = stats['equivalent_calls'] - stats['webdriver_calls']
+            print(f"{Fore.CYAN}⚡ {stats['engine']} extraction: {stats['webdriver_calls']} WebDriver call(s) instead of "
+                  f"~{stats['equivalent_calls']} (saved {saved} round-trips){Style.RESET_ALL}")
+    
+    def _find_video_containers(self):
+        """Find video containers using the first container selector that matches"""
+        def find_containers(selector):
+            containers = self.driver.find_elements(By.XPATH, selector)
+            if not containers:
+                raise selenium_exceptions.NoSuchElementException(f"no containers match {selector}")
+            return containers
+        
+        containers, selector = self._try_selectors('container', self.VIDEO_CONTAINER_SELECTORS, find_containers)
+        if containers:
+            print(f"{Fore.GREEN}Found {len(containers)} video containers using: {selector}{Style.RESET_ALL}")
+        return containers or []
+    
+    def _iter_container_data_element(self, offset=0):
+        """Extract containers one WebDriver call at a time (element mode)"""
+        video_containers = self._find_video_containers()
+        if len(video_containers or ()) <= offset:
+            return None
+        return self._iter_element_video_data(video_containers, offset)
+    
+    def _iter_element_video_data(self, video_containers, offset=0):
+        """Yield (index, video_data) for a batch of containers after offset using per-field lookups"""
+        # Process extra containers to ensure we get enough good videos
+        batch = video_containers[offset:offset + self._container_limit()]
+        selectors = self._field_selectors()
+        for i, container in enumerate(batch, offset + 1):
             try:
+                # Check if browser is still available
                 self.driver.current_url
+                
+                video_data = self._build_video_data(
+                    self._element_title_candidates(container, selectors['title']),
+                    self._element_url_candidates(container, selectors['url']),
+                    self._element_channel_candidates(container, selectors['channel']),
+                    self._element_metadata_candidates(container),
+                    self._element_duration_candidates(container, selectors['duration']),
+                    selectors
+                )
             except Exception as e:
-                print(f"{Fore.RED}❌ Browser window was closed: {e}{Style.RESET_ALL}")
-                return []
-            
-            # Wait a bit for any redirects or pop-ups to settle
-            time.sleep(3)
-            
-            # Check for and handle any pop-ups or overlays
+                if "no such window" in str(e).lower():
+                    print(f"{Fore.RED}❌ Browser window closed unexpectedly{Style.RESET_ALL}")
+                    return
+                print(f"{Fore.YELLOW}⚠️ Error extracting data from video {i}: {str(e)[:50]}...{Style.RESET_ALL}")
+                continue
+            yield i, video_data
+    
+    def _element_title_candidates(self, container, selectors=None):
+        for selector in selectors or self.TITLE_SELECTORS:
             try:
-                # Look for common YouTube pop-up close buttons
-                popup_selectors = [
-                    "button[aria-label='Dismiss']",
-                    "button[aria-label='Close']", 
-                    "yt-icon-button[aria-label='Dismiss']",
-                    ".dismiss-button"
-                ]
-                
-                for selector in popup_selectors:
-                    try:
-                        popup = self.driver.find_element(By.CSS_SELECTOR, selector)
-                        if popup.is_displayed():
-                            self.driver.execute_script("arguments[0].click();", popup)
-                            print(f"{Fore.GREEN}✓ Dismissed popup{Style.RESET_ALL}")
-                            time.sleep(1)
-                    except:
-                        continue
-            except:
-                pass
-            
-            # Enhanced scrolling to load more videos (scroll more times and wait longer)
-            print(f"{Fore.CYAN}📜 Scrolling to load more videos...{Style.RESET_ALL}")
-            for i in range(6):  # Increased from 3 to 6
-                try:
-                    self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                    time.sleep(3)  # Increased wait time
-                    
-                    # Check how many videos we have so far
-                    temp_containers = self.driver.find_elements(By.XPATH, "//div[contains(@class, 'ytd-video-renderer')]")
-                    print(f"{Fore.YELLOW}   Scroll {i+1}: Found {len(temp_containers)} video containers{Style.RESET_ALL}")
-                    
-                    # If we have enough videos, stop scrolling
-                    if len(temp_containers) >= 20:
-                        print(f"{Fore.GREEN}✓ Found enough videos, stopping scroll{Style.RESET_ALL}")
-                        break
-                        
-                except Exception as e:
-                    print(f"{Fore.YELLOW}⚠️ Scrolling failed: {e}{Style.RESET_ALL}")
+                title_element = container.find_element(By.XPATH, selector)
+                # Try title attribute first, then text content
+                title = (title_element.get_attribute('title') or 
+                         title_element.get_attribute('aria-label') or 
+                         title_element.text)
+            except Exception:
+                title = None
+            yield title
+    
+    def _element_url_candidates(self, container, selectors=None):
+        for selector in selectors or self.URL_SELECTORS:
+            try:
+                href = container.find_element(By.XPATH, selector).get_attribute('href')
+            except Exception:
+                href = None
+            yield href
+    
+    def _element_channel_candidates(self, container, selectors=None):
+        for selector in selectors or self.CHANNEL_SELECTORS:
+            try:
+                channel_element = container.find_element(By.XPATH, selector)
+                channel_name = (channel_element.text or 
+                                channel_element.get_attribute('aria-label'))
+            except Exception:
+                channel_name = None
+            yield channel_name
+    
+    def _element_metadata_candidates(self, container):
+        for selector in self.METADATA_SELECTORS:
+            try:
+                texts = [elem.text for elem in container.find_elements(By.XPATH, selector)]
+            except Exception:
+                texts = []
+            yield texts
+    
+    def _element_duration_candidates(self, container, selectors=None):
+        for selector in selectors or self.DURATION_SELECTORS:
+            try:
+                duration = container.find_element(By.XPATH, selector).text
+            except Exception:
+                duration = None
+            yield duration
+    
+    def _build_video_data(self, titles, urls, channels, metadata, durations, selectors=None):
+        """Apply the selector fallback rules to candidate values and build a video dict.
+        
+        Each argument yields one raw value per selector, in selector order, and is
+        consumed lazily so element mode stops querying once a field is resolved.
+        With selectors (the ordered lists the values came from), the selector
+        that resolved each field is recorded in selector_stats.
+        """
+        video_data = {'title': 'Unknown Title', 'url': 'Unknown URL', 'channel': 'Unknown Channel', 
+                      'views': 'Unknown views', 'upload_time': 'Unknown time', 'duration': 'Unknown duration'}
+        
+        def resolved(field, index):
+            if selectors:
+                self.selector_stats.record_winner(field, selectors[field], index)
+        
+        span = self.profiler.span
+        with span('extract.title'):
+            for index, title in enumerate(titles):
+                title = (title or '').strip()
+                if title and len(title) > 5 and title not in ['Watch', 'Video', 'YouTube']:
+                    video_data['title'] = title
+                    resolved('title', index)
                     break
+        
+        with span('extract.url'):
+            for index, href in enumerate(urls):
+                if href and ('/watch?v=' in href or '/shorts/' in href):
+                    video_data['url'] = href
+                    resolved('url', index)
+                    break
+        
+        with span('extract.channel'):
+            for index, channel_name in enumerate(channels):
+                channel_name = (channel_name or '').strip()
+                if channel_name:
+                    video_data['channel'] = channel_name
+                    resolved('channel', index)
+                    break
+        
+        # Views and upload time: every metadata selector is checked, later matches win
+        with span('extract.metadata'):
+            for texts in metadata:
+                for text in texts:
+                    text = (text or '').strip()
+                    if 'view' in text.lower():
+                        video_data['views'] = text
+                    elif any(word in text.lower() for word in ['ago', 'hour', 'day', 'week', 'month', 'year']):
+                        video_data['upload_time'] = text
+        
+        with span('extract.duration'):
+            for index, duration in enumerate(durations):
+                duration = (duration or '').strip()
+                if duration and ':' in duration and len(duration) < 20:
+                    video_data['duration'] = duration
+                    resolved('duration', index)
+                    break
+        
+        return video_data
+    
+    def _container_limit(self):
+        """How many containers to process per batch: at least 30, and 10 more than max_results"""
+        return max(30, self.max_results + 10)
+    
+    def _collect_raw_containers(self, offset=0, selectors=None):
+        """Collect raw field values for a batch of containers with a single execute_script call"""
+        return self.driver.execute_script(
+            BULK_EXTRACT_SCRIPT,
+            self.selector_stats.order('container', self.VIDEO_CONTAINER_SELECTORS),
+            selectors or self._field_selectors(),
+            self._container_limit(),
+            offset
+        )
+    
+    def _iter_container_data_bulk(self, offset=0):
+        """Extract the containers after offset in one round-trip, falling back to element mode on failure"""
+        # Container selectors stop at the first match and keep their learned order
+        selectors = self._field_selectors()
+        try:
+            result = self._collect_raw_containers(offset, selectors)
+        except Exception as e:
+            print(f"{Fore.YELLOW}⚠️ Bulk extraction failed, falling back to element mode: {str(e)[:80]}{Style.RESET_ALL}")
+            return self._iter_container_data_element(offset)
+        
+        if result and not offset:
+            ordered = self.selector_stats.order('container', self.VIDEO_CONTAINER_SELECTORS)
+            for selector in ordered[:result['selectors_tried'] - (1 if result['selector'] else 0)]:
+                self.selector_stats.record('container', selector, False)
+            if result['selector']:
+                self.selector_stats.record('container', result['selector'], True)
+        if not result or not result.get('items'):
+            return None
+        
+        print(f"{Fore.GREEN}Found {result['total']} video containers using: {result['selector']}{Style.RESET_ALL}")
+        
+        # Tally what element mode would have spent: one find_elements per container
+        # selector tried, then the lazy per-field calls replayed from the raw values
+        stats = {'engine': 'Bulk', 'webdriver_calls': 1, 'equivalent_calls': result['selectors_tried']}
+        self.last_extraction_stats = stats
+        return self._iter_raw_video_data(result['items'], stats, offset, selectors)
+    
+    def _iter_raw_video_data(self, items, stats, offset=0, selectors=None):
+        """Yield (index, video_data) built from raw container values collected in one pass"""
+        for i, raw in enumerate(items, offset + 1):
+            stats['equivalent_calls'] += 1  # current_url check per container
+            video_data = self._build_video_data(
+                self._tally_first_match(raw['title'], stats),
+                self._tally_first_match(raw['url'], stats),
+                self._tally_first_match(raw['channel'], stats),
+                self._tally_all_matches(raw['metadata'], stats),
+                self._tally_first_match(raw['duration'], stats),
+                selectors
+            )
+            yield i, video_data
+    
+    @staticmethod
+    def _tally_first_match(per_selector, stats):
+        """Yield the first truthy attribute per selector, counting the calls element mode makes"""
+        for values in per_selector:
+            stats['equivalent_calls'] += 1  # find_element
+            if values is None:
+                yield None
+                continue
+            if not isinstance(values, list):
+                values = [values]
+            value = None
+            for value in values:
+                stats['equivalent_calls'] += 1  # get_attribute / .text
+                if value:
+                    break
+            yield value
+    
+    @staticmethod
+    def _tally_all_matches(per_selector, stats):
+        """Yield every matched text per selector, counting find_elements plus one .text each"""
+        for texts in per_selector:
+            stats['equivalent_calls'] += 1 + len(texts)
+            yield texts
+    
+    @classmethod
+    def _compiled_xpaths(cls):
+        """Compile the selector fallback lists into lxml XPath objects once per process"""
+        if cls._xpath_cache is None:
+            compile_all = lambda selectors: [etree.XPath(selector) for selector in selectors]
+            cls._xpath_cache = {
+                'containers': [(selector, etree.XPath(selector)) for selector in cls.VIDEO_CONTAINER_SELECTORS],
+                'title': compile_all(cls.TITLE_SELECTORS),
+                'url': compile_all(cls.URL_SELECTORS),
+                'channel': compile_all(cls.CHANNEL_SELECTORS),
+                'metadata': compile_all(cls.METADATA_SELECTORS),
+                'duration': compile_all(cls.DURATION_SELECTORS)
+            }
+        return cls._xpath_cache
+    
+    @staticmethod
+    def _node_text(node):
+        """Approximate Selenium's .text for a parsed node by collapsing whitespace"""
+        return ' '.join(node.text_content().split())
+    
+    @classmethod
+    def parse_page_source(cls, page_source, base_url="https://www.youtube.com", limit=None):
+        """Parse a results page snapshot into raw container values without a browser.
+        
+        Returns the same structure as the bulk extraction script, so the result can
+        be fed to _iter_raw_video_data and the normal selector fallback rules.
+        """
+        xpaths = cls._compiled_xpaths()
+        root = lxml_html.fromstring(page_source)
+        text = cls._node_text
+        
+        def each_first(compiled, container, read):
+            values = []
+            for xpath in compiled:
+                matches = xpath(container)
+                values.append(read(matches[0]) if matches else None)
+            return values
+        
+        containers, selector, tried = [], None, 0
+        for candidate, xpath in xpaths['containers']:
+            tried += 1
+            containers = xpath(root)
+            if containers:
+                selector = candidate
+                break
+        
+        items = []
+        for container in containers[:limit]:
+            items.append({
+                'title': each_first(xpaths['title'], container,
+                                    lambda el: [el.get('title'), el.get('aria-label'), text(el)]),
+                'url': each_first(xpaths['url'], container,
+                                  lambda el: urljoin(base_url, el.get('href')) if el.get('href') else None),
+                'channel': each_first(xpaths['channel'], container,
+                                      lambda el: [text(el), el.get('aria-label')]),
+                'metadata': [[text(el) for el in xpath(container)] for xpath in xpaths['metadata']],
+                'duration': each_first(xpaths['duration'], container, text)
+            })
+        
+        return {'selector': selector, 'total': len(containers), 'selectors_tried': tried, 'items': items}
+    
+    def _iter_container_data_page_source(self, page_source=None, offset=0):
+        """Parse one page_source snapshot locally instead of querying the live DOM per field"""
+        webdriver_calls = 0
+        if page_source is None:
+            page_source = self.driver.page_source
+            webdriver_calls = 1
+        
+        # Allocation tracing slows parsing severalfold, so it only runs while profiling
+        peak_bytes = None
+        if self.profiler.enabled:
+            tracing = not tracemalloc.is_tracing()
+            if tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            start = time.perf_counter()
+            try:
+                result = self.parse_page_source(page_source)
+            finally:
+                parse_time = time.perf_counter() - start
+                _, peak_bytes = tracemalloc.get_traced_memory()
+                if tracing:
+                    tracemalloc.stop()
+        else:
+            start = time.perf_counter()
+            result = self.parse_page_source(page_source)
+            parse_time = time.perf_counter() - start
+        
+        memory = (f"peak allocations {peak_bytes / 1024:.0f} KB, timed while tracing, "
+                  if peak_bytes is not None else "")
+        print(f"{Fore.CYAN}🧩 Parsed {len(page_source) // 1024} KB page source in {parse_time * 1000:.1f} ms "
+              f"({memory}{result['total']} containers){Style.RESET_ALL}")
+        
+        if len(result['items']) <= offset:
+            return None
+        
+        print(f"{Fore.GREEN}Found {result['total']} video containers using: {result['selector']}{Style.RESET_ALL}")
+        stats = {'engine': 'Page source', 'webdriver_calls': webdriver_calls,
+                 'equivalent_calls': result['selectors_tried'],
+                 'parse_seconds': parse_time}
+        if peak_bytes is not None:
+            stats['peak_alloc_bytes'] = peak_bytes
+        self.last_extraction_stats = stats
+        return self._iter_raw_video_data(result['items'][offset:offset + self._container_limit()], stats, offset)
+    
+    def _iter_container_data_initial_data(self, page_source=None, data=None):
+        """Read the results from ytInitialData once, following continuations for more.
+        
+        data (an already decoded ytInitialData object) or page_source are read
+        offline instead of the live page. Returns None when no structured data
+        is available so callers can fall back to DOM extraction.
+        """
+        start = time.perf_counter()
+        offline = data is not None or page_source is not None
+        if data is not None:
+            webdriver_calls = 0
+        elif page_source is not None:
+            data = find_initial_data(page_source)
+            webdriver_calls = 0
+        else:
+            raw = self.driver.execute_script(INITIAL_DATA_SCRIPT)
+            data = json.loads(raw) if raw else None
+            webdriver_calls = 1
+        if not data:
+            return None
+        
+        renderers, token = parse_search_response(data)
+        if not renderers:
+            return None
+        
+        stats = {'engine': 'ytInitialData', 'webdriver_calls': webdriver_calls, 'pages': 1,
+                 'renderers': len(renderers), 'parse_seconds': time.perf_counter() - start}
+        self.last_extraction_stats = stats
+        print(f"{Fore.GREEN}Found {len(renderers)} videos in ytInitialData{Style.RESET_ALL}")
+        # Continuations need the live page's InnerTube config, so saved pages stop at page one
+        return self._iter_initial_data_videos(renderers, None if offline else token, stats)
+    
+    def _iter_initial_data_videos(self, renderers, token, stats):
+        index = 0
+        while True:
+            for renderer in renderers:
+                index += 1
+                yield index, video_from_renderer(renderer, self.base_url)
+            if not token or stats['pages'] >= self.MAX_CONTINUATION_PAGES:
+                return
             
-            # Find all video containers with the specific YouTube selector
-            video_container_selectors = [
-                "//div[@class='style-scope ytd-video-renderer'][@id='dismissible']",  # Primary selector from user
-                "//div[contains(@class, 'ytd-video-renderer')][@id='dismissible']",   # Fallback with contains
-                "//div[contains(@class, 'ytd-video-renderer')]",  # Original fallback
-                "//ytd-video-renderer",
-                "//div[@class='ytd-video-renderer']",
-                "//div[contains(@class, 'video-renderer')]",
-                "//div[contains(@class, 'ytd-compact-video-renderer')]"
-            ]
-            
-            video_containers = []
-            for selector in video_container_selectors:
-                try:
-                    containers = self.driver.find_elements(By.XPATH, selector)
-                    if containers:
-                        video_containers = containers
-                        print(f"{Fore.GREEN}Found {len(containers)} video containers using: {selector}{Style.RESET_ALL}")
-                        break
-                except Exception as e:
-                    print(f"{Fore.YELLOW}⚠️ Selector '{selector}' failed: {e}{Style.RESET_ALL}")
-                    continue
-            
-            if not video_containers:
+            print(f"{Fore.CYAN}📥 Fetching more results (continuation page {stats['pages'] + 1})...{Style.RESET_ALL}")
+            start = time.perf_counter()
+            try:
+                response = self.driver.execute_async_script(CONTINUATION_SCRIPT, token)
+                stats['webdriver_calls'] += 1
+                renderers, token = parse_search_response(json.loads(response)) if response else ([], None)
+            except Exception as e:
+                print(f"{Fore.YELLOW}⚠️ Continuation request failed: {str(e)[:80]}{Style.RESET_ALL}")
+                return
+            stats['pages'] += 1
+            stats['renderers'] += len(renderers)
+            stats['parse_seconds'] += time.perf_counter() - start
+            if not renderers:
+                return
+    
+    def extract_video_data_from_source(self, page_source=None, path=None, initial_data=None):
+        """Extract video data from a page_source snapshot or a saved HTML file.
+        
+        In 'initial_data' mode a separately captured ytInitialData object is
+        preferred over the copy embedded in the page source.
+        """
+        print(f"{Fore.CYAN}📊 Extracting video data from page source...{Style.RESET_ALL}")
+        
+        self.last_extraction_stats = None
+        try:
+            if path:
+                with open(path, 'rb') as f:
+                    page_source = f.read()
+            
+            container_data = None
+            if self.extraction_mode == 'initial_data':
+                container_data = self._iter_container_data_initial_data(page_source, initial_data)
+            if container_data is None:
+                container_data = self._iter_container_data_page_source(page_source)
+            if container_data is None:
                 print(f"{Fore.RED}❌ Could not find video containers{Style.RESET_ALL}")
                 return []
             
-            print(f"{Fore.CYAN}🎯 Processing videos to extract top 20...{Style.RESET_ALL}")
-            
-            # Process up to 30 containers to ensure we get 20 good videos
-            for i, container in enumerate(video_containers[:30], 1):
-                try:
-                    # Check if browser is still available
-                    self.driver.current_url
-                    
-                    video_data = {'title': 'Unknown Title', 'url': 'Unknown URL', 'channel': 'Unknown Channel', 
-                                'views': 'Unknown views', 'upload_time': 'Unknown time', 'duration': 'Unknown duration'}
-                    
-                    # Enhanced title extraction for the specific container structure
-                    title_selectors = [
-                        ".//a[@id='video-title']",                    # Primary video title link
-                        ".//h3//a[@title]",                          # H3 with title attribute
-                        ".//a[@id='video-title-link']",              # Alternative video title link
-                        ".//yt-formatted-string[@id='video-title']", # Formatted string title
-                        ".//div[@id='meta']//a[@href]",              # Meta section link
-                        ".//div[@id='details']//a[@href]",           # Details section link
-                        ".//a[contains(@href, '/watch?v=')][@title]" # Any watch link with title
-                    ]
-                    
-                    for selector in title_selectors:
-                        try:
-                            title_element = container.find_element(By.XPATH, selector)
-                            # Try title attribute first, then text content
-                            title = (title_element.get_attribute('title') or 
-                                   title_element.get_attribute('aria-label') or 
-                                   title_element.text).strip()
-                            
-                            if title and len(title) > 5 and title not in ['Watch', 'Video', 'YouTube']:
-                                video_data['title'] = title
-                                break
-                        except:
-                            continue
-                    
-                    # Enhanced URL extraction 
-                    url_selectors = [
-                        ".//a[@id='video-title']",
-                        ".//a[@id='video-title-link']", 
-                        ".//h3//a[@href]",
-                        ".//a[contains(@href, '/watch?v=')]",
-                        ".//a[contains(@href, '/shorts/')]"
-                    ]
-                    
-                    for selector in url_selectors:
-                        try:
-                            link_element = container.find_element(By.XPATH, selector)
-                            href = link_element.get_attribute('href')
-                            if href and ('/watch?v=' in href or '/shorts/' in href):
-                                video_data['url'] = href
-                                break
-                        except:
-                            continue
-                    
-                    # Enhanced channel name extraction
-                    channel_selectors = [
-                        ".//div[@id='channel-info']//a[@href]",              # Channel info section
-                        ".//ytd-channel-name//a",                           # Channel name component
-                        ".//yt-formatted-string[contains(@class, 'byline')]", # Byline formatted string
-                        ".//a[contains(@href, '/@')]",                      # New @ channel format
-                        ".//a[contains(@href, '/channel/')]",               # Traditional channel format
-                        ".//a[contains(@href, '/c/')]",                     # Custom channel format
-                        ".//a[contains(@href, '/user/')]"                   # User channel format
-                    ]
-                    
-                    for selector in channel_selectors:
-                        try:
-                            channel_element = container.find_element(By.XPATH, selector)
-                            channel_name = (channel_element.text or 
-                                          channel_element.get_attribute('aria-label')).strip()
-                            if channel_name and len(channel_name) > 0:
-                                video_data['channel'] = channel_name
-                                break
-                        except:
-                            continue
-                    
-                    # Enhanced metadata extraction (views and upload time)
-                    metadata_selectors = [
-                        ".//div[@id='metadata-line']//span",
-                        ".//ytd-video-meta-block//span",
-                        ".//div[@id='meta']//span",
-                        ".//span[contains(@class, 'meta')]",
-                        ".//span[contains(text(), 'views')]",
-                        ".//span[contains(text(), 'ago')]"
-                    ]
-                    
-                    for selector in metadata_selectors:
-                        try:
-                            metadata_elements = container.find_elements(By.XPATH, selector)
-                            for elem in metadata_elements:
-                                text = elem.text.strip()
-                                if 'view' in text.lower():
-                                    video_data['views'] = text
-                                elif any(word in text.lower() for word in ['ago', 'hour', 'day', 'week', 'month', 'year']):
-                                    video_data['upload_time'] = text
-                        except:
-                            continue
-                    
-                    # Enhanced duration extraction
-                    duration_selectors = [
-                        ".//ytd-thumbnail-overlay-time-status-renderer//span",
-                        ".//span[@class='style-scope ytd-thumbnail-overlay-time-status-renderer']",
-                        ".//div[contains(@class, 'duration')]//span",
-                        ".//span[contains(text(), ':')]"
-                    ]
-                    
-                    for selector in duration_selectors:
-                        try:
-                            duration_element = container.find_element(By.XPATH, selector)
-                            duration = duration_element.text.strip()
-                            if duration and ':' in duration and len(duration) < 20:
-                                video_data['duration'] = duration
-                                break
-                        except:
-                            continue
-                    
-                    # More lenient validation - only require title
-                    title_valid = (video_data['title'] != 'Unknown Title' and 
-                                  len(video_data['title'].strip()) > 3)
-                    
-                    if title_valid:
-                        # Check for duplicates
-                        title_key = video_data['title'][:40].lower()
-                        is_duplicate = any(v['title'][:40].lower() == title_key for v in videos)
-                        
-                        if not is_duplicate:
-                            videos.append(video_data)
-                            print(f"{Fore.GREEN}✓ Video {len(videos)}: {video_data['title'][:60]}...{Style.RESET_ALL}")
-                            
-                            # Stop if we have 20 good videos
-                            if len(videos) >= 20:
-                                print(f"{Fore.GREEN}✓ Reached target of 20 videos{Style.RESET_ALL}")
-                                break
-                        else:
-                            print(f"{Fore.YELLOW}⚠️ Skipped duplicate: {video_data['title'][:40]}...{Style.RESET_ALL}")
-                    else:
-                        print(f"{Fore.RED}⚠️ Rejected video {i}: '{video_data['title'][:40]}'{Style.RESET_ALL}")
-                        
-                except Exception as e:
-                    if "no such window" in str(e).lower():
-                        print(f"{Fore.RED}❌ Browser window closed unexpectedly{Style.RESET_ALL}")
-                        break
-                    print(f"{Fore.YELLOW}⚠️ Error extracting data from video {i}: {str(e)[:50]}...{Style.RESET_ALL}")
-                    continue
-            
+            videos = self._select_videos(container_data)
             print(f"{Fore.GREEN}✓ Successfully extracted {len(videos)} videos{Style.RESET_ALL}")
             return videos
             
         except Exception as e:
-            if "no such window" in str(e).lower():
-                print(f"{Fore.RED}❌ Browser window closed during extraction{Style.RESET_ALL}")
-            else:
-                print(f"{Fore.RED}❌ Error extracting video data: {e}{Style.RESET_ALL}")
+            print(f"{Fore.RED}❌ Error extracting video data from page source: {e}{Style.RESET_ALL}")
             return []
     
-    def analyze_with_gemini(self, videos, original_query):
-        """Analyze videos using Gemini AI and provide recommendations"""
+    @profiled('analyze_with_gemini')
+    def analyze_with_gemini(self, videos, original_query, candidates=None):
+        """Analyze videos using Gemini AI and provide recommendations.
+        
+        candidates limits the prompt to those indices of videos (the local
+        shortlist); rows keep their numbers in the full result list. Candidate
+        sets whose compact prompt would exceed prompt_token_budget are ranked in
+        chunks concurrently, then a final call analyzes the chunk winners.
+        """
         print(f"{Fore.CYAN}🤖 Analyzing videos with Gemini AI...{Style.RESET_ALL}")
         
+        self.last_analysis_failed = False
+        self.last_analysis_streamed = False
         try:
-            # Prepare video data for analysis
-            video_list = []
-            for i, video in enumerate(videos, 1):
-                video_list.append(f"{i}. Title: {video['title']}\n   Channel: {video['channel']}\n   Views: {video['views']}\n   Duration: {video['duration']}\n   Upload Time: {video['upload_time']}\n   URL: {video['url']}")
-            
-            video_data_text = "\n\n".join(video_list)
+            start = time.perf_counter()
+            calls_before = self.analysis_stats['model_calls']
+            legacy_tokens = estimate_tokens(self._legacy_analysis_prompt(videos, original_query))
+            candidates = list(range(len(videos))) if candidates is None else list(candidates)
+            
+            chunks = 1
+            if self.prompt_format == 'legacy':
+                prompt = self._legacy_analysis_prompt([videos[i] for i in candidates], original_query,
+                                                      numbers=[i + 1 for i in candidates])
+            else:
+                prompt = self.build_analysis_prompt([videos[i] for i in candidates], original_query,
+                                                    numbers=[i + 1 for i in candidates], total=len(videos))
+                if estimate_tokens(prompt) > self.prompt_token_budget and len(candidates) > 1:
+                    finalists, chunks = self._rank_in_chunks(videos, candidates, original_query)
+                    prompt = self.build_analysis_prompt([videos[i] for i in finalists], original_query,
+                                                        numbers=[i + 1 for i in finalists], total=len(videos))
+            
+            prompt_tokens = estimate_tokens(prompt)
+            print(f"{Fore.CYAN}📝 Prompt: ~{prompt_tokens} tokens ({self.prompt_format} format; "
+                  f"legacy single-shot ~{legacy_tokens}, budget {self.prompt_token_budget}){Style.RESET_ALL}")
+            
+            analysis = self._generate_analysis(prompt, videos)
+            
+            elapsed = time.perf_counter() - start
+            calls = self.analysis_stats['model_calls'] - calls_before
+            self.prompt_stats = {'prompt_tokens': prompt_tokens, 'legacy_tokens': legacy_tokens,
+                                 'chunks': chunks, 'model_calls': calls, 'seconds': elapsed}
+            print(f"{Fore.CYAN}⏱️ Analysis wall time: {elapsed:.2f}s ({calls} model call(s)){Style.RESET_ALL}")
+            return analysis
             
-            prompt = f"""
+        except Exception as e:
+            print(f"{Fore.RED}❌ Error with Gemini AI analysis: {e}{Style.RESET_ALL}")
+            self.last_analysis_failed = True
+            return "AI analysis unavailable due to an error."
+    
+    def _generate_analysis(self, prompt, videos):
+        self.analysis_stats['model_calls'] += 1
+        if self.stream_analysis:
+            return self._stream_analysis(prompt, videos)
+        response = self.model.generate_content(prompt)
+        
+        print(f"{Fore.GREEN}✓ AI Analysis completed{Style.RESET_ALL}")
+        return response.text
+    
+    @staticmethod
+    def _video_row(number, video):
+        """One compact table row; the video ID replaces the full tracking URL"""
+        fields = [video['title'], video['channel'], video['views'], video['duration'], video['upload_time'],
+                  extract_video_id(video['url']) or video['url']]
+        return f"{number} | " + " | ".join(str(field).replace('|', '/') for field in fields)
+    
+    def build_analysis_prompt(self, videos, query, numbers=None, total=None):
+        """Build the compact analysis prompt: instructions once, then one table row per video.
+        
+        numbers keeps the original result numbering when only a subset of a
+        larger result set (of size total) is being analyzed.
+        """
+        numbers = numbers or range(1, len(videos) + 1)
+        rows = "\n".join(self._video_row(number, video) for number, video in zip(numbers, videos))
+        scope = (f"these {len(videos)} finalists, chosen from {total} results" if total and total != len(videos)
+                 else f"all {len(videos)} videos")
+        return f"""You are ranking YouTube search results for the query "{query}".
+Pick the single BEST video from {scope}, judging relevance of the title to the query, credibility (views, channel authority), recency (prefer the last week), engagement (views) and content quality (professional vs clickbait or misleading).
+
+Videos, one per row: # | title | channel | views | duration | uploaded | video id
+{rows}
+
+Respond in this format:
+BEST VIDEO: [#]. [Full Title] - [why it is the best choice]
+
+DETAILED ANALYSIS:
+- Top 5 videos ranked by quality/relevance
+- Key themes across the videos
+- Quality assessment of channels
+- Warnings about potentially misleading content
+- Recommendations for the user
+
+Start your response with "BEST VIDEO:" followed by the number and title of your top choice."""
+    
+    def _chunk_prompt(self, numbered_videos, query):
+        rows = "\n".join(self._video_row(number, video) for number, video in numbered_videos)
+        return f"""Query: "{query}". Pick the single most relevant, credible, recent and engaging YouTube video below.
+# | title | channel | views | duration | uploaded | video id
+{rows}
+Reply with exactly one line: BEST VIDEO: [#]. [Full Title]"""
+    
+    def _rank_in_chunks(self, videos, candidates, query):
+        """Rank budget-sized chunks of candidates concurrently; returns (finalist indices, chunk count)"""
+        overhead = estimate_tokens(self._chunk_prompt([], query))
+        chunks, current, used = [], [], overhead
+        for index in candidates:
+            row_tokens = estimate_tokens(self._video_row(index + 1, videos[index])) + 1
+            if current and used + row_tokens > self.prompt_token_budget:
+                chunks.append(current)
+                current, used = [], overhead
+            current.append(index)
+            used += row_tokens
+        if current:
+            chunks.append(current)
+        
+        print(f"{Fore.CYAN}🧩 {len(candidates)} videos exceed the prompt budget: ranking {len(chunks)} chunks "
+              f"concurrently, then merging the winners{Style.RESET_ALL}")
+        
+        # Resolved once here: the workers must not race to configure the lazy model
+        model = self.model
+        
+        def rank(chunk):
+            prompt = self._chunk_prompt([(i + 1, videos[i]) for i in chunk], query)
+            try:
+                picked = self._best_video_index(model.generate_content(prompt).text)
+            except Exception as e:
+                print(f"{Fore.YELLOW}⚠️ Chunk ranking failed, keeping its first video: {e}{Style.RESET_ALL}")
+                picked = None
+            return picked if picked in chunk else chunk[0]
+        
+        with ThreadPoolExecutor(max_workers=min(len(chunks), self.analysis_workers)) as executor:
+            finalists = list(executor.map(rank, chunks))
+        self.analysis_stats['model_calls'] += len(chunks)
+        return finalists, len(chunks)
+    
+    def _legacy_analysis_prompt(self, videos, original_query, numbers=None):
+        """The original verbose single-shot prompt, kept for comparison and as prompt_format='legacy'"""
+        # Prepare video data for analysis
+        video_list = []
+        for i, video in zip(numbers or range(1, len(videos) + 1), videos):
+            video_list.append(f"{i}. Title: {video['title']}\n   Channel: {video['channel']}\n   Views: {video['views']}\n   Duration: {video['duration']}\n   Upload Time: {video['upload_time']}\n   URL: {video['url']}")
+        
+        video_data_text = "\n\n".join(video_list)
+        
+        return f"""
             You are analyzing YouTube search results for the query "{original_query}". 
             
             TASK: Analyze ALL {len(videos)} videos provided below and identify the single BEST video based on multiple criteria.
@@ -705,86 +2987,216 @@ class YouTubeVideoFinder:
             
             Start your response with "BEST VIDEO:" followed by the number and title of your top choice.
             """
-            
-            response = self.model.generate_content(prompt)
-            
-            print(f"{Fore.GREEN}✓ AI Analysis completed{Style.RESET_ALL}")
-            return response.text
-            
-        except Exception as e:
-            print(f"{Fore.RED}❌ Error with Gemini AI analysis: {e}{Style.RESET_ALL}")
+    
+    def _stream_analysis(self, prompt, videos):
+        """Print the analysis as it arrives and highlight the best video as soon as it is named"""
+        start = time.perf_counter()
+        first_text_at = best_at = None
+        text = ''
+        
+        print(f"\n{Fore.CYAN}{'='*80}")
+        print("🤖 AI ANALYSIS (streaming)")
+        print(f"{'='*80}{Style.RESET_ALL}\n")
+        for chunk in self.model.generate_content(prompt, stream=True):
+            piece = chunk.text
+            if not piece:
+                continue
+            if first_text_at is None:
+                first_text_at = time.perf_counter() - start
+            text += piece
+            print(piece, end='', flush=True)
+            
+            if best_at is None:
+                best_index = self._best_video_index(text)
+                if best_index is not None and best_index < len(videos):
+                    best_at = time.perf_counter() - start
+                    print("\n")
+                    self._print_best_video(videos[best_index], len(videos))
+        print()
+        
+        total = time.perf_counter() - start
+        self.last_analysis_streamed = True
+        self.analysis_timings = {'first_text_seconds': first_text_at, 'best_video_seconds': best_at,
+                                 'total_seconds': total}
+        best_text = f"{best_at:.2f}s" if best_at is not None else "not found"
+        first_text = f"{first_text_at:.2f}s" if first_text_at is not None else "none"
+        print(f"{Fore.GREEN}✓ AI Analysis completed{Style.RESET_ALL}")
+        print(f"{Fore.CYAN}⏱️ Streaming: first text {first_text}, best video {best_text}, "
+              f"complete {total:.2f}s{Style.RESET_ALL}")
+        return text
+    
+    @staticmethod
+    def _best_video_index(analysis):
+        """0-based index from the first line starting with "BEST VIDEO: <n>.", or None"""
+        for line in analysis.split('\n'):
+            if line.strip().startswith("BEST VIDEO:"):
+                match = re.search(r'BEST VIDEO:\s*(\d+)\.', line)
+                return int(match.group(1)) - 1 if match else None
+        return None
+    
+    def analysis_cache_key(self, videos, query):
+        """Stable hash of the query, every video's ID and metadata, and the model name"""
+        payload = {
+            'query': ' '.join(query.lower().split()),
+            'model': self.MODEL_NAME,
+            'prompt': self.prompt_format,
+            'shortlist': [self.shortlist_size, self.ranker.weights],
+            'videos': [[extract_video_id(v['url']) or v['url'], v['title'], v['channel'],
+                        v['views'], v['upload_time'], v['duration']] for v in videos]
+        }
+        encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode('utf-8')
+        return hashlib.sha256(encoded).hexdigest()
+    
+    def analyze_and_pick(self, videos, original_query):
+        """Return (analysis, best_video), reusing a memoized analysis of the same video set"""
+        key = self.analysis_cache_key(videos, original_query)
+        if self.analysis_cache and self.cache_mode == 'use':
+            cached = self.analysis_cache.get(key)
+            if cached:
+                self.analysis_stats['cache_hits'] += 1
+                self.last_analysis_streamed = False
+                print(f"{Fore.GREEN}⚡ Reusing memoized AI analysis for this video set{Style.RESET_ALL}")
+                self.report_analysis_stats()
+                best_index = cached['best_index']
+                self.last_analyzed_count = cached.get('analyzed', len(videos))
+                return cached['analysis'], videos[best_index] if best_index is not None else None
+        
+        ranking = self.rank_locally(videos, original_query)
+        shortlist = ranking[:self.shortlist_size] if self.shortlist_size else ranking
+        self.last_analyzed_count = len(shortlist)
+        analysis = self.analyze_with_gemini(videos, original_query, candidates=sorted(shortlist))
+        if self.last_analysis_failed:
+            analysis = self.local_ranking_analysis(videos, ranking)
+            self.last_analyzed_count = len(videos)
+        best_video = self.extract_best_video_from_analysis(analysis, videos, ranking)
+        if self.analysis_cache and self.cache_mode != 'bypass' and not self.last_analysis_failed:
+            best_index = next((i for i, v in enumerate(videos) if v is best_video), None)
+            self.analysis_cache.put(key, {'analysis': analysis, 'best_index': best_index,
+                                          'analyzed': self.last_analyzed_count})
+        self.report_analysis_stats()
+        return analysis, best_video
+    
+    def rank_locally(self, videos, query):
+        """Rank videos with the local scorer and report how many are shortlisted for the model"""
+        start = time.perf_counter()
+        ranking = self.ranker.rank(videos, query)
+        elapsed = time.perf_counter() - start
+        sent = min(len(ranking), self.shortlist_size) if self.shortlist_size else len(ranking)
+        print(f"{Fore.CYAN}🎯 Local pre-ranking: {sent} of {len(videos)} videos shortlisted for AI analysis "
+              f"({elapsed * 1000:.1f}ms){Style.RESET_ALL}")
+        return ranking
+    
+    def local_ranking_analysis(self, videos, ranking, top=5):
+        """Offline stand-in for the AI analysis, in the same "BEST VIDEO:" format"""
+        if not ranking:
             return "AI analysis unavailable due to an error."
+        best = ranking[0]
+        lines = [f"BEST VIDEO: {best + 1}. {videos[best]['title']} - highest local score "
+                 f"(AI analysis unavailable, ranked offline by title match, views, recency and duration)",
+                 "", "LOCAL RANKING:"]
+        for place, index in enumerate(ranking[:top], 1):
+            video = videos[index]
+            lines.append(f"{place}. #{index + 1} {video['title']} ({video['channel']}, {video['views']}, {video['upload_time']})")
+        return "\n".join(lines)
     
-    def extract_best_video_from_analysis(self, analysis, videos):
-        """Extract the best video recommendation from AI analysis"""
+    def report_analysis_stats(self):
+        if self.analysis_cache and self.cache_mode != 'bypass':
+            print(f"{Fore.CYAN}🧠 Analysis memo: {self.analysis_stats['cache_hits']} hit(s), "
+                  f"{self.analysis_stats['model_calls']} model call(s){Style.RESET_ALL}")
+    
+    def extract_best_video_from_analysis(self, analysis, videos, ranking=None):
+        """Extract the best video recommendation from AI analysis, else the local ranking's top video"""
+        fallback = videos[ranking[0]] if ranking else videos[0] if videos else None
         try:
             # Look for the BEST VIDEO recommendation in the analysis
-            lines = analysis.split('\n')
-            best_video_line = None
-            
-            for line in lines:
-                if line.strip().startswith("BEST VIDEO:"):
-                    best_video_line = line.strip()
-                    break
-            
-            if not best_video_line:
-                # Fallback: return first video if no clear recommendation
-                return videos[0] if videos else None
+            video_index = self._best_video_index(analysis)
+            if video_index is not None and 0 <= video_index < len(videos):
+                return videos[video_index]
             
-            # Extract video number from the recommendation
-            import re
-            match = re.search(r'BEST VIDEO:\s*(\d+)\.', best_video_line)
-            if match:
-                video_index = int(match.group(1)) - 1  # Convert to 0-based index
-                if 0 <= video_index < len(videos):
-                    return videos[video_index]
-            
-            # Fallback if parsing fails
-            return videos[0] if videos else None
+            # Fallback: locally top-ranked video if no clear recommendation
+            return fallback
             
         except Exception as e:
             print(f"{Fore.YELLOW}⚠️ Could not extract best video recommendation: {e}{Style.RESET_ALL}")
-            return videos[0] if videos else None
+            return fallback
     
-    def save_results(self, videos, analysis, query, original_query=None, best_video=None):
-        """Save results to JSON file"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"youtube_results_{timestamp}.json"
-        
-        results = {
+    def build_result_record(self, videos, analysis, query, original_query=None, best_video=None):
+        """Build the result record written by save_results and streamed by batch mode"""
+        return {
             'search_query': query,
             'original_query': original_query,
-            'timestamp': timestamp,
+            'timestamp': datetime.now().strftime("%Y%m%d_%H%M%S"),
             'total_videos': len(videos),
-            'best_video_recommendation': best_video,
-            'videos': videos,
+            'best_video_recommendation': dict(best_video) if best_video else best_video,
+            'videos': [dict(video) for video in videos],
             'ai_analysis': analysis
         }
+    
+    @profiled('save_results')
+    def save_results(self, videos, analysis, query, original_query=None, best_video=None):
+        """Save results to the results store and/or a JSON file, returning where they went"""
+        results = self.build_result_record(videos, analysis, query, original_query, best_video)
+        locations = []
+        
+        if self.results_store_path:
+            run_id = self.open_results_store().save_run(results)
+            locations.append(f"{self.results_store_path} (run #{run_id})")
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
+        if self.save_json or not self.results_store_path:
+            filename = f"youtube_results_{results['timestamp']}.json"
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2, ensure_ascii=False)
+            locations.append(filename)
         
-        print(f"{Fore.GREEN}✓ Results saved to {filename}{Style.RESET_ALL}")
-        return filename
+        print(f"{Fore.GREEN}✓ Results saved to {' and '.join(locations)}{Style.RESET_ALL}")
+        return ' and '.join(locations)
+    
+    def open_results_store(self):
+        if self.results_store is None:
+            # Imported here because results_store imports this module for VideoRecord
+            from results_store import ResultsStore
+            self.results_store = ResultsStore(self.results_store_path)
+        return self.results_store
+    
+    def open_snapshot_corpus(self):
+        if self.snapshot_corpus is None:
+            # Imported here because snapshot_corpus imports this module
+            from snapshot_corpus import SnapshotCorpus
+            self.snapshot_corpus = SnapshotCorpus(self.snapshot_dir)
+        return self.snapshot_corpus
+    
+    @profiled('record_snapshot')
+    def record_snapshot(self, videos, seconds):
+        """Save the live results page, its ytInitialData and the search context for offline replay"""
+        try:
+            url = self.driver.current_url
+            params = parse_qs(urlparse(url).query)
+            context = {'url': url, 'query': params.get('search_query', [None])[0], 'sp': params.get('sp', [None])[0],
+                       'filters': {'upload_date': self.filters.upload_date, 'duration': self.filters.duration,
+                                   'type': self.filters.type, 'sort': self.filters.sort},
+                       'search_mode': self.search_mode, 'extraction_mode': self.extraction_mode,
+                       'max_results': self.max_results, 'base_url': self.base_url}
+            page_source = self.driver.page_source
+            initial_data = self.driver.execute_script(INITIAL_DATA_SCRIPT)
+            extraction = dict(self.last_extraction_stats or {}, seconds=seconds)
+            snapshot = self.open_snapshot_corpus().record(page_source, initial_data, context,
+                                                          [video.to_dict() for video in videos], extraction)
+            print(f"{Fore.CYAN}📸 Snapshot {snapshot['id']} recorded in {self.snapshot_dir} "
+                  f"({snapshot['page_bytes'] // 1024} KB page){Style.RESET_ALL}")
+            return snapshot
+        except Exception as e:
+            print(f"{Fore.YELLOW}⚠️ Could not record snapshot: {e}{Style.RESET_ALL}")
+            return None
     
     def display_results(self, videos, analysis, best_video=None):
         """Display formatted results with best video recommendation"""
         print(f"\n{Fore.CYAN}{'='*80}")
-        print(f"🎥 YOUTUBE SEARCH RESULTS - {len(videos)} VIDEOS EXTRACTED & ANALYZED")
+        print(f"🎥 YOUTUBE SEARCH RESULTS - {len(videos)} VIDEOS EXTRACTED & RANKED")
         print(f"{'='*80}{Style.RESET_ALL}\n")
         
         # Display best video recommendation prominently
         if best_video:
-            print(f"{Fore.GREEN}{'='*80}")
-            print(f"🏆 AI BEST VIDEO (Selected from {len(videos)} videos)")
-            print(f"{'='*80}{Style.RESET_ALL}")
-            print(f"{Fore.YELLOW}📺 {best_video['title']}{Style.RESET_ALL}")
-            print(f"   🎪 Channel: {best_video['channel']}")
-            print(f"   👁️ Views: {best_video['views']}")
-            print(f"   ⏱️ Duration: {best_video['duration']}")
-            print(f"   📅 Uploaded: {best_video['upload_time']}")
-            print(f"   🔗 URL: {best_video['url']}")
-            print(f"{Fore.GREEN}{'='*80}{Style.RESET_ALL}\n")
+            self._print_best_video(best_video, len(videos))
         
         print(f"{Fore.CYAN}📋 ALL {len(videos)} VIDEOS (Saved to JSON):{Style.RESET_ALL}\n")
         
@@ -802,9 +3214,95 @@ class YouTubeVideoFinder:
             print()
         
         print(f"\n{Fore.CYAN}{'='*80}")
-        print(f"🤖 AI ANALYSIS OF ALL {len(videos)} VIDEOS")
+        print(f"🤖 AI ANALYSIS OF {self._analysis_scope(len(videos)).upper()} VIDEOS")
         print(f"{'='*80}{Style.RESET_ALL}\n")
-        print(analysis)
+        if self.last_analysis_streamed:
+            print(f"{Fore.CYAN}(Full analysis streamed above){Style.RESET_ALL}")
+        else:
+            print(analysis)
+    
+    def _analysis_scope(self, total_videos):
+        """Describe how many videos the analysis covered: 'the top 10 of 20' or 'all 20'"""
+        analyzed = self.last_analyzed_count
+        if analyzed and analyzed < total_videos:
+            return f"the top {analyzed} of {total_videos}"
+        return f"all {total_videos}"
+    
+    def _print_best_video(self, best_video, total_videos):
+        print(f"{Fore.GREEN}{'='*80}")
+        print(f"🏆 AI BEST VIDEO (Selected from {self._analysis_scope(total_videos)} videos)")
+        print(f"{'='*80}{Style.RESET_ALL}")
+        print(f"{Fore.YELLOW}📺 {best_video['title']}{Style.RESET_ALL}")
+        print(f"   🎪 Channel: {best_video['channel']}")
+        print(f"   👁️ Views: {best_video['views']}")
+        print(f"   ⏱️ Duration: {best_video['duration']}")
+        print(f"   📅 Uploaded: {best_video['upload_time']}")
+        print(f"   🔗 URL: {best_video['url']}")
+        print(f"{Fore.GREEN}{'='*80}{Style.RESET_ALL}\n")
+    
+    @profiled('query')
+    def process_query(self, query, original_query=None, save=True):
+        """Search, extract, analyze, display and save results for one query on the current driver.
+        
+        Returns the result record, or None when no videos were found. With
+        save=False the record is only returned, for callers that store it themselves.
+        """
+        # Search and extract, or reuse recent results for the same query and filters
+        videos = self.find_videos(query)
+        
+        if not videos:
+            print(f"{Fore.RED}❌ No videos found{Style.RESET_ALL}")
+            self.report_selector_stats()
+            self.write_profile()
+            return None
+        
+        # Analyze with Gemini AI and extract the best video recommendation
+        analysis, best_video = self.analyze_and_pick(videos, original_query or query)
+        
+        # Display results
+        self.display_results(videos, analysis, best_video)
+        
+        # Save results
+        record = self.build_result_record(videos, analysis, query, original_query, best_video)
+        if save:
+            filename = self.save_results(videos, analysis, query, original_query, best_video)
+        
+        self.report_wait_savings()
+        self.report_selector_stats()
+        self.write_profile()
+        print(f"\n{Fore.GREEN}✅ Process completed successfully!{Style.RESET_ALL}")
+        if save:
+            print(f"📁 {len(videos)} videos saved to: {filename}")
+        if best_video:
+            print(f"🤖 AI analyzed {self._analysis_scope(len(videos))} videos and selected the best one")
+            print(f"🏆 Best Video: {best_video['title'][:60]}...")
+        else:
+            print(f"⚠️ AI could not determine a clear best video from the {len(videos)} results")
+        
+        return record
+    
+    def run_queries(self, queries, save=True):
+        """Process several text queries, borrowing a browser for each one.
+        
+        With a driver_pool every query reuses a warm session, so Chrome startup
+        is paid once per pooled session instead of once per query. Returns one
+        result record (or None) per query.
+        """
+        return [self.run_query(query, save=save) for query in queries]
+    
+    def run_query(self, query, save=True):
+        """Process one text query non-interactively, returning its result record or None"""
+        self._reset_run_stats()
+        try:
+            # The browser is set up by find_videos only if the result cache misses
+            return self.process_query(query, query, save=save)
+        except KeyboardInterrupt:
+            raise
+        except Exception as e:
+            print(f"{Fore.RED}❌ Query '{query}' failed: {e}{Style.RESET_ALL}")
+            return None
+        finally:
+            self.release_driver()
     
     def run(self):
         """Main execution method"""
@@ -813,6 +3311,8 @@ class YouTubeVideoFinder:
         print("=" * 50)
         print(f"{Style.RESET_ALL}")
         
+        self._reset_run_stats()
+        
         try:
             # Setup WebDriver
             self.setup_driver()
@@ -843,53 +3343,173 @@ class YouTubeVideoFinder:
                 print(f"{Fore.RED}❌ No valid input received{Style.RESET_ALL}")
                 return
             
-            # Navigate and search
-            if not self.navigate_to_youtube():
-                return
-            
-            if not self.search_youtube(query):
-                return
-            
-            # Apply filters
-            self.apply_filters()
-            
-            # Extract video data
-            videos = self.extract_video_data()
-            
-            if not videos:
-                print(f"{Fore.RED}❌ No videos found{Style.RESET_ALL}")
-                return
-            
-            # Analyze with Gemini AI
-            analysis = self.analyze_with_gemini(videos, original_query or query)
-            
-            # Extract best video recommendation
-            best_video = self.extract_best_video_from_analysis(analysis, videos)
-            
-            # Display results
-            self.display_results(videos, analysis, best_video)
-            
-            # Save results
-            filename = self.save_results(videos, analysis, query, original_query, best_video)
-            
-            print(f"\n{Fore.GREEN}✅ Process completed successfully!{Style.RESET_ALL}")
-            print(f"📁 {len(videos)} videos saved to: {filename}")
-            if best_video:
-                print(f"🤖 AI analyzed all {len(videos)} videos and selected the best one")
-                print(f"🏆 Best Video: {best_video['title'][:60]}...")
-            else:
-                print(f"⚠️ AI could not determine a clear best video from the {len(videos)} results")
+            # Search, extract, analyze and save
+            self.process_query(query, original_query)
             
         except KeyboardInterrupt:
             print(f"\n{Fore.YELLOW}⚠️ Process interrupted by user{Style.RESET_ALL}")
         except Exception as e:
             print(f"{Fore.RED}❌ Unexpected error: {e}{Style.RESET_ALL}")
         finally:
-            if self.driver:
-                self.driver.quit()
-                print(f"{Fore.GREEN}✓ Browser closed{Style.RESET_ALL}")
+            self.release_driver()
+
+# Per-process finder used by batch workers, created once by _batch_worker_init
+_batch_finder = None
+
+def _batch_worker_init(gemini_api_key, finder_options, verbose):
+    """Create this worker's finder with its own single-session browser pool"""
+    global _batch_finder
+    if not verbose:
+        sys.stdout = open(os.devnull, 'w', encoding='utf-8')
+    if finder_options.get('profile_path'):
+        # One profile per worker so processes never overwrite each other
+        finder_options = dict(finder_options, profile_path=f"{finder_options['profile_path']}.{os.getpid()}")
+    pool = WebDriverPool(size=1)
+    _batch_finder = YouTubeVideoFinder(gemini_api_key, driver_pool=pool, **finder_options)
+    # Quit the warm browser when the worker process exits
+    multiprocessing.util.Finalize(None, pool.close, exitpriority=10)
+
+def _batch_worker_run(query):
+    start = time.perf_counter()
+    try:
+        record = _batch_finder.run_query(query, save=False)
+        error = None if record else "no videos found"
+    except Exception as e:
+        record, error = None, str(e)
+    return {'query': query, 'record': record, 'error': error,
+            'seconds': time.perf_counter() - start, 'worker': os.getpid()}
+
+def _percentile(sorted_values, percent):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(percent / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+def read_queries(source):
+    """Read one query per line from a file path or '-' for stdin, skipping blanks and # comments"""
+    handle = sys.stdin if source == '-' else open(source, encoding='utf-8')
+    try:
+        return [line.strip() for line in handle if line.strip() and not line.lstrip().startswith('#')]
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+
+def run_batch(queries, gemini_api_key, workers=2, output_path=None, finder_options=None, verbose=False,
+              store_path=None):
+    """Run queries across worker processes, each owning one browser, streaming records to JSONL.
+    
+    With store_path the parent process also appends every record to that
+    results store, so workers never write to it concurrently. Returns the
+    list of per-query outcomes; throughput and latency percentiles are
+    printed at the end.
+    """
+    store = None
+    if store_path:
+        from results_store import ResultsStore
+        store = ResultsStore(store_path)
+    if not output_path:
+        output_path = f"youtube_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+    workers = max(1, min(workers, len(queries)))
+    print(f"{Fore.CYAN}📦 Running {len(queries)} queries on {workers} worker(s) -> {output_path}{Style.RESET_ALL}")
+    
+    outcomes = []
+    start = time.perf_counter()
+    with open(output_path, 'a', encoding='utf-8') as out, \
+            multiprocessing.Pool(workers, _batch_worker_init,
+                                 (gemini_api_key, finder_options or {}, verbose)) as pool:
+        for outcome in pool.imap_unordered(_batch_worker_run, queries):
+            outcomes.append(outcome)
+            if outcome['record']:
+                out.write(json.dumps(outcome['record'], ensure_ascii=False) + "\n")
+                out.flush()
+                if store:
+                    store.save_run(outcome['record'])
+                print(f"{Fore.GREEN}✓ [{len(outcomes)}/{len(queries)}] '{outcome['query']}' - "
+                      f"{outcome['record']['total_videos']} videos in {outcome['seconds']:.1f}s{Style.RESET_ALL}")
+            else:
+                print(f"{Fore.RED}❌ [{len(outcomes)}/{len(queries)}] '{outcome['query']}' failed: "
+                      f"{outcome['error']}{Style.RESET_ALL}")
+        pool.close()
+        pool.join()
+    elapsed = time.perf_counter() - start
+    
+    latencies = sorted(o['seconds'] for o in outcomes)
+    succeeded = sum(1 for o in outcomes if o['record'])
+    per_minute = len(outcomes) / elapsed * 60 if elapsed else 0.0
+    print(f"\n{Fore.CYAN}{'='*80}")
+    print("📦 BATCH SUMMARY")
+    print(f"{'='*80}{Style.RESET_ALL}")
+    print(f"   Queries: {succeeded}/{len(outcomes)} succeeded in {elapsed:.1f}s")
+    cores = min(workers, os.cpu_count() or 1)
+    print(f"   Throughput: {per_minute:.2f} queries/min ({per_minute / workers:.2f} per worker, "
+          f"{per_minute / cores:.2f} per CPU core)")
+    print(f"   Latency: p50 {_percentile(latencies, 50):.1f}s | p90 {_percentile(latencies, 90):.1f}s | "
+          f"p99 {_percentile(latencies, 99):.1f}s | max {latencies[-1] if latencies else 0:.1f}s")
+    print(f"   Results: {output_path}" + (f" and {store_path}" if store else ""))
+    if store:
+        store.close()
+    return outcomes
 
 def main():
+    parser = argparse.ArgumentParser(description="YouTube Video Finder with AI Analysis")
+    parser.add_argument('--batch', metavar='FILE',
+                        help="run non-interactively over queries in FILE, one per line ('-' reads stdin)")
+    parser.add_argument('--workers', type=int, default=2,
+                        help="batch worker processes, each with its own browser (default: 2)")
+    parser.add_argument('--output', metavar='FILE', help="JSONL file that batch results are appended to")
+    parser.add_argument('--verbose', action='store_true', help="show worker output in batch mode")
+    parser.add_argument('--max-results', type=int, default=20, metavar='N',
+                        help="number of videos to extract per search (default: 20)")
+    parser.add_argument('--browser-profile', choices=YouTubeVideoFinder.BROWSER_PROFILES, default='default',
+                        help="'lean' runs headless and blocks images, media, fonts and ads")
+    parser.add_argument('--backend', choices=YouTubeVideoFinder.BACKENDS, default='selenium',
+                        help="'http' searches without a browser over pooled keep-alive connections")
+    parser.add_argument('--cache-ttl', type=float, default=3600,
+                        help="seconds to reuse results for the same query and filters (default: 3600)")
+    parser.add_argument('--cache-dir', metavar='DIR', help="also keep cached results and analyses on disk in DIR")
+    cache_group = parser.add_mutually_exclusive_group()
+    cache_group.add_argument('--no-cache', action='store_true', help="neither read nor write the result and analysis caches")
+    cache_group.add_argument('--refresh-cache', action='store_true', help="ignore cached results and analyses and store fresh ones")
+    parser.add_argument('--stream', action='store_true',
+                        help="print the AI analysis as it is generated and show the best video early")
+    parser.add_argument('--prompt-format', choices=YouTubeVideoFinder.PROMPT_FORMATS, default='compact',
+                        help="compact tabular analysis prompt, or the original verbose one")
+    parser.add_argument('--prompt-budget', type=int, default=4000, metavar='TOKENS',
+                        help="estimated prompt tokens above which videos are ranked in concurrent chunks")
+    parser.add_argument('--shortlist', type=int, default=10, metavar='K',
+                        help="send only the K best locally ranked videos to Gemini (0 sends all)")
+    parser.add_argument('--rank-weights', metavar='NAME=W,...', default='',
+                        help="local ranking weights, e.g. relevance=0.5,views=0.2,recency=0.2,duration=0.1")
+    parser.add_argument('--store', metavar='DB', default=DEFAULT_RESULTS_STORE_PATH,
+                        help="SQLite results store that every run is appended to")
+    parser.add_argument('--save-json', action='store_true',
+                        help="also write each run to its own youtube_results_<timestamp>.json file")
+    parser.add_argument('--profile', metavar='PREFIX',
+                        help="write per-stage timings to PREFIX.json (trace) and PREFIX.prom (Prometheus text)")
+    parser.add_argument('--record-snapshots', nargs='?', const=DEFAULT_SNAPSHOT_DIR, metavar='DIR',
+                        help=f"save every results page to a replayable corpus in DIR (default: {DEFAULT_SNAPSHOT_DIR})")
+    args = parser.parse_args()
+    ranking_weights = {}
+    for item in filter(None, args.rank_weights.split(',')):
+        name, _, weight = item.partition('=')
+        try:
+            ranking_weights[name.strip()] = float(weight)
+        except ValueError:
+            parser.error(f"invalid ranking weight: {item}")
+    if args.max_results < 1:
+        parser.error("--max-results must be at least 1")
+    finder_options = {'max_results': args.max_results,
+                      'browser_profile': args.browser_profile, 'backend': args.backend,
+                      'stream_analysis': args.stream, 'result_cache_ttl': args.cache_ttl,
+                      'prompt_format': args.prompt_format, 'prompt_token_budget': args.prompt_budget,
+                      'shortlist_size': args.shortlist, 'ranking_weights': ranking_weights or None,
+                      'result_cache_dir': args.cache_dir and os.path.join(args.cache_dir, 'results'),
+                      'analysis_cache_dir': args.cache_dir and os.path.join(args.cache_dir, 'analyses'),
+                      'cache_mode': 'bypass' if args.no_cache else 'refresh' if args.refresh_cache else 'use',
+                      'results_store_path': args.store, 'save_json': args.save_json, 'profile_path': args.profile,
+                      'snapshot_dir': args.record_snapshots}
+    
     # Gemini API key (replace with your actual API key)
     GEMINI_API_KEY = " "
     
@@ -897,7 +3517,16 @@ def main():
         print(f"{Fore.RED}❌ Please set your Gemini API key{Style.RESET_ALL}")
         return
     
-    finder = YouTubeVideoFinder(GEMINI_API_KEY)
+    if args.batch:
+        queries = read_queries(args.batch)
+        if not queries:
+            print(f"{Fore.RED}❌ No queries found in {args.batch}{Style.RESET_ALL}")
+            return
+        run_batch(queries, GEMINI_API_KEY, workers=args.workers, output_path=args.output,
+                  finder_options=finder_options, verbose=args.verbose, store_path=args.store)
+        return
+    
+    finder = YouTubeVideoFinder(GEMINI_API_KEY, **finder_options)
     finder.run()
 
 if __name__ == "__main__":